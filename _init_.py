@@ -1,4 +1,4 @@
 from src.simulation.flight_simulator import FlightSimulator, AircraftState
-from src.simulation.autopilot import Autopilot
+from src.simulation.autopilot import Autopilot, FleetAutopilot
 
-_all_ = ['FlightSimulator', 'AircraftState', 'Autopilot']
\ No newline at end of file
+_all_ = ['FlightSimulator', 'AircraftState', 'Autopilot', 'FleetAutopilot']
\ No newline at end of file
@@ -0,0 +1,170 @@
+import heapq
+import json
+import math
+from dataclasses import dataclass
+from typing import Collection, Dict, List, Optional, Tuple
+import numpy as np
+from src.database.waypoint_manager import WaypointManager
+from src.navigation.trajectory_calculator import EARTH_RADIUS_KM, TrajectoryCalculator
+
+
+@dataclass(frozen=True)
+class RouteConstraints:
+    avoid: Collection[str] = ()          # waypoint codes the route must not use
+    avoid_types: Collection[str] = ()    # waypoint types the route must not use (e.g. 'NDB')
+    airways_only: bool = False           # ignore auto-connected direct legs
+    max_leg_km: Optional[float] = None   # reject legs longer than this
+
+
+def load_airways(path: str) -> Dict[str, List[str]]:
+    """Load airway definitions from a JSON file mapping airway names to ordered fix codes."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+class AirwayGraph:
+    """
+    Connection graph over the waypoint database with A* route search.
+
+    Edges come from explicit airway segments and, optionally, from
+    auto-connecting every pair of waypoints closer than max_leg_km. Neighbour
+    lists are computed on first expansion through the spatial index and
+    cached until the waypoint database changes.
+    """
+
+    def __init__(self, waypoint_manager: WaypointManager, airways: Optional[Dict[str, List[str]]] = None,
+                 max_leg_km: Optional[float] = None):
+        self.waypoint_manager = waypoint_manager
+        self.airways = airways or {}
+        self.max_leg_km = max_leg_km
+        self._revision = None
+        self._airway_edges: Dict[str, Dict[str, Tuple[float, Optional[str]]]] = {}
+        self._neighbor_cache: Dict[str, List[Tuple[str, float, Optional[str]]]] = {}
+        # code -> (lat rad, lon rad, cos lat, type), filled alongside the neighbour lists
+        self._nodes: Dict[str, Tuple[float, float, float, str]] = {}
+
+    def invalidate(self):
+        """Drop every cached edge; the graph is rebuilt on the next query."""
+        self._revision = None
+
+    def _refresh(self):
+        if self._revision == self.waypoint_manager.revision:
+            return
+        self._neighbor_cache = {}
+        self._nodes = {}
+        self._airway_edges = {}
+        distance = TrajectoryCalculator.great_circle_distance
+        for airway, codes in self.airways.items():
+            fixes = self.waypoint_manager.get_waypoints_by_codes(codes)
+            for a, b in zip(fixes, fixes[1:]):
+                if a is None or b is None:
+                    continue
+                leg = distance(a.latitude, a.longitude, b.latitude, b.longitude)
+                self._airway_edges.setdefault(a.icao_code, {})[b.icao_code] = (leg, airway)
+                self._airway_edges.setdefault(b.icao_code, {})[a.icao_code] = (leg, airway)
+        self._revision = self.waypoint_manager.revision
+
+    def neighbors(self, code: str) -> List[Tuple[str, float, Optional[str]]]:
+        """
+        Edges leaving a waypoint.
+
+        :return: (neighbour code, distance km, airway name or None for direct legs)
+        """
+        self._refresh()
+        cached = self._neighbor_cache.get(code)
+        if cached is not None:
+            return cached
+
+        edges = {nb: (dist, airway) for nb, (dist, airway) in self._airway_edges.get(code, {}).items()}
+        if self.max_leg_km:
+            waypoint = self.waypoint_manager.get_waypoint_by_code(code)
+            if waypoint is not None:
+                for nb, dist in self.waypoint_manager.spatial_index.within_radius(
+                        waypoint.latitude, waypoint.longitude, self.max_leg_km):
+                    if nb != code and nb not in edges:
+                        edges[nb] = (dist, None)
+
+        result = [(nb, dist, airway) for nb, (dist, airway) in edges.items()]
+        self._cache_nodes([nb for nb in edges if nb not in self._nodes])
+        self._neighbor_cache[code] = result
+        return result
+
+    def _cache_nodes(self, codes: List[str]):
+        """Cache position and type of waypoints with one vectorized column lookup."""
+        if not codes:
+            return
+        store = self.waypoint_manager.store
+        rows = self.waypoint_manager.get_rows_by_codes(codes)
+        lat = np.radians(store.latitudes[rows])
+        lon = np.radians(store.longitudes[rows])
+        cos_lat = np.cos(lat)
+        for code, row, *position in zip(codes, rows.tolist(), lat.tolist(), lon.tolist(), cos_lat.tolist()):
+            self._nodes[code] = (*position, store.type_at(row))
+
+    def _node(self, code: str) -> Tuple[float, float, float, str]:
+        if code not in self._nodes:
+            self._cache_nodes([code])
+        return self._nodes[code]
+
+    def find_route(self, origin_code: str, destination_code: str,
+                   constraints: Optional[RouteConstraints] = None) -> List[str]:
+        """
+        Shortest route between two waypoints using A* with a great-circle heuristic.
+
+        :param origin_code: ICAO code of the origin
+        :param destination_code: ICAO code of the destination
+        :param constraints: Optional RouteConstraints
+        :return: Waypoint codes from origin to destination inclusive
+        """
+        constraints = constraints or RouteConstraints()
+        origin, destination = self.waypoint_manager.get_waypoints_by_codes([origin_code, destination_code])
+        if not origin or not destination:
+            raise ValueError("Invalid origin or destination waypoint")
+        if origin_code == destination_code:
+            return [origin_code]
+
+        avoid = set(constraints.avoid) - {origin_code, destination_code}
+        avoid_types = set(constraints.avoid_types)
+        max_leg = constraints.max_leg_km if constraints.max_leg_km is not None else math.inf
+        self._refresh()
+        nodes = self._nodes
+        dest_lat, dest_lon, dest_cos, _ = self._node(destination_code)
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
+
+        def heuristic(code: str) -> float:
+            lat, lon, cos_lat, _ = nodes[code]
+            a = sin((dest_lat - lat) / 2) ** 2 + cos_lat * dest_cos * sin((dest_lon - lon) / 2) ** 2
+            return 2 * EARTH_RADIUS_KM * asin(sqrt(min(a, 1.0)))
+
+        best_cost = {origin_code: 0.0}
+        came_from: Dict[str, str] = {}
+        self._node(origin_code)
+        open_set = [(heuristic(origin_code), 0.0, origin_code)]
+        closed = set()
+
+        while open_set:
+            _, cost, code = heapq.heappop(open_set)
+            if code == destination_code:
+                route = [code]
+                while code in came_from:
+                    code = came_from[code]
+                    route.append(code)
+                return route[::-1]
+            if code in closed:
+                continue
+            closed.add(code)
+
+            for nb, leg, airway in self.neighbors(code):
+                if nb in closed or nb in avoid or leg > max_leg:
+                    continue
+                if constraints.airways_only and airway is None:
+                    continue
+                if avoid_types and nodes[nb][3] in avoid_types:
+                    continue
+                new_cost = cost + leg
+                if new_cost < best_cost.get(nb, math.inf):
+                    best_cost[nb] = new_cost
+                    came_from[nb] = code
+                    heapq.heappush(open_set, (new_cost + heuristic(nb), new_cost, nb))
+
+        raise ValueError(f"No route found from {origin_code} to {destination_code}")
@@ -1,14 +1,147 @@
-from typing import List, Tuple
+import bisect
+import copy
+import math
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from src.database.waypoint_manager import Waypoint
 from src.navigation.flight_planner import FlightPlan
-from src.navigation.trajectory_calculator import TrajectoryCalculator
-from src.simulation.flight_simulator import AircraftState
+from src.navigation.trajectory_calculator import TrajectoryCalculator, EARTH_RADIUS_KM, KNOTS_TO_KMH
+from src.navigation.vertical_profile import VerticalProfile, VerticalProfileBuilder
+from src.simulation.flight_simulator import AircraftState, DEFAULT_CRUISE_ALTITUDE_FT, DEFAULT_TAKEOFF_WEIGHT_KG
+
+# Control limits and gains shared by Autopilot and FleetAutopilot
+TURN_RATE_DEG_S = 3.0                 # standard-rate turn
+HEADING_GAIN = 0.5                    # deg/s of turn rate per degree of heading error
+MAX_VERTICAL_SPEED_FPM = 2500.0
+ALTITUDE_TIME_CONSTANT_S = 10.0
+MAX_ACCELERATION_KNOTS_S = 1.0
+SPEED_TIME_CONSTANT_S = 5.0
+MIN_SEQUENCING_KM = 0.5               # a fix closer than this is always sequenced
+DEFAULT_SUBSTEP_HZ = 25.0
+
+_TURN_RATE_RAD_S = math.radians(TURN_RATE_DEG_S)
+_KNOTS_TO_KMS = KNOTS_TO_KMH / 3600.0
+
+
+def _bearing_distance(lat: float, lon: float, target_lat: float, target_lon: float) -> Tuple[float, float]:
+    """Initial bearing (radians) and haversine distance (km) between two points given in radians."""
+    dlon = target_lon - lon
+    cos_lat, cos_target = math.cos(lat), math.cos(target_lat)
+    bearing = math.atan2(math.sin(dlon) * cos_target,
+                         cos_lat * math.sin(target_lat) - math.sin(lat) * cos_target * math.cos(dlon))
+    sin_dlat = math.sin((target_lat - lat) / 2)
+    sin_dlon = math.sin(dlon / 2)
+    a = sin_dlat * sin_dlat + cos_lat * cos_target * sin_dlon * sin_dlon
+    return bearing, 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def _route_geometry(latitudes: np.ndarray, longitudes: np.ndarray):
+    """
+    Per-fix guidance data of a route given in degrees.
+
+    :return: inbound course (radians), tan of half the turn at the fix and
+             distance flown after the fix, one entry per fix
+    """
+    inbound = np.zeros(len(latitudes))
+    turn_tan = np.zeros(len(latitudes))
+    remaining = np.zeros(len(latitudes))
+    if len(latitudes) > 1:
+        outbound = TrajectoryCalculator.initial_bearings(latitudes[:-1], longitudes[:-1],
+                                                         latitudes[1:], longitudes[1:])
+        arriving = TrajectoryCalculator.final_bearings(latitudes[:-1], longitudes[:-1],
+                                                       latitudes[1:], longitudes[1:])
+        inbound[1:] = np.radians(arriving)
+        inbound[0] = math.radians(outbound[0])
+        turns = np.abs((outbound[1:] - arriving[:-1] + 540.0) % 360.0 - 180.0)
+        # Turns sharper than 150 degrees are flown as fly-over rather than anticipated
+        turn_tan[1:-1] = np.where(turns < 150.0, np.tan(np.radians(turns) / 2), 0.0)
+        legs = TrajectoryCalculator.leg_distances(latitudes, longitudes)
+        remaining[:-1] = np.cumsum(legs[::-1])[::-1]
+    return inbound, turn_tan, remaining
+
+
+@dataclass(frozen=True)
+class AutopilotSnapshot:
+    engaged: bool
+    lnav: bool
+    vnav: bool
+    target_heading: float
+    target_altitude: float
+    target_speed: float
+    arrived: bool
+    active_waypoint_index: int
+    # Guidance tuples of the fixes still to fly, shared with the autopilot
+    guidance: Tuple[tuple, ...]
+
+
+_GUIDANCE = ('_fixes', '_lats', '_lons', '_inbound', '_turn_tan', '_remaining')
+
+
+def _clamp(value: float, limit: float) -> float:
+    return limit if value > limit else -limit if value < -limit else value
 
 
 class Autopilot:
-    def __init__(self, flight_plan: FlightPlan):
+    """
+    Closed-loop heading, altitude and speed controller for one aircraft.
+
+    With LNAV engaged the autopilot steers towards the active fix of the
+    flight plan and sequences it when the turn onto the next leg must start
+    (or once the fix is abeam); with VNAV engaged the altitude target follows
+    the vertical profile at the aircraft's distance to go. Heading, altitude
+    and speed change at rate-limited, dt-proportional rates. update() splits
+    each simulator tick into sub-steps of 1/substep_hz seconds; the sub-step
+    loop uses only local floats and math functions, and never logs.
+    """
+
+    def __init__(self, flight_plan: FlightPlan, vertical_profile: Optional[VerticalProfile] = None,
+                 target_speed: Optional[float] = None, substep_hz: float = DEFAULT_SUBSTEP_HZ,
+                 verbose: bool = True):
+        if substep_hz <= 0:
+            raise ValueError("Sub-step rate must be positive")
         self.flight_plan = flight_plan
         self.trajectory_calculator = TrajectoryCalculator()
-        self.current_state = None
+        self.vertical_profile = vertical_profile or VerticalProfileBuilder().build(
+            flight_plan, DEFAULT_TAKEOFF_WEIGHT_KG, DEFAULT_CRUISE_ALTITUDE_FT)
+        self.substep_hz = substep_hz
+        self.verbose = verbose
+        self.current_state: Optional[AircraftState] = None
+
+        self.lnav = True
+        self.vnav = True
+        self.target_heading = math.nan
+        self.target_altitude = math.nan
+        self.target_speed = math.nan if target_speed is None else float(target_speed)
+        self.arrived = False
+
+        self._profile_distances = self.vertical_profile.distances_km.tolist()
+        self._profile_altitudes = self.vertical_profile.altitudes_ft.tolist()
+        self._profile_total = self._profile_distances[-1]
+        self._load_fixes(flight_plan.get_flight_route(), active=1)
+
+    def _load_fixes(self, fixes: Sequence[Waypoint], active: int, first: Optional[Tuple[float, float]] = None):
+        """Guidance lists of the fixes still to fly; first replaces the position of fixes[0]."""
+        latitudes, longitudes = TrajectoryCalculator.route_arrays(fixes)
+        if first is not None:
+            latitudes[0], longitudes[0] = first
+        inbound, turn_tan, remaining = _route_geometry(latitudes, longitudes)
+        # Tuples: never modified in place, so snapshots and forks share them
+        self._fixes = tuple(fixes)
+        self._lats = tuple(np.radians(latitudes).tolist())
+        self._lons = tuple(np.radians(longitudes).tolist())
+        self._inbound = tuple(inbound.tolist())
+        self._turn_tan = tuple(turn_tan.tolist())
+        self._remaining = tuple(remaining.tolist())
+        self.active_waypoint_index = min(active, len(fixes) - 1)
+
+    @property
+    def engaged(self) -> bool:
+        return self.current_state is not None
+
+    @property
+    def active_waypoint(self) -> Waypoint:
+        return self._fixes[self.active_waypoint_index]
 
     def engage(self, initial_state: AircraftState):
         """
@@ -17,47 +150,64 @@ class Autopilot:
         :param initial_state: Initial aircraft state
         """
         self.current_state = initial_state
-        print("Autopilot engaged.")
+        self.arrived = False
+        if math.isnan(self.target_speed):
+            self.target_speed = float(initial_state.speed)
+        if math.isnan(self.target_heading):
+            self.target_heading = float(initial_state.heading)
+        if math.isnan(self.target_altitude):
+            self.target_altitude = float(initial_state.altitude)
+        if self.verbose:
+            print("Autopilot engaged.")
 
-    def navigate_to_waypoint(self, target_waypoint):
-        """
-        Navigate to a specific waypoint.
+    def disengage(self):
+        self.current_state = None
 
-        :param target_waypoint: Waypoint to navigate to
-        """
+    def _require_engaged(self):
         if not self.current_state:
             raise ValueError("Autopilot not engaged. Call engage() first.")
 
-        # Calculate bearing to waypoint
-        bearing = self.trajectory_calculator.calculate_bearing(
-            self.current_state.current_position,
-            target_waypoint
-        )
+    def set_heading(self, heading: float):
+        """Heading hold: leave LNAV and turn onto a fixed heading."""
+        self.lnav = False
+        self.target_heading = heading % 360.0
 
-        # Adjust heading
-        self.current_state.heading = bearing
+    def engage_lnav(self):
+        self.lnav = True
 
-        # Maintain altitude and speed
-        print(f"Navigating to waypoint: {target_waypoint.name}")
-        print(f"Adjusted heading to: {bearing}°")
+    def engage_vnav(self):
+        self.vnav = True
 
-    def maintain_altitude(self, target_altitude: float):
+    def navigate_to_waypoint(self, target_waypoint: Waypoint):
         """
-        Maintain a specific altitude.
+        Navigate directly to a waypoint and continue along the flight plan from there.
 
-        :param target_altitude: Altitude to maintain in feet
+        A waypoint that is not in the rest of the flight plan is flown to
+        directly, followed by the remaining fixes.
+
+        :param target_waypoint: Waypoint to navigate to
         """
-        if not self.current_state:
-            raise ValueError("Autopilot not engaged. Call engage() first.")
+        self._require_engaged()
+        state = self.current_state
+        remaining = list(self._fixes[self.active_waypoint_index:])
+        codes = [fix.icao_code for fix in remaining]
+        if target_waypoint.icao_code in codes:
+            remaining = remaining[codes.index(target_waypoint.icao_code) + 1:]
+        # A pseudo-fix at the present position makes the direct leg the active one
+        self._load_fixes([self._fixes[self.active_waypoint_index - 1], target_waypoint] + remaining, active=1,
+                         first=state.current_position)
+        self.lnav = True
+        self.target_heading = self.trajectory_calculator.initial_bearing(
+            state.latitude, state.longitude, target_waypoint.latitude, target_waypoint.longitude)
 
-        # Simple altitude adjustment logic
-        altitude_diff = target_altitude - self.current_state.altitude
+    def maintain_altitude(self, target_altitude: float):
+        """
+        Maintain a specific altitude (leaves VNAV).
 
-        if abs(altitude_diff) > 100:
-            # Adjust climb/descent rate
-            climb_rate = 500 if altitude_diff > 0 else -500
-            self.current_state.altitude += climb_rate / 60  # per minute
-            print(f"Adjusting altitude. Target: {target_altitude} ft, Current: {self.current_state.altitude} ft")
+        :param target_altitude: Altitude to maintain in feet
+        """
+        self.vnav = False
+        self.target_altitude = target_altitude
 
     def maintain_speed(self, target_speed: float):
         """
@@ -65,14 +215,392 @@ class Autopilot:
 
         :param target_speed: Speed to maintain in knots
         """
-        if not self.current_state:
-            raise ValueError("Autopilot not engaged. Call engage() first.")
+        self.target_speed = target_speed
+
+    def snapshot(self) -> AutopilotSnapshot:
+        """Modes, targets and LNAV progress, without copying the guidance data."""
+        return AutopilotSnapshot(self.engaged, self.lnav, self.vnav, self.target_heading, self.target_altitude,
+                                 self.target_speed, self.arrived, self.active_waypoint_index,
+                                 tuple(getattr(self, name) for name in _GUIDANCE))
+
+    def restore(self, snapshot: AutopilotSnapshot, state: AircraftState):
+        """
+        Return to a snapshot.
+
+        :param snapshot: AutopilotSnapshot of this autopilot or of one forked from the same flight plan
+        :param state: Aircraft state the autopilot flies from now on
+        """
+        self.current_state = state if snapshot.engaged else None
+        self.lnav, self.vnav = snapshot.lnav, snapshot.vnav
+        self.target_heading = snapshot.target_heading
+        self.target_altitude = snapshot.target_altitude
+        self.target_speed = snapshot.target_speed
+        self.arrived = snapshot.arrived
+        self.active_waypoint_index = snapshot.active_waypoint_index
+        for name, value in zip(_GUIDANCE, snapshot.guidance):
+            setattr(self, name, value)
+
+    def fork(self, state: AircraftState) -> 'Autopilot':
+        """Independent copy flying state, sharing the profile and guidance data."""
+        forked = copy.copy(self)
+        forked.restore(self.snapshot(), state)
+        return forked
+
+    def _profile_altitude(self, distance_km: float) -> float:
+        distances, altitudes = self._profile_distances, self._profile_altitudes
+        index = bisect.bisect_right(distances, distance_km)
+        if index <= 0:
+            return altitudes[0]
+        if index >= len(distances):
+            return altitudes[-1]
+        d0, d1 = distances[index - 1], distances[index]
+        a0 = altitudes[index - 1]
+        return a0 + (altitudes[index] - a0) * (distance_km - d0) / (d1 - d0)
+
+    def update(self, state: AircraftState, time_step: float) -> AircraftState:
+        """
+        Fly one simulator tick in sub-steps and write the result into state.
+
+        :param state: Aircraft state to advance in place
+        :param time_step: Tick length in seconds
+        :return: The same state
+        """
+        if self.arrived:
+            return state
+        substeps = max(1, int(round(time_step * self.substep_hz)))
+        dt = time_step / substeps
+
+        lat = math.radians(state.latitude)
+        lon = math.radians(state.longitude)
+        heading = state.heading
+        altitude = state.altitude
+        speed = state.speed
+        flown = state.along_track_km
+        target_heading = self.target_heading
+        target_altitude = self.target_altitude
+        target_speed = self.target_speed
+        lnav, vnav = self.lnav, self.vnav
+        lats, lons, inbound, turn_tan, remaining = self._lats, self._lons, self._inbound, self._turn_tan, \
+            self._remaining
+        active = self.active_waypoint_index
+        last = len(lats) - 1
+        max_climb = MAX_VERTICAL_SPEED_FPM / 60.0
+        distance_to_go = 0.0
+
+        for _ in range(substeps):
+            if lnav:
+                bearing, distance = _bearing_distance(lat, lon, lats[active], lons[active])
+                lead = speed * _KNOTS_TO_KMS / _TURN_RATE_RAD_S * turn_tan[active]
+                if distance <= max(lead, MIN_SEQUENCING_KM) or math.cos(bearing - inbound[active]) < 0:
+                    if active == last:
+                        self.arrived = True
+                        speed = 0.0
+                        break
+                    active += 1
+                    # Steer to the new fix from this sub-step on
+                    bearing, distance = _bearing_distance(lat, lon, lats[active], lons[active])
+                target_heading = math.degrees(bearing) % 360.0
+                distance_to_go = distance + remaining[active]
+
+            if vnav:
+                position_km = self._profile_total - distance_to_go if lnav else flown
+                target_altitude = self._profile_altitude(position_km)
+
+            error = (target_heading - heading + 540.0) % 360.0 - 180.0
+            heading = (heading + _clamp(HEADING_GAIN * error, TURN_RATE_DEG_S) * dt) % 360.0
+            altitude += _clamp((target_altitude - altitude) / ALTITUDE_TIME_CONSTANT_S, max_climb) * dt
+            speed += _clamp((target_speed - speed) / SPEED_TIME_CONSTANT_S, MAX_ACCELERATION_KNOTS_S) * dt
+
+            step_km = speed * _KNOTS_TO_KMS * dt
+            course = math.radians(heading)
+            lat += step_km * math.cos(course) / EARTH_RADIUS_KM
+            lon += step_km * math.sin(course) / (EARTH_RADIUS_KM * math.cos(lat))
+            flown += step_km
+
+        self.active_waypoint_index = active
+        self.target_heading = target_heading
+        self.target_altitude = target_altitude
+        state.latitude = math.degrees(lat)
+        state.longitude = math.degrees(lon)
+        state.heading = heading
+        state.altitude = altitude
+        state.speed = speed
+        state.along_track_km = flown
+        return state
+
+
+# Rows of the FleetAutopilot fix buffer
+FIX_LAT = 0          # radians
+FIX_LON = 1          # radians
+FIX_INBOUND = 2      # inbound course, radians
+FIX_TURN_TAN = 3     # tan of half the turn at the fix
+FIX_REMAINING = 4    # distance flown after the fix, km
+_FIX_ROWS = 5
+
+
+class FleetAutopilot:
+    """
+    Vectorized LNAV/VNAV/speed autopilot for every aircraft of a FleetSimulator.
+
+    Uses the same control laws as Autopilot, applied to the fleet's per-slot
+    state arrays with in-place operations on preallocated scratch buffers.
+    Fixes of all aircraft share one column-major buffer addressed by per-slot
+    offsets, like the fleet's routes. VNAV follows a linearized profile
+    (climb to top of climb, cruise, descent from top of descent) so that all
+    aircraft can be evaluated in one expression. Attach it before adding
+    aircraft; the fleet then calls update() from its step().
+    """
+
+    # Per-slot buffers: (attribute, dtype, value of an empty slot)
+    _SLOT_FIELDS = (
+        ('target_headings', float, 0.0), ('target_altitudes', float, 0.0), ('target_speeds', float, 0.0),
+        ('active_fixes', np.intp, 0), ('fix_offsets', np.intp, 0), ('fix_lengths', np.intp, 1),
+        ('engaged', bool, False), ('_origin_ft', float, 0.0), ('_destination_ft', float, 0.0),
+        ('_cruise_ft', float, 0.0), ('_total_km', float, 0.0), ('_inverse_climb_km', float, 0.0),
+        ('_inverse_descent_km', float, 0.0),
+        # Whether the slot's fixes are stored; unlike engaged, this stays set after arrival
+        ('_has_fixes', bool, False),
+    )
+    _SCRATCH_FLOATS = ('lat', 'lon', 'target_lat', 'target_lon', 'dlon', 'cos_lat', 'cos_target', 'x', 'y',
+                       'bearing', 'distance', 'lead', 'a', 'b', 'position')
+    _SCRATCH_BOOLS = ('flying', 'sequence', 'at_last', 'arriving')
+
+    def __init__(self, fleet, substep_hz: float = DEFAULT_SUBSTEP_HZ):
+        if len(fleet):
+            raise ValueError("Attach the fleet autopilot before adding aircraft")
+        if substep_hz <= 0:
+            raise ValueError("Sub-step rate must be positive")
+        self.fleet = fleet
+        self.substep_hz = substep_hz
+        self._capacity = 0
+        self._fixes = np.zeros((_FIX_ROWS, 256))
+        self._fix_used = 0
+        self._fix_garbage = 0
+        self._grow(fleet._capacity)
+        fleet.autopilot = self
+
+    def _grow(self, capacity: int):
+        old = self._capacity
+        for name, dtype, empty in self._SLOT_FIELDS:
+            grown = np.full(capacity, empty, dtype=dtype)
+            if old:
+                grown[:old] = getattr(self, name)
+            setattr(self, name, grown)
+        self._scratch = {name: np.zeros(capacity) for name in self._SCRATCH_FLOATS}
+        self._scratch.update({name: np.zeros(capacity, dtype=bool) for name in self._SCRATCH_BOOLS})
+        self._rows = np.zeros(capacity, dtype=np.intp)
+        self._last_fix = np.zeros(capacity, dtype=np.intp)
+        self._capacity = capacity
+
+    def _store_fixes(self, fixes: np.ndarray) -> int:
+        needed = self._fix_used + fixes.shape[1]
+        if needed > self._fixes.shape[1]:
+            grown = np.zeros((_FIX_ROWS, max(needed, 2 * self._fixes.shape[1])))
+            grown[:, :self._fix_used] = self._fixes[:, :self._fix_used]
+            self._fixes = grown
+        offset = self._fix_used
+        self._fixes[:, offset:needed] = fixes
+        self._fix_used = needed
+        return offset
+
+    def _add(self, slot: int, flight_plan: FlightPlan, target_speed: float, profile: VerticalProfile):
+        """Called by FleetSimulator.add_aircraft once the slot is loaded."""
+        if slot >= self._capacity:
+            self._grow(self.fleet._capacity)
+        latitudes, longitudes = TrajectoryCalculator.route_arrays(flight_plan.get_flight_route())
+        inbound, turn_tan, remaining = _route_geometry(latitudes, longitudes)
+        fixes = np.empty((_FIX_ROWS, len(latitudes)))
+        fixes[FIX_LAT] = np.radians(latitudes)
+        fixes[FIX_LON] = np.radians(longitudes)
+        fixes[FIX_INBOUND] = inbound
+        fixes[FIX_TURN_TAN] = turn_tan
+        fixes[FIX_REMAINING] = remaining
+
+        self.fix_offsets[slot] = self._store_fixes(fixes)
+        self.fix_lengths[slot] = len(latitudes)
+        self._has_fixes[slot] = True
+        self.active_fixes[slot] = 1
+        self.engaged[slot] = True
+        self.target_speeds[slot] = target_speed
+        self.target_headings[slot] = self.fleet.headings[slot]
+        self.target_altitudes[slot] = self.fleet.altitudes[slot]
+        total = float(profile.distances_km[-1])
+        self._origin_ft[slot] = profile.altitudes_ft[0]
+        self._destination_ft[slot] = profile.altitudes_ft[-1]
+        self._cruise_ft[slot] = profile.cruise_altitude_ft
+        self._total_km[slot] = total
+        self._inverse_climb_km[slot] = 1.0 / max(profile.top_of_climb_km, 1e-6)
+        self._inverse_descent_km[slot] = 1.0 / max(total - profile.top_of_descent_km, 1e-6)
+
+    def _remove(self, slot: int):
+        """Called by FleetSimulator.remove_aircraft before the slot is freed."""
+        self._fix_garbage += int(self.fix_lengths[slot])
+        for name, _, empty in self._SLOT_FIELDS:
+            getattr(self, name)[slot] = empty
+        if self._fix_garbage > self._fix_used // 2:
+            self._compact_fixes()
+
+    def _compact_fixes(self):
+        slots = np.flatnonzero(self._has_fixes)
+        lengths = self.fix_lengths[slots]
+        new_offsets = np.cumsum(lengths) - lengths
+        total = int(lengths.sum())
+        gather = np.repeat(self.fix_offsets[slots] - new_offsets, lengths) + np.arange(total)
+        self._fixes[:, :total] = self._fixes[:, gather]
+        self.fix_offsets[slots] = new_offsets
+        self._fix_used = total
+        self._fix_garbage = 0
+
+    def _track_active_fixes(self):
+        """Bearing and haversine distance from every slot to its active fix, into the scratch buffers."""
+        s = self._scratch
+        lat, lon, target_lat, target_lon = s['lat'], s['lon'], s['target_lat'], s['target_lon']
+        dlon, cos_lat, cos_target, x, y = s['dlon'], s['cos_lat'], s['cos_target'], s['x'], s['y']
+        bearing, distance, a, b = s['bearing'], s['distance'], s['a'], s['b']
+        rows, fixes = self._rows, self._fixes
+        np.add(self.fix_offsets, self.active_fixes, out=rows)
+        np.take(fixes[FIX_LAT], rows, out=target_lat)
+        np.take(fixes[FIX_LON], rows, out=target_lon)
+
+        np.subtract(target_lon, lon, out=dlon)
+        np.cos(lat, out=cos_lat)
+        np.cos(target_lat, out=cos_target)
+        np.sin(dlon, out=y)
+        np.multiply(y, cos_target, out=y)
+        np.sin(target_lat, out=x)
+        np.multiply(x, cos_lat, out=x)
+        np.sin(lat, out=a)
+        np.multiply(a, cos_target, out=a)
+        np.cos(dlon, out=b)
+        np.multiply(a, b, out=a)
+        np.subtract(x, a, out=x)
+        np.arctan2(y, x, out=bearing)
+
+        np.subtract(target_lat, lat, out=a)
+        np.multiply(a, 0.5, out=a)
+        np.sin(a, out=a)
+        np.square(a, out=a)
+        np.multiply(dlon, 0.5, out=b)
+        np.sin(b, out=b)
+        np.square(b, out=b)
+        np.multiply(b, cos_lat, out=b)
+        np.multiply(b, cos_target, out=b)
+        np.add(a, b, out=a)
+        np.clip(a, 0.0, 1.0, out=a)
+        np.sqrt(a, out=a)
+        np.arcsin(a, out=distance)
+        np.multiply(distance, 2 * EARTH_RADIUS_KM, out=distance)
+
+    def update(self, time_step: float):
+        """
+        Fly every engaged aircraft for one tick in sub-steps.
+
+        :param time_step: Tick length in seconds
+        """
+        fleet = self.fleet
+        s = self._scratch
+        flying, sequence, at_last, arriving = s['flying'], s['sequence'], s['at_last'], s['arriving']
+        lat, lon, x = s['lat'], s['lon'], s['x']
+        bearing, distance, lead, a, b, position = s['bearing'], s['distance'], s['lead'], s['a'], s['b'], \
+            s['position']
+        rows, last_fix, fixes = self._rows, self._last_fix, self._fixes
+        headings, altitudes, speeds = fleet.headings, fleet.altitudes, fleet.speeds
+
+        substeps = max(1, int(round(time_step * self.substep_hz)))
+        dt = time_step / substeps
+        np.subtract(self.fix_lengths, 1, out=last_fix)
+        np.logical_and(self.engaged, fleet.active, out=flying)
+
+        for _ in range(substeps):
+            np.radians(fleet.latitudes, out=lat)
+            np.radians(fleet.longitudes, out=lon)
+            self._track_active_fixes()
+
+            # Sequence fixes that are within turn anticipation distance or abeam
+            np.take(fixes[FIX_TURN_TAN], rows, out=lead)
+            np.multiply(lead, speeds, out=lead)
+            np.multiply(lead, _KNOTS_TO_KMS / _TURN_RATE_RAD_S, out=lead)
+            np.maximum(lead, MIN_SEQUENCING_KM, out=lead)
+            np.less_equal(distance, lead, out=sequence)
+            np.take(fixes[FIX_INBOUND], rows, out=a)
+            np.subtract(bearing, a, out=a)
+            np.cos(a, out=a)
+            np.logical_or(sequence, np.less(a, 0.0, out=arriving), out=sequence)
+            np.logical_and(sequence, flying, out=sequence)
+            np.equal(self.active_fixes, last_fix, out=at_last)
+            np.logical_and(sequence, at_last, out=arriving)
+            np.logical_not(at_last, out=at_last)
+            np.logical_and(sequence, at_last, out=sequence)
+            np.add(self.active_fixes, 1, out=self.active_fixes, where=sequence)
+            if sequence.any():
+                # Steer to the new fixes from this sub-step on
+                self._track_active_fixes()
+            if arriving.any():
+                arrived_slots = np.flatnonzero(arriving)
+                fleet.cursors[arrived_slots] = fleet.route_lengths[arrived_slots] - 1
+                speeds[arrived_slots] = 0.0
+                flying[arrived_slots] = False
+                self.engaged[arrived_slots] = False
+
+            # LNAV: steer to the fix; VNAV: linearized profile at the distance to go
+            np.degrees(bearing, out=a)
+            np.mod(a, 360.0, out=a)
+            np.copyto(self.target_headings, a, where=flying)
+            np.take(fixes[FIX_REMAINING], rows, out=a)
+            np.add(distance, a, out=a)
+            np.subtract(self._total_km, a, out=position)
+            np.multiply(position, self._inverse_climb_km, out=a)
+            np.clip(a, 0.0, 1.0, out=a)
+            np.subtract(self._cruise_ft, self._origin_ft, out=b)
+            np.multiply(a, b, out=a)
+            np.add(a, self._origin_ft, out=a)
+            np.subtract(self._total_km, position, out=b)
+            np.multiply(b, self._inverse_descent_km, out=b)
+            np.clip(b, 0.0, 1.0, out=b)
+            np.subtract(self._cruise_ft, self._destination_ft, out=x)
+            np.multiply(b, x, out=b)
+            np.add(b, self._destination_ft, out=b)
+            np.minimum(a, b, out=a)
+            np.copyto(self.target_altitudes, a, where=flying)
+
+            # Rate-limited heading, altitude and speed
+            np.subtract(self.target_headings, headings, out=a)
+            np.add(a, 540.0, out=a)
+            np.mod(a, 360.0, out=a)
+            np.subtract(a, 180.0, out=a)
+            np.multiply(a, HEADING_GAIN, out=a)
+            np.clip(a, -TURN_RATE_DEG_S, TURN_RATE_DEG_S, out=a)
+            np.multiply(a, dt, out=a)
+            np.add(headings, a, out=headings, where=flying)
+            np.mod(headings, 360.0, out=headings)
+
+            np.subtract(self.target_altitudes, altitudes, out=a)
+            np.multiply(a, 1.0 / ALTITUDE_TIME_CONSTANT_S, out=a)
+            np.clip(a, -MAX_VERTICAL_SPEED_FPM / 60.0, MAX_VERTICAL_SPEED_FPM / 60.0, out=a)
+            np.multiply(a, dt, out=a)
+            np.add(altitudes, a, out=altitudes, where=flying)
 
-        # Simple speed adjustment logic
-        speed_diff = target_speed - self.current_state.speed
+            np.subtract(self.target_speeds, speeds, out=a)
+            np.multiply(a, 1.0 / SPEED_TIME_CONSTANT_S, out=a)
+            np.clip(a, -MAX_ACCELERATION_KNOTS_S, MAX_ACCELERATION_KNOTS_S, out=a)
+            np.multiply(a, dt, out=a)
+            np.add(speeds, a, out=speeds, where=flying)
 
-        if abs(speed_diff) > 10:
-            # Adjust speed
-            acceleration = 50 if speed_diff > 0 else -50
-            self.current_state.speed += acceleration / 60  # per minute
-            print(f"Adjusting speed. Target: {target_speed} knots, Current: {self.current_state.speed} knots")
+            # Advance positions along the new headings
+            np.multiply(speeds, _KNOTS_TO_KMS * dt, out=distance)
+            np.add(fleet.along_track_km, distance, out=fleet.along_track_km, where=flying)
+            np.radians(headings, out=bearing)
+            np.cos(bearing, out=a)
+            np.multiply(a, distance, out=a)
+            np.multiply(a, 1.0 / EARTH_RADIUS_KM, out=a)
+            np.add(lat, a, out=lat)
+            np.sin(bearing, out=b)
+            np.multiply(b, distance, out=b)
+            np.cos(lat, out=x)
+            np.multiply(x, EARTH_RADIUS_KM, out=x)
+            np.divide(b, x, out=b)
+            np.add(lon, b, out=lon)
+            np.degrees(lat, out=a)
+            np.copyto(fleet.latitudes, a, where=flying)
+            np.degrees(lon, out=b)
+            np.copyto(fleet.longitudes, b, where=flying)
@@ -0,0 +1,158 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.database.waypoint_manager import WaypointManager
+from src.navigation.trajectory_calculator import TrajectoryCalculator
+
+KM_TO_NM = 0.539957
+
+# (origin code, destination code, via codes as a list or space-separated string, average speed in knots)
+ScheduleRow = Tuple[str, str, Union[Sequence[str], str, None], float]
+
+
+@dataclass
+class BatchResult:
+    distances_km: np.ndarray
+    ete_hours: np.ndarray
+    errors: List[Optional[str]]  # None for rows that produced a valid plan
+
+    @property
+    def valid(self) -> np.ndarray:
+        return np.fromiter((error is None for error in self.errors), dtype=bool, count=len(self.errors))
+
+    @classmethod
+    def concatenate(cls, results: List['BatchResult']) -> 'BatchResult':
+        if not results:
+            return cls(np.empty(0), np.empty(0), [])
+        return cls(
+            np.concatenate([r.distances_km for r in results]),
+            np.concatenate([r.ete_hours for r in results]),
+            [error for r in results for error in r.errors]
+        )
+
+
+def _via_codes(via) -> List[str]:
+    if not via:
+        return []
+    return via.split() if isinstance(via, str) else list(via)
+
+
+def evaluate_chunk(waypoint_manager: WaypointManager, rows: Sequence[ScheduleRow]) -> BatchResult:
+    """
+    Evaluate a chunk of schedule rows with array operations.
+
+    Every route point of the chunk is resolved in one code lookup and every
+    leg is measured in one haversine call; per-row totals come from a
+    segmented sum over the leg array. Invalid rows get NaN distance and ETE
+    plus an error message matching FlightPlanner.create_flight_plan.
+
+    :param waypoint_manager: Waypoint database used to resolve codes
+    :param rows: (origin, destination, via, speed_knots) tuples
+    :return: BatchResult for the chunk
+    """
+    count = len(rows)
+    if count == 0:
+        return BatchResult(np.empty(0), np.empty(0), [])
+    codes: List[str] = []
+    lengths = np.empty(count, dtype=np.intp)
+    speeds = np.empty(count)
+    for i, (origin, destination, via, speed) in enumerate(rows):
+        route = [origin] + _via_codes(via) + [destination]
+        codes.extend(route)
+        lengths[i] = len(route)
+        speeds[i] = speed
+
+    route_rows = waypoint_manager.get_rows_by_codes(codes)
+    known = route_rows >= 0
+    store = waypoint_manager.store
+    # Unknown codes are row -1, which must not reach the gather (it fails on an empty store)
+    lats = np.full(len(codes), np.nan)
+    lons = np.full(len(codes), np.nan)
+    lats[known] = store.latitudes[route_rows[known]]
+    lons[known] = store.longitudes[route_rows[known]]
+
+    # Legs join consecutive points; the pairs spanning two rows are masked out
+    legs = TrajectoryCalculator.haversine_distances(lats[:-1], lons[:-1], lats[1:], lons[1:])
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    row_of_leg = np.repeat(np.arange(count), lengths)[:-1]
+    legs[starts[1:] - 1] = 0.0
+    distances = np.bincount(row_of_leg, weights=np.nan_to_num(legs), minlength=count)
+
+    row_valid = np.logical_and.reduceat(known, starts) & (speeds > 0)
+    errors: List[Optional[str]] = [None] * count
+    for i in np.flatnonzero(~row_valid).tolist():
+        start, end = starts[i], starts[i] + lengths[i]
+        if not (known[start] and known[end - 1]):
+            errors[i] = "Invalid origin or destination waypoint"
+        elif not known[start:end].all():
+            missing = codes[start + 1 + int(np.argmin(known[start + 1:end - 1]))]
+            errors[i] = f"Waypoint with code {missing} not found"
+        else:
+            errors[i] = "Average speed must be positive"
+
+    distances[~row_valid] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ete = np.where(row_valid, distances * KM_TO_NM / speeds, np.nan)
+    return BatchResult(distances, ete, errors)
+
+
+# Per-process database, loaded once by the pool initializer
+_worker_manager: Optional[WaypointManager] = None
+
+
+def _init_worker(database_path: Optional[str]):
+    global _worker_manager
+    _worker_manager = WaypointManager(database_path)
+
+
+def _evaluate_in_worker(rows: Sequence[ScheduleRow]) -> BatchResult:
+    return evaluate_chunk(_worker_manager, rows)
+
+
+class BatchPlanner:
+    """
+    Evaluate large schedules of city pairs across a process pool.
+
+    The schedule is split into chunks that are evaluated with array
+    operations. Each worker process opens the waypoint database once in its
+    initializer (memory-mapping the compiled navdata when it is fresh), so
+    tasks only carry the schedule rows and the result arrays.
+    """
+
+    def __init__(self, database_path: Optional[str] = None, workers: Optional[int] = None,
+                 chunk_size: int = 2000):
+        self.database_path = database_path
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self._manager: Optional[WaypointManager] = None
+
+    def _local_manager(self) -> WaypointManager:
+        if self._manager is None:
+            self._manager = WaypointManager(self.database_path)
+        return self._manager
+
+    def _chunks(self, rows: Iterable[ScheduleRow]):
+        iterator = iter(rows)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def evaluate(self, rows: Iterable[ScheduleRow]) -> BatchResult:
+        """
+        Evaluate a schedule.
+
+        :param rows: (origin, destination, via, speed_knots) tuples
+        :return: BatchResult with one entry per row, in input order
+        """
+        if self.workers <= 1:
+            manager = self._local_manager()
+            return BatchResult.concatenate([evaluate_chunk(manager, chunk) for chunk in self._chunks(rows)])
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.database_path,)) as executor:
+            return BatchResult.concatenate(list(executor.map(_evaluate_in_worker, self._chunks(rows))))
@@ -0,0 +1,43 @@
+"""
+Throughput of BatchPlanner over a synthetic schedule as the worker count grows.
+
+Usage: python bench_batch_planner.py [rows] [max_workers]
+"""
+import os
+import sys
+import time
+import numpy as np
+from src.database.waypoint_manager import WaypointManager
+from src.navigation.batch_planner import BatchPlanner
+
+
+def build_schedule(codes, rows, rng):
+    schedule = []
+    for _ in range(rows):
+        origin, destination, *via = rng.choice(codes, size=2 + int(rng.integers(0, 4)))
+        schedule.append((str(origin), str(destination), [str(code) for code in via],
+                         float(rng.uniform(380, 480))))
+    return schedule
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    codes = [wp.icao_code for wp in WaypointManager().waypoints]
+    schedule = build_schedule(codes, rows, np.random.default_rng(0))
+
+    print(f"{rows} schedule rows over {len(codes)} waypoints")
+    print(f"{'workers':>8} {'seconds':>9} {'rows/s':>12}")
+    workers = 1
+    while workers <= max_workers:
+        planner = BatchPlanner(workers=workers, chunk_size=5000)
+        start = time.perf_counter()
+        result = planner.evaluate(schedule)
+        elapsed = time.perf_counter() - start
+        assert len(result.errors) == rows
+        print(f"{workers:>8} {elapsed:>9.3f} {rows / elapsed:>12.0f}")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Conflict detection time as the number of aircraft grows at constant traffic density.
+
+Usage: python bench_conflict_detection.py [max_aircraft] [lookahead_s]
+"""
+import sys
+import time
+import numpy as np
+from src.simulation.conflict_detection import ConflictDetector
+
+# Aircraft per square degree, roughly a busy en-route sector
+DENSITY = 25.0
+
+
+def build_traffic(count, rng):
+    side = np.sqrt(count / DENSITY)
+    latitudes = rng.uniform(30.0 - side / 2, 30.0 + side / 2, count)
+    longitudes = rng.uniform(-8.0 - side / 2, -8.0 + side / 2, count)
+    altitudes = rng.choice(np.arange(20000, 41000, 1000), count) + rng.normal(0, 150, count)
+    speeds = rng.uniform(250, 480, count)
+    headings = rng.uniform(0, 360, count)
+    vertical_speeds = rng.choice([0.0, 0.0, 0.0, 1500.0, -1500.0], count)
+    return latitudes, longitudes, altitudes, speeds, headings, vertical_speeds
+
+
+def main():
+    max_aircraft = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    lookahead_s = float(sys.argv[2]) if len(sys.argv) > 2 else 300.0
+    detector = ConflictDetector(lookahead_s=lookahead_s)
+    rng = np.random.default_rng(0)
+
+    print(f"{DENSITY:.0f} aircraft per square degree, {lookahead_s:.0f} s look-ahead")
+    print(f"{'aircraft':>9} {'all pairs':>12} {'candidates':>11} {'conflicts':>10} {'ms':>9} {'us/aircraft':>12}")
+    count = 625
+    while count <= max_aircraft:
+        traffic = build_traffic(count, rng)
+        detector.detect(*traffic)  # warm-up
+        start = time.perf_counter()
+        conflicts = detector.detect(*traffic)
+        elapsed = time.perf_counter() - start
+        candidates = len(detector.candidate_pairs(*traffic))
+        print(f"{count:>9} {count * (count - 1) // 2:>12} {candidates:>11} {len(conflicts):>10} "
+              f"{elapsed * 1e3:>9.1f} {elapsed / count * 1e6:>12.1f}")
+        count *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -2,19 +2,28 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog
 from src.database.waypoint_manager import WaypointManager
 from src.navigation.flight_planner import FlightPlanner
+from src.navigation.performance import get_aircraft_performance
+from src.navigation.vertical_profile import VerticalProfileBuilder
 from src.simulation.flight_simulator import FlightSimulator
 
 
 class CDUSimulator:
-    def __init__(self, master):
+    def __init__(self, master, waypoint_manager: WaypointManager = None):
         self.master = master
         master.title("Flight Management System - CDU Simulator")
         master.geometry("800x600")
 
         # Initialize components
-        self.waypoint_manager = WaypointManager()
+        self.waypoint_manager = waypoint_manager or WaypointManager()
         self.flight_planner = FlightPlanner(self.waypoint_manager)
 
+        # Flight state entered on the INIT, RTE and PERF pages
+        self.flight_plan = None
+        self.aircraft_type = 'A320'
+        self.gross_weight = None
+        self.cruise_altitude = 35000.0
+        self.profile_builder = VerticalProfileBuilder(get_aircraft_performance(self.aircraft_type))
+
         # Create main frame
         self.main_frame = tk.Frame(master)
         self.main_frame.pack(padx=20, pady=20, fill=tk.BOTH, expand=True)
@@ -57,6 +66,15 @@ class CDUSimulator:
         fuel = simpledialog.askfloat("INIT", "Enter Fuel Quantity (kg):")
 
         if aircraft_type and weight and fuel:
+            try:
+                performance = get_aircraft_performance(aircraft_type.strip().upper())
+            except ValueError as e:
+                messagebox.showerror("INIT Error", str(e))
+                return
+            self.aircraft_type = performance.aircraft_type
+            self.profile_builder = VerticalProfileBuilder(performance)
+            self.gross_weight = weight + fuel
+
             message = f"Flight Initialized\n" \
                       f"Aircraft: {aircraft_type}\n" \
                       f"Weight: {weight} kg\n" \
@@ -70,6 +88,7 @@ class CDUSimulator:
 
         try:
             flight_plan = self.flight_planner.create_flight_plan(origin, destination)
+            self.flight_plan = flight_plan
             message = f"Route Plan:\n" \
                       f"Origin: {flight_plan.origin.name}\n" \
                       f"Destination: {flight_plan.destination.name}\n" \
@@ -105,11 +124,38 @@ class CDUSimulator:
 
     def performance_settings(self):
         """Configure performance parameters."""
-        self.update_display("PERF: Performance Settings")
+        if self.gross_weight is None:
+            messagebox.showerror("PERF Error", "Complete the INIT page first")
+            return
+        cruise_altitude = simpledialog.askfloat("PERF", "Enter Cruise Altitude (ft):",
+                                                initialvalue=self.cruise_altitude)
+        if cruise_altitude:
+            self.cruise_altitude = cruise_altitude
+
+        performance = self.profile_builder.performance
+        climb = performance.at(self.gross_weight, self.cruise_altitude / 2)
+        cruise = performance.at(self.gross_weight, self.cruise_altitude)
+        message = f"PERF: {self.aircraft_type}\n" \
+                  f"Gross Weight: {self.gross_weight:.0f} kg\n" \
+                  f"Cruise Altitude: FL{self.cruise_altitude / 100:03.0f}\n" \
+                  f"Climb: {climb['climb_rate_fpm']:.0f} ft/min at {climb['tas_climb_knots']:.0f} kt TAS\n" \
+                  f"Cruise: {cruise['tas_cruise_knots']:.0f} kt TAS, {cruise['fuel_flow_cruise_kgph']:.0f} kg/h"
+        self.update_display(message)
 
     def vertical_navigation(self):
         """Configure vertical navigation profile."""
-        self.update_display("VNAV: Vertical Navigation")
+        if self.flight_plan is None or self.gross_weight is None:
+            messagebox.showerror("VNAV Error", "Complete the INIT and RTE pages first")
+            return
+
+        profile = self.profile_builder.build(self.flight_plan, self.gross_weight, self.cruise_altitude)
+        message = f"VNAV: {self.flight_plan.origin.icao_code} - {self.flight_plan.destination.icao_code}\n" \
+                  f"Cruise Altitude: FL{profile.cruise_altitude_ft / 100:03.0f}\n" \
+                  f"Top of Climb: {profile.top_of_climb_km:.1f} km\n" \
+                  f"Top of Descent: {profile.top_of_descent_km:.1f} km\n" \
+                  f"Trip Time: {profile.trip_time_h * 60:.0f} min\n" \
+                  f"Trip Fuel: {profile.trip_fuel_kg:.0f} kg"
+        self.update_display(message)
 
     def flight_progress(self):
         """Display flight progress information."""
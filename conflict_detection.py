@@ -0,0 +1,209 @@
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from src.navigation.trajectory_calculator import EARTH_RADIUS_KM, KNOTS_TO_KMH
+from src.simulation.fleet_simulator import ROUTE_ALTITUDE
+
+NM_TO_KM = 1.852
+
+# One predicted loss of separation between two aircraft
+CONFLICT_DTYPE = np.dtype([
+    ('aircraft_a', 'i8'),
+    ('aircraft_b', 'i8'),
+    ('time_to_loss_s', 'f8'),     # 0 for a loss of separation that already exists
+    ('horizontal_nm', 'f8'),      # separation when it is lost
+    ('vertical_ft', 'f8'),
+])
+
+# Neighbour cells of the 4-D (x, y, z, altitude) grid; only half of them are
+# visited, the mirrored offsets would produce the same pairs the other way round
+_OFFSETS = np.array(np.meshgrid(*[(-1, 0, 1)] * 4, indexing='ij')).reshape(4, -1).T
+_HALF_OFFSETS = _OFFSETS[[tuple(offset) >= (0, 0, 0, 0) for offset in _OFFSETS]]
+
+
+@dataclass(frozen=True)
+class SeparationMinima:
+    horizontal_nm: float = 5.0
+    vertical_ft: float = 1000.0
+
+
+def _grid_pairs(cells: np.ndarray) -> np.ndarray:
+    """
+    Pairs (i, j), i < j, of points whose integer cells are identical or adjacent.
+
+    Cells are packed into one int64 key per point and sorted; the points of
+    each neighbouring cell are then found with two binary searches per point
+    and offset, so the cost is O(n log n + pairs) instead of O(n^2).
+    """
+    n = len(cells)
+    if n < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    origin = cells.min(axis=0) - 1
+    spans = cells.max(axis=0) - origin + 2
+    strides = np.array([spans[1] * spans[2] * spans[3], spans[2] * spans[3], spans[3], 1], dtype=np.int64)
+    keys = (cells - origin).astype(np.int64) @ strides
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    positions = np.arange(n)
+
+    firsts, seconds = [], []
+    for offset in _HALF_OFFSETS:
+        targets = sorted_keys + int(offset @ strides)
+        low = np.searchsorted(sorted_keys, targets, side='left')
+        high = np.searchsorted(sorted_keys, targets, side='right')
+        if not offset.any():
+            low = positions + 1   # same cell: only the points after this one
+        counts = np.maximum(high - low, 0)
+        total = int(counts.sum())
+        if not total:
+            continue
+        starts = np.cumsum(counts) - counts
+        firsts.append(np.repeat(positions, counts))
+        seconds.append(np.arange(total) - np.repeat(starts - low, counts))
+    if not firsts:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.column_stack((order[np.concatenate(firsts)], order[np.concatenate(seconds)]))
+    pairs.sort(axis=1)
+    return pairs
+
+
+class ConflictDetector:
+    """
+    Predicts losses of separation between many aircraft.
+
+    Aircraft are extrapolated along their heading and speed (and vertical
+    speed, if given) over the look-ahead horizon. At each sample time they
+    are binned into a grid of Earth-centred x/y/z and altitude cells sized
+    so that any pair that can lose separation before the next sample sits in
+    the same or an adjacent cell; only those candidate pairs are kept. The
+    candidates are then checked exactly, with a closest-approach computation
+    over the whole horizon in a local flat frame.
+    """
+
+    def __init__(self, minima: Optional[SeparationMinima] = None, lookahead_s: float = 300.0,
+                 sample_interval_s: float = 60.0):
+        if lookahead_s < 0 or sample_interval_s <= 0:
+            raise ValueError("Look-ahead must not be negative and the sample interval must be positive")
+        self.minima = minima or SeparationMinima()
+        self.lookahead_s = lookahead_s
+        self.sample_interval_s = sample_interval_s
+
+    def candidate_pairs(self, latitudes, longitudes, altitudes, speeds=None, headings=None,
+                        vertical_speeds=None) -> np.ndarray:
+        """Index pairs that may lose separation within the horizon (a superset of the conflicts)."""
+        lat = np.radians(np.asarray(latitudes, dtype=float))
+        lon = np.radians(np.asarray(longitudes, dtype=float))
+        altitudes = np.asarray(altitudes, dtype=float)
+        n = len(lat)
+        speeds_kms = np.zeros(n) if speeds is None else np.asarray(speeds, dtype=float) * KNOTS_TO_KMH / 3600
+        course = np.zeros(n) if headings is None else np.radians(np.asarray(headings, dtype=float))
+        climb_fts = np.zeros(n) if vertical_speeds is None else np.asarray(vertical_speeds, dtype=float) / 60
+        north, east = speeds_kms * np.cos(course), speeds_kms * np.sin(course)
+
+        step = min(self.sample_interval_s, self.lookahead_s) if self.lookahead_s else 0.0
+        samples = np.arange(0.0, self.lookahead_s + step / 2, step) if step else np.zeros(1)
+        # Between samples two aircraft close by at most 2 * max speed * step / 2
+        cell_km = self.minima.horizontal_nm * NM_TO_KM + float(speeds_kms.max(initial=0.0)) * step
+        cell_ft = self.minima.vertical_ft + float(np.abs(climb_fts).max(initial=0.0)) * step
+
+        pairs = []
+        for t in samples:
+            sample_lat = lat + north * t / EARTH_RADIUS_KM
+            sample_lon = lon + east * t / (EARTH_RADIUS_KM * np.cos(sample_lat))
+            cos_lat = np.cos(sample_lat)
+            cells = np.empty((n, 4), dtype=np.int64)
+            # Chord lengths between cell centres never exceed great-circle distances
+            cells[:, 0] = np.floor(EARTH_RADIUS_KM * cos_lat * np.cos(sample_lon) / cell_km)
+            cells[:, 1] = np.floor(EARTH_RADIUS_KM * cos_lat * np.sin(sample_lon) / cell_km)
+            cells[:, 2] = np.floor(EARTH_RADIUS_KM * np.sin(sample_lat) / cell_km)
+            cells[:, 3] = np.floor((altitudes + climb_fts * t) / cell_ft)
+            pairs.append(_grid_pairs(cells))
+        pairs = np.concatenate(pairs)
+        if len(samples) > 1 and len(pairs):
+            pairs = np.unique(pairs, axis=0)
+        return pairs
+
+    def detect(self, latitudes, longitudes, altitudes, speeds=None, headings=None, vertical_speeds=None,
+               aircraft_ids=None) -> np.ndarray:
+        """
+        Find every pair of aircraft that is, or will be within the horizon, closer than the minima.
+
+        :param latitudes: Latitudes in degrees
+        :param longitudes: Longitudes in degrees
+        :param altitudes: Altitudes in feet
+        :param speeds: Ground speeds in knots (default: stationary)
+        :param headings: Tracks in degrees
+        :param vertical_speeds: Vertical speeds in ft/min (default: level)
+        :param aircraft_ids: Ids reported in the result (default: array positions)
+        :return: CONFLICT_DTYPE array sorted by time to loss of separation
+        """
+        pairs = self.candidate_pairs(latitudes, longitudes, altitudes, speeds, headings, vertical_speeds)
+        n = len(pairs)
+        if not n:
+            return np.empty(0, dtype=CONFLICT_DTYPE)
+        a, b = pairs[:, 0], pairs[:, 1]
+        lat = np.radians(np.asarray(latitudes, dtype=float))
+        lon = np.radians(np.asarray(longitudes, dtype=float))
+        altitudes = np.asarray(altitudes, dtype=float)
+        count = len(lat)
+        speeds_kms = np.zeros(count) if speeds is None else np.asarray(speeds, dtype=float) * KNOTS_TO_KMH / 3600
+        course = np.zeros(count) if headings is None else np.radians(np.asarray(headings, dtype=float))
+        climb_fts = np.zeros(count) if vertical_speeds is None else np.asarray(vertical_speeds, dtype=float) / 60
+
+        # Relative position and velocity of b seen from a, in a flat frame at the pair's mean latitude
+        dlon = (lon[b] - lon[a] + np.pi) % (2 * np.pi) - np.pi
+        x = dlon * np.cos((lat[a] + lat[b]) / 2) * EARTH_RADIUS_KM
+        y = (lat[b] - lat[a]) * EARTH_RADIUS_KM
+        vx = speeds_kms[b] * np.sin(course[b]) - speeds_kms[a] * np.sin(course[a])
+        vy = speeds_kms[b] * np.cos(course[b]) - speeds_kms[a] * np.cos(course[a])
+        z = altitudes[b] - altitudes[a]
+        vz = climb_fts[b] - climb_fts[a]
+
+        # Time interval with horizontal distance below the minimum: |r + v t| < h
+        h = self.minima.horizontal_nm * NM_TO_KM
+        qa = vx * vx + vy * vy
+        qb = x * vx + y * vy
+        qc = x * x + y * y - h * h
+        moving = qa > 1e-12
+        discriminant = qb * qb - qa * qc
+        root = np.sqrt(np.maximum(discriminant, 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            h_start = np.where(moving, (-qb - root) / qa, -np.inf)
+            h_end = np.where(moving, (-qb + root) / qa, np.inf)
+        h_inside = np.where(moving, discriminant > 0, qc < 0)
+
+        # Time interval with vertical distance below the minimum: |z + vz t| < v
+        v = self.minima.vertical_ft
+        climbing = np.abs(vz) > 1e-12
+        with np.errstate(divide='ignore', invalid='ignore'):
+            v_first = (-v - z) / vz
+            v_second = (v - z) / vz
+        v_start = np.where(climbing, np.minimum(v_first, v_second), -np.inf)
+        v_end = np.where(climbing, np.maximum(v_first, v_second), np.inf)
+        v_inside = climbing | (np.abs(z) < v)
+
+        start = np.maximum(np.maximum(h_start, v_start), 0.0)
+        end = np.minimum(np.minimum(h_end, v_end), self.lookahead_s)
+        conflict = h_inside & v_inside & (start <= end) & (start < np.minimum(h_end, v_end))
+
+        ids = np.arange(count) if aircraft_ids is None else np.asarray(aircraft_ids)
+        result = np.empty(int(conflict.sum()), dtype=CONFLICT_DTYPE)
+        t = start[conflict]
+        result['aircraft_a'] = ids[a[conflict]]
+        result['aircraft_b'] = ids[b[conflict]]
+        result['time_to_loss_s'] = t
+        result['horizontal_nm'] = np.hypot(x[conflict] + vx[conflict] * t, y[conflict] + vy[conflict] * t) / NM_TO_KM
+        result['vertical_ft'] = np.abs(z[conflict] + vz[conflict] * t)
+        return result[np.argsort(result['time_to_loss_s'], kind='stable')]
+
+    def detect_fleet(self, fleet) -> np.ndarray:
+        """Conflicts between the active aircraft of a FleetSimulator, reported by aircraft id."""
+        slots = np.flatnonzero(fleet.active & ~fleet.arrived)
+        # Vertical speed from the altitude of the next route sample, in ft/min
+        cursors, offsets = fleet.cursors[slots], fleet.route_offsets[slots]
+        following = np.minimum(cursors + 1, fleet.route_lengths[slots] - 1)
+        altitudes = fleet._routes[ROUTE_ALTITUDE]
+        vertical_speeds = (altitudes[offsets + following] - altitudes[offsets + cursors]) \
+            / fleet.sample_interval_s * 60.0
+        return self.detect(fleet.latitudes[slots], fleet.longitudes[slots], fleet.altitudes[slots],
+                           fleet.speeds[slots], fleet.headings[slots], vertical_speeds, aircraft_ids=fleet._ids[slots])
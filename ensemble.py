@@ -0,0 +1,222 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from src.navigation.flight_planner import FlightPlan
+from src.navigation.trajectory_calculator import TRAJ_COURSE, TRAJ_DISTANCE, TRAJ_LAT, TRAJ_LON
+from src.navigation.vertical_profile import VerticalProfile, VerticalProfileBuilder
+from src.navigation.wind_field import WindField
+from src.simulation.flight_simulator import DEFAULT_CRUISE_ALTITUDE_FT, DEFAULT_TAKEOFF_WEIGHT_KG
+
+KNOTS_TO_KMH = 1.852
+MIN_GROUND_SPEED_KNOTS = 50.0
+# Relative weight step of the profile used to measure weight sensitivities
+_WEIGHT_STEP = 0.05
+
+
+@dataclass(frozen=True)
+class Dispersions:
+    speed_sigma: float = 0.02         # relative 1-sigma error on true airspeed
+    wind_sigma_knots: float = 15.0    # 1-sigma along-track wind error
+    climb_rate_sigma: float = 0.10    # relative 1-sigma error on climb rate
+    weight_sigma: float = 0.03        # relative 1-sigma error on takeoff weight
+
+
+@dataclass
+class _EnsembleModel:
+    """Nominal flight, sampled along the trajectory; shipped to every worker once."""
+    segment_km: np.ndarray       # length of each trajectory segment
+    midpoint_km: np.ndarray      # along-track distance of each segment midpoint
+    tailwind_knots: np.ndarray   # nominal along-track wind on each segment
+    top_of_climb_km: float
+    top_of_descent_km: float
+    phase_speed_knots: np.ndarray  # climb, cruise, descent mean TAS
+    phase_fuel_flow: np.ndarray    # climb, cruise, descent mean kg/h
+    # d ln(value) / d ln(weight) from the performance tables
+    fuel_flow_weight_exponent: np.ndarray  # per phase
+    top_of_climb_weight_exponent: float
+    dispersions: Dispersions
+
+
+@dataclass
+class EnsembleResult:
+    arrival_times_h: np.ndarray = field(default_factory=lambda: np.empty(0))
+    fuel_kg: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    def __len__(self) -> int:
+        return len(self.arrival_times_h)
+
+    def arrival_percentiles(self, percentiles: Sequence[float] = (5, 50, 95)) -> np.ndarray:
+        """Arrival-time percentiles in hours after departure."""
+        return np.percentile(self.arrival_times_h, percentiles)
+
+    def fuel_percentiles(self, percentiles: Sequence[float] = (5, 50, 95)) -> np.ndarray:
+        return np.percentile(self.fuel_kg, percentiles)
+
+    def fuel_histogram(self, bins: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """Counts and bin edges of the trip-fuel distribution."""
+        return np.histogram(self.fuel_kg, bins=bins)
+
+
+def _phase_means(profile: VerticalProfile) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean TAS and fuel flow of the climb, cruise and descent phases of a profile."""
+    bounds = np.array([0.0, profile.top_of_climb_km, profile.top_of_descent_km, profile.distances_km[-1]])
+    times = np.interp(bounds, profile.distances_km, profile.times_h)
+    fuel = np.interp(bounds, profile.distances_km, profile.fuel_kg)
+    durations = np.diff(times)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speeds = np.diff(bounds) / durations / KNOTS_TO_KMH
+        flows = np.diff(fuel) / durations
+    # A phase of zero length (e.g. no cruise on a short hop) borrows its neighbour's values
+    for values in (speeds, flows):
+        valid = np.isfinite(values)
+        values[~valid] = np.interp(np.flatnonzero(~valid), np.flatnonzero(valid), values[valid])
+    return speeds, flows
+
+
+def run_seed(seed: int, run: int) -> np.random.SeedSequence:
+    """Seed of one run; identical to SeedSequence(seed).spawn(n)[run] but built without the others."""
+    return np.random.SeedSequence(seed, spawn_key=(run,))
+
+
+def simulate_runs(model: _EnsembleModel, seed: int, runs: range) -> EnsembleResult:
+    """
+    Fly one perturbed copy of the nominal flight per run with the reduced-order model.
+
+    No FlightSimulator or Autopilot is involved: each run integrates the
+    nominal per-segment model with its own TAS, wind, climb-rate and
+    takeoff-weight errors. A slower climb moves the top of climb out at
+    constant climb fuel flow, so climb time and fuel grow as 1 / rate; a
+    heavier aircraft climbs slower and burns more in every phase, scaled
+    by the weight sensitivities of the performance tables. Each run draws
+    from its own generator, so results do not depend on how runs are split
+    across workers. All runs of the batch are integrated together over the
+    trajectory segments as one (runs, segments) array.
+
+    :param model: Nominal flight model
+    :param seed: Root seed of the ensemble
+    :param runs: Run numbers to simulate
+    :return: EnsembleResult for these runs
+    """
+    dispersions = model.dispersions
+    draws = np.array([np.random.default_rng(run_seed(seed, run)).standard_normal(4) for run in runs])
+    draws = draws.reshape(-1, 4)
+    speed_factor = 1.0 + dispersions.speed_sigma * draws[:, 0:1]
+    wind_offset = dispersions.wind_sigma_knots * draws[:, 1:2]
+    climb_factor = np.maximum(1.0 + dispersions.climb_rate_sigma * draws[:, 2:3], 0.2)
+    weight_factor = np.maximum(1.0 + dispersions.weight_sigma * draws[:, 3:4], 0.5)
+
+    # A slower climb, a heavier or a faster aircraft pushes the top of climb further out
+    top_of_climb = np.minimum(model.top_of_climb_km * speed_factor / climb_factor
+                              * weight_factor ** model.top_of_climb_weight_exponent, model.top_of_descent_km)
+    midpoints = model.midpoint_km[None, :]
+    phase = np.where(midpoints < top_of_climb, 0, np.where(midpoints > model.top_of_descent_km, 2, 1))
+
+    true_airspeed = model.phase_speed_knots[phase] * speed_factor
+    ground_speed = np.maximum(true_airspeed + model.tailwind_knots[None, :] + wind_offset, MIN_GROUND_SPEED_KNOTS)
+    hours = model.segment_km[None, :] / (ground_speed * KNOTS_TO_KMH)
+    fuel_flow = model.phase_fuel_flow[phase] * weight_factor ** model.fuel_flow_weight_exponent[phase]
+    return EnsembleResult(hours.sum(axis=1), (fuel_flow * hours).sum(axis=1))
+
+
+# Per-process model, installed once by the pool initializer
+_worker_model: Optional[_EnsembleModel] = None
+
+
+def _init_worker(model: _EnsembleModel):
+    global _worker_model
+    _worker_model = model
+
+
+def _simulate_in_worker(seed: int, runs: range) -> EnsembleResult:
+    return simulate_runs(_worker_model, seed, runs)
+
+
+class EnsembleRunner:
+    """
+    Monte Carlo ensemble of perturbed flights for one flight plan.
+
+    This is a reduced-order model, not a batch of simulator runs: the
+    nominal trajectory, vertical profile, wind along the route and the
+    weight sensitivities of the performance tables are reduced once to a
+    compact per-segment model (see simulate_runs), which each worker process
+    receives a single time through the pool initializer; tasks only carry
+    a root seed and a range of run numbers. Every run gets an independent
+    generator from the SeedSequence spawn tree, so a given seed reproduces
+    the ensemble for any worker count or chunk size. Workers return only
+    each run's arrival time and fuel.
+    """
+
+    def __init__(self, flight_plan: FlightPlan, vertical_profile: Optional[VerticalProfile] = None,
+                 wind_field: Optional[WindField] = None, dispersions: Optional[Dispersions] = None,
+                 spacing_km: float = 10.0, workers: Optional[int] = None, chunk_size: int = 1000,
+                 takeoff_weight_kg: float = DEFAULT_TAKEOFF_WEIGHT_KG,
+                 profile_builder: Optional[VerticalProfileBuilder] = None):
+        self.flight_plan = flight_plan
+        self.takeoff_weight_kg = takeoff_weight_kg
+        self.profile_builder = profile_builder or VerticalProfileBuilder()
+        self.vertical_profile = vertical_profile or self.profile_builder.build(
+            flight_plan, takeoff_weight_kg, DEFAULT_CRUISE_ALTITUDE_FT)
+        self.wind_field = wind_field
+        self.dispersions = dispersions or Dispersions()
+        self.spacing_km = spacing_km
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self.model = self._build_model()
+
+    def _build_model(self) -> _EnsembleModel:
+        trajectory = self.flight_plan.get_trajectory(self.spacing_km)
+        distances = trajectory[:, TRAJ_DISTANCE]
+        midpoints = (distances[:-1] + distances[1:]) / 2
+        tailwind = np.zeros(len(midpoints))
+        if self.wind_field is not None:
+            altitudes = self.vertical_profile.altitude_at(distances)
+            u, v, _ = self.wind_field.interpolate(altitudes, trajectory[:, TRAJ_LAT], trajectory[:, TRAJ_LON])
+            course = np.radians(trajectory[:, TRAJ_COURSE])
+            along_track = u * np.sin(course) + v * np.cos(course)
+            tailwind = (along_track[:-1] + along_track[1:]) / 2
+
+        profile = self.vertical_profile
+        speeds, flows = _phase_means(profile)
+        # Weight sensitivities from the same plan and level flown heavier
+        heavier = self.profile_builder.build(self.flight_plan, self.takeoff_weight_kg * (1.0 + _WEIGHT_STEP),
+                                             profile.cruise_altitude_ft)
+        _, heavier_flows = _phase_means(heavier)
+        step = np.log1p(_WEIGHT_STEP)
+        top_of_climb_exponent = np.log(max(heavier.top_of_climb_km, 1e-6) / max(profile.top_of_climb_km, 1e-6)) \
+            / step
+        return _EnsembleModel(
+            segment_km=np.diff(distances),
+            midpoint_km=midpoints,
+            tailwind_knots=tailwind,
+            top_of_climb_km=self.vertical_profile.top_of_climb_km,
+            top_of_descent_km=self.vertical_profile.top_of_descent_km,
+            phase_speed_knots=speeds,
+            phase_fuel_flow=flows,
+            fuel_flow_weight_exponent=np.log(heavier_flows / flows) / step,
+            top_of_climb_weight_exponent=float(top_of_climb_exponent),
+            dispersions=self.dispersions
+        )
+
+    def run(self, n_runs: int, seed: int = 0) -> EnsembleResult:
+        """
+        Run the ensemble.
+
+        :param n_runs: Number of perturbed flights
+        :param seed: Root seed; the same seed always gives the same ensemble
+        :return: EnsembleResult with one arrival time and fuel figure per run
+        """
+        chunks = [range(start, min(start + self.chunk_size, n_runs)) for start in range(0, n_runs, self.chunk_size)]
+
+        if self.workers <= 1:
+            results = [simulate_runs(self.model, seed, chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.model,)) as executor:
+                results = list(executor.map(_simulate_in_worker, [seed] * len(chunks), chunks))
+
+        if not results:
+            return EnsembleResult()
+        return EnsembleResult(np.concatenate([r.arrival_times_h for r in results]),
+                              np.concatenate([r.fuel_kg for r in results]))
@@ -0,0 +1,170 @@
+import heapq
+import itertools
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from src.navigation.trajectory_calculator import TRAJ_DISTANCE
+from src.simulation.flight_simulator import AircraftState, FlightSimulator
+from src.simulation.output_sinks import OutputSink
+
+# Event kinds
+WAYPOINT = 'waypoint'
+TOP_OF_CLIMB = 'top_of_climb'
+TOP_OF_DESCENT = 'top_of_descent'
+MODE_CHANGE = 'mode_change'
+COMMAND = 'command'
+ARRIVAL = 'arrival'
+
+# Vertical mode after each profile event
+_VERTICAL_MODES = {TOP_OF_CLIMB: 'CRZ', TOP_OF_DESCENT: 'DES', ARRIVAL: None}
+
+
+@dataclass
+class Event:
+    time: float
+    kind: str
+    payload: Any = None
+    action: Optional[Callable[[FlightSimulator], None]] = field(default=None, repr=False)
+
+
+@dataclass
+class _Consumer:
+    sink: OutputSink
+    time_step: float
+    next_time: float
+
+
+class EventScheduler:
+    """
+    Discrete-event driver for a FlightSimulator.
+
+    Waypoint passages, top of climb, top of descent and arrival are known in
+    advance from the precomputed trajectory and vertical profile, and are
+    queued on a heap together with any scheduled mode changes and commands.
+    run() jumps from one event to the next by seeking the simulator, so its
+    cost grows with the number of events, not with flight time / dt. Dense
+    ticks are only generated for consumers registered with add_consumer,
+    one vectorized batch per gap between events.
+
+    The simulator must already be running: events are queued from its
+    current time, so it is never restarted (and rewound) by the scheduler.
+    """
+
+    def __init__(self, simulator: FlightSimulator):
+        if simulator.autopilot is not None:
+            raise ValueError("The event scheduler advances along the precomputed trajectory; "
+                             "closed-loop autopilot ticks cannot be skipped")
+        if not simulator.is_running:
+            raise ValueError("Start the simulator (or restore a running snapshot) before scheduling its events")
+        self.simulator = simulator
+        self.vertical_mode: Optional[str] = 'CLB'
+        self.events_processed = 0
+        self._queue: List[tuple] = []
+        self._sequence = itertools.count()
+        self._handlers: Dict[str, List[Callable[[Event, FlightSimulator], None]]] = defaultdict(list)
+        self._consumers: List[_Consumer] = []
+        self._schedule_flight_events()
+
+    def _time_at_distance(self, along_track_km: float) -> float:
+        """Time of the first trajectory sample at or beyond an along-track distance."""
+        simulator = self.simulator
+        index = int(np.searchsorted(simulator.trajectory[:, TRAJ_DISTANCE], along_track_km - 1e-9, side='left'))
+        return min(index, len(simulator) - 1) * simulator.sample_interval_s
+
+    def _schedule_flight_events(self):
+        """Queue the events of the rest of the flight."""
+        simulator = self.simulator
+        route = simulator.flight_plan.get_flight_route()
+        cumulative = simulator.flight_plan.cumulative_distances
+        profile = simulator.vertical_profile
+        events = [(self._time_at_distance(distance), WAYPOINT, waypoint)
+                  for waypoint, distance in zip(route[1:-1], cumulative[1:-1])]
+        events.append((self._time_at_distance(profile.top_of_climb_km), TOP_OF_CLIMB, profile.cruise_altitude_ft))
+        events.append((self._time_at_distance(profile.top_of_descent_km), TOP_OF_DESCENT,
+                       profile.cruise_altitude_ft))
+        events.append(((len(simulator) - 1) * simulator.sample_interval_s, ARRIVAL, route[-1]))
+        for time, kind, payload in events:
+            if time >= simulator.simulation_time:
+                self.schedule(time, kind, payload)
+
+    def schedule(self, time: float, kind: str = COMMAND, payload: Any = None,
+                 action: Optional[Callable[[FlightSimulator], None]] = None) -> Event:
+        """
+        Queue an event; events at the same time are processed in the order they were scheduled.
+
+        :param time: Simulation time in seconds
+        :param kind: Event kind, e.g. MODE_CHANGE or COMMAND
+        :param payload: Event data (for MODE_CHANGE, the new vertical mode)
+        :param action: Optional callable run with the simulator when the event is processed
+        :return: The queued Event
+        """
+        if time < self.simulator.simulation_time:
+            raise ValueError(f"Cannot schedule an event in the past ({time}s)")
+        event = Event(time, kind, payload, action)
+        heapq.heappush(self._queue, (time, next(self._sequence), event))
+        return event
+
+    def on(self, kind: str, handler: Callable[[Event, FlightSimulator], None]):
+        """Call handler(event, simulator) for every processed event of a kind."""
+        self._handlers[kind].append(handler)
+
+    def add_consumer(self, sink: OutputSink, time_step: float = 1.0):
+        """Send dense ticks every time_step seconds to a sink, generated only for it."""
+        if time_step <= 0:
+            raise ValueError("Time step must be positive")
+        self._consumers.append(_Consumer(sink, time_step, self.simulator.simulation_time + time_step))
+
+    @property
+    def next_event_time(self) -> float:
+        return self._queue[0][0] if self._queue else math.inf
+
+    def _advance(self, simulation_time: float):
+        simulator = self.simulator
+        interval = simulator.sample_interval_s
+        last = len(simulator) - 1
+        for consumer in self._consumers:
+            count = math.floor((simulation_time - consumer.next_time) / consumer.time_step + 1e-9) + 1
+            if count <= 0:
+                continue
+            times = consumer.next_time + consumer.time_step * np.arange(count)
+            indexes = np.minimum((times / interval + 1e-9).astype(np.intp), last)
+            consumer.sink.write_batch(simulator.records(indexes, times))
+            consumer.next_time += consumer.time_step * count
+        simulator.seek_time(simulation_time)
+        simulator.simulation_time = simulation_time
+
+    def _dispatch(self, event: Event):
+        if event.kind in _VERTICAL_MODES:
+            self.vertical_mode = _VERTICAL_MODES[event.kind]
+        elif event.kind == MODE_CHANGE:
+            self.vertical_mode = event.payload
+        if event.action is not None:
+            event.action(self.simulator)
+        for handler in self._handlers[event.kind]:
+            handler(event, self.simulator)
+        self.events_processed += 1
+
+    def run(self, until: Optional[float] = None) -> AircraftState:
+        """
+        Process events in time order until arrival or until a simulation time.
+
+        :param until: Simulation time in seconds to stop at (default: arrival)
+        :return: Aircraft state at the stopping time
+        """
+        simulator = self.simulator
+        if not simulator.is_running:
+            raise ValueError("The simulator is not running")
+        while self._queue and (until is None or self._queue[0][0] <= until):
+            time, _, event = heapq.heappop(self._queue)
+            self._advance(time)
+            self._dispatch(event)
+            if event.kind == ARRIVAL:
+                simulator._complete()
+                for consumer in self._consumers:
+                    consumer.sink.close()
+                return simulator.current_state
+        if until is not None:
+            self._advance(until)
+        return simulator.current_state
@@ -0,0 +1,262 @@
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+from src.navigation.flight_planner import FlightPlan
+from src.navigation.trajectory_calculator import TrajectoryCalculator, TRAJ_COURSE, TRAJ_DISTANCE, TRAJ_LAT, TRAJ_LON
+from src.navigation.vertical_profile import VerticalProfile, VerticalProfileBuilder
+from src.simulation.flight_simulator import DEFAULT_CRUISE_ALTITUDE_FT, DEFAULT_TAKEOFF_WEIGHT_KG
+
+# Rows of the shared route buffer, one contiguous array per quantity
+ROUTE_LAT = 0
+ROUTE_LON = 1
+ROUTE_DISTANCE = 2
+ROUTE_COURSE = 3
+ROUTE_ALTITUDE = 4
+_ROUTE_COLUMNS = 5
+
+
+class FleetAircraftView:
+    """AircraftState-compatible, read-only view of one aircraft in a FleetSimulator."""
+    __slots__ = ('_fleet', '_slot', 'aircraft_id')
+
+    def __init__(self, fleet: 'FleetSimulator', slot: int, aircraft_id: int):
+        self._fleet = fleet
+        self._slot = slot
+        self.aircraft_id = aircraft_id
+
+    def _index(self) -> int:
+        if self._fleet._ids[self._slot] != self.aircraft_id:
+            raise ValueError(f"Aircraft {self.aircraft_id} is no longer in the fleet")
+        return self._slot
+
+    @property
+    def latitude(self) -> float:
+        return float(self._fleet.latitudes[self._index()])
+
+    @property
+    def longitude(self) -> float:
+        return float(self._fleet.longitudes[self._index()])
+
+    @property
+    def current_position(self):
+        return self.latitude, self.longitude
+
+    @property
+    def altitude(self) -> float:
+        return float(self._fleet.altitudes[self._index()])
+
+    @property
+    def speed(self) -> float:
+        return float(self._fleet.speeds[self._index()])
+
+    @property
+    def heading(self) -> float:
+        return float(self._fleet.headings[self._index()])
+
+    @property
+    def along_track_km(self) -> float:
+        return float(self._fleet.along_track_km[self._index()])
+
+
+class FleetSimulator:
+    """
+    Many aircraft advanced together with vectorized steps.
+
+    Per-aircraft state (position, altitude, speed, heading, route cursor)
+    lives in structure-of-arrays buffers indexed by slot. Every aircraft's
+    sampled trajectory is appended to one shared route buffer and addressed
+    through per-slot offsets and lengths, so a step is a handful of in-place
+    array operations over all slots. Buffers grow by doubling and removed
+    aircraft free their slot for reuse; route space is reclaimed by
+    compact_routes once enough of it is garbage.
+    """
+
+    # Per-slot buffers: (attribute, dtype, value of an empty slot)
+    _SLOT_FIELDS = (
+        ('latitudes', float, 0.0), ('longitudes', float, 0.0), ('altitudes', float, 0.0),
+        ('speeds', float, 0.0), ('headings', float, 0.0), ('along_track_km', float, 0.0),
+        ('ground_speeds', float, 0.0), ('cursors', np.intp, 0), ('route_offsets', np.intp, 0),
+        ('route_lengths', np.intp, 1), ('start_times', float, 0.0), ('active', bool, False),
+        ('_ids', np.int64, -1),
+    )
+
+    def __init__(self, capacity: int = 64, sample_interval_s: float = 1.0,
+                 profile_builder: Optional[VerticalProfileBuilder] = None):
+        self.sample_interval_s = sample_interval_s
+        self.trajectory_calculator = TrajectoryCalculator()
+        self.profile_builder = profile_builder or VerticalProfileBuilder()
+        self.simulation_time = 0.0
+        # Optional FleetAutopilot; when attached it flies the aircraft instead of the route replay
+        self.autopilot = None
+
+        self._capacity = 0
+        self._free_slots: List[int] = []
+        self._slot_of: Dict[int, int] = {}
+        self._next_id = 0
+        self._allocate_slots(max(capacity, 1))
+
+        self._routes = np.zeros((_ROUTE_COLUMNS, 1024))
+        self._route_used = 0
+        self._route_garbage = 0
+
+    def _allocate_slots(self, capacity: int):
+        old = self._capacity
+        for name, dtype, empty in self._SLOT_FIELDS:
+            grown = np.full(capacity, empty, dtype=dtype)
+            if old:
+                grown[:old] = getattr(self, name)
+            setattr(self, name, grown)
+        # Scratch buffers reused by every step
+        self._last = np.zeros(capacity, dtype=np.intp)
+        self._rows = np.zeros(capacity, dtype=np.intp)
+        self._elapsed = np.zeros(capacity)
+        self._at_end = np.zeros(capacity, dtype=bool)
+        self._free_slots.extend(range(capacity - 1, old - 1, -1))
+        self._capacity = capacity
+
+    def _store_route(self, route: np.ndarray) -> int:
+        needed = self._route_used + route.shape[1]
+        if needed > self._routes.shape[1]:
+            grown = np.zeros((_ROUTE_COLUMNS, max(needed, 2 * self._routes.shape[1])))
+            grown[:, :self._route_used] = self._routes[:, :self._route_used]
+            self._routes = grown
+        offset = self._route_used
+        self._routes[:, offset:needed] = route
+        self._route_used = needed
+        return offset
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def add_aircraft(self, flight_plan: FlightPlan, ground_speed_knots: float = 450,
+                     vertical_profile: Optional[VerticalProfile] = None) -> int:
+        """
+        Add an aircraft at the origin of its flight plan.
+
+        :param flight_plan: FlightPlan to fly
+        :param ground_speed_knots: Ground speed used to sample the trajectory
+        :param vertical_profile: Optional VerticalProfile (default: default weight and cruise level)
+        :return: Aircraft id
+        """
+        profile = vertical_profile or self.profile_builder.build(
+            flight_plan, DEFAULT_TAKEOFF_WEIGHT_KG, DEFAULT_CRUISE_ALTITUDE_FT)
+        trajectory = self.trajectory_calculator.calculate_great_circle_trajectory(
+            flight_plan.get_flight_route(), time_step_s=self.sample_interval_s,
+            ground_speed_knots=ground_speed_knots, include_waypoints=False)
+        route = np.empty((_ROUTE_COLUMNS, len(trajectory)))
+        route[ROUTE_LAT] = trajectory[:, TRAJ_LAT]
+        route[ROUTE_LON] = trajectory[:, TRAJ_LON]
+        route[ROUTE_DISTANCE] = trajectory[:, TRAJ_DISTANCE]
+        route[ROUTE_COURSE] = trajectory[:, TRAJ_COURSE]
+        route[ROUTE_ALTITUDE] = profile.altitude_at(trajectory[:, TRAJ_DISTANCE])
+
+        if not self._free_slots:
+            self._allocate_slots(2 * self._capacity)
+        slot = self._free_slots.pop()
+        aircraft_id = self._next_id
+        self._next_id += 1
+
+        self.route_offsets[slot] = self._store_route(route)
+        self.route_lengths[slot] = route.shape[1]
+        self.ground_speeds[slot] = ground_speed_knots
+        self.cursors[slot] = 0
+        self.start_times[slot] = self.simulation_time
+        self.active[slot] = True
+        self._ids[slot] = aircraft_id
+        self._slot_of[aircraft_id] = slot
+        self._load_slots(np.array([slot]))
+        if self.autopilot is not None:
+            self.autopilot._add(slot, flight_plan, ground_speed_knots, profile)
+        return aircraft_id
+
+    def remove_aircraft(self, aircraft_id: int):
+        """Remove an aircraft; its slot is reused by the next add_aircraft."""
+        slot = self._slot_of.pop(aircraft_id, None)
+        if slot is None:
+            raise ValueError(f"Aircraft {aircraft_id} is not in the fleet")
+        self._route_garbage += int(self.route_lengths[slot])
+        if self.autopilot is not None:
+            self.autopilot._remove(slot)
+        for name, _, empty in self._SLOT_FIELDS:
+            getattr(self, name)[slot] = empty
+        self._free_slots.append(slot)
+        if self._route_garbage > self._route_used // 2:
+            self.compact_routes()
+
+    def compact_routes(self):
+        """Move the routes of the aircraft still flying to the front of the route buffer."""
+        slots = np.flatnonzero(self.active)
+        lengths = self.route_lengths[slots]
+        new_offsets = np.cumsum(lengths) - lengths
+        total = int(lengths.sum())
+        gather = np.repeat(self.route_offsets[slots] - new_offsets, lengths) + np.arange(total)
+        self._routes[:, :total] = self._routes[:, gather]
+        self.route_offsets[slots] = new_offsets
+        self._route_used = total
+        self._route_garbage = 0
+
+    def _load_slots(self, slots: np.ndarray):
+        rows = self.route_offsets[slots] + self.cursors[slots]
+        self.latitudes[slots] = self._routes[ROUTE_LAT, rows]
+        self.longitudes[slots] = self._routes[ROUTE_LON, rows]
+        self.along_track_km[slots] = self._routes[ROUTE_DISTANCE, rows]
+        self.headings[slots] = self._routes[ROUTE_COURSE, rows]
+        self.altitudes[slots] = self._routes[ROUTE_ALTITUDE, rows]
+        arrived = self.cursors[slots] >= self.route_lengths[slots] - 1
+        self.speeds[slots] = np.where(arrived, 0.0, self.ground_speeds[slots])
+
+    def step(self, time_step: float = 1.0):
+        """
+        Advance every active aircraft by one tick with in-place array operations.
+
+        :param time_step: Time step in seconds
+        """
+        if self.autopilot is not None:
+            self.autopilot.update(time_step)
+            self.simulation_time += time_step
+            return
+        self.simulation_time += time_step
+        # Each aircraft's sample follows the time elapsed since it was added, so
+        # ticks that are not a multiple of the sample interval do not drift
+        elapsed = self._elapsed
+        np.subtract(self.simulation_time, self.start_times, out=elapsed)
+        np.divide(elapsed, self.sample_interval_s, out=elapsed)
+        np.add(elapsed, 1e-9, out=elapsed)
+        np.copyto(self.cursors, elapsed, casting='unsafe', where=self.active)
+        np.subtract(self.route_lengths, 1, out=self._last)
+        np.minimum(self.cursors, self._last, out=self.cursors)
+        np.add(self.route_offsets, self.cursors, out=self._rows)
+
+        routes, rows = self._routes, self._rows
+        for column, target in ((ROUTE_LAT, self.latitudes), (ROUTE_LON, self.longitudes),
+                               (ROUTE_DISTANCE, self.along_track_km), (ROUTE_COURSE, self.headings),
+                               (ROUTE_ALTITUDE, self.altitudes)):
+            np.take(routes[column], rows, out=target)
+        np.equal(self.cursors, self._last, out=self._at_end)
+        np.copyto(self.speeds, self.ground_speeds)
+        np.copyto(self.speeds, 0.0, where=self._at_end)
+
+    @property
+    def arrived(self) -> np.ndarray:
+        """Boolean mask of active slots whose aircraft reached the destination."""
+        return self.active & (self.cursors >= self.route_lengths - 1)
+
+    def remove_arrived(self) -> List[int]:
+        """Remove every aircraft that reached its destination and return their ids."""
+        ids = self._ids[self.arrived].tolist()
+        for aircraft_id in ids:
+            self.remove_aircraft(aircraft_id)
+        return ids
+
+    def slot_of(self, aircraft_id: int) -> int:
+        slot = self._slot_of.get(aircraft_id)
+        if slot is None:
+            raise ValueError(f"Aircraft {aircraft_id} is not in the fleet")
+        return slot
+
+    def state(self, aircraft_id: int) -> FleetAircraftView:
+        """AircraftState-compatible view of one aircraft, e.g. for FlightDataPanel."""
+        return FleetAircraftView(self, self.slot_of(aircraft_id), aircraft_id)
+
+    def states(self) -> Iterator[FleetAircraftView]:
+        for aircraft_id, slot in self._slot_of.items():
+            yield FleetAircraftView(self, slot, aircraft_id)
@@ -1,32 +1,186 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from src.database.waypoint_manager import Waypoint, WaypointManager
+from src.navigation.airway_graph import AirwayGraph, RouteConstraints
 from src.navigation.trajectory_calculator import TrajectoryCalculator
+from src.navigation.wind_field import WindField
 
 
 class FlightPlan:
+    """
+    Origin, destination and intermediate waypoints with a cached leg table.
+
+    Leg distances, initial courses and cumulative along-track distances are
+    computed once and then patched in place by insert_waypoint,
+    remove_waypoint and replace_route_point, so only the legs touching an
+    edited waypoint are recomputed.
+    """
+
     def __init__(self, origin: Waypoint, destination: Waypoint, waypoints: List[Waypoint] = None):
-        self.origin = origin
-        self.destination = destination
-        self.waypoints = waypoints or []
         self.trajectory_calculator = TrajectoryCalculator()
+        # Bumped on every route edit so derived data (e.g. vertical profiles) can invalidate
+        self.revision = 0
+        self._set_route([origin] + list(waypoints or []) + [destination])
+
+    def _set_route(self, route: List[Waypoint]):
+        self._route = route
+        self._route_view = tuple(route)
+        lats, lons = TrajectoryCalculator.route_arrays(route)
+        self._leg_distances = TrajectoryCalculator.leg_distances(lats, lons)
+        self._leg_courses = TrajectoryCalculator.leg_courses(lats, lons)
+        self._update_cumulative()
+
+    def _update_cumulative(self):
+        # Every route edit ends here, so sampled trajectories are dropped as well
+        self._trajectories: Dict[float, np.ndarray] = {}
+        self.revision += 1
+        self._cumulative = np.concatenate(([0.0], np.cumsum(self._leg_distances)))
+
+    @staticmethod
+    def _leg(wp1: Waypoint, wp2: Waypoint) -> Tuple[float, float]:
+        return (TrajectoryCalculator.great_circle_distance(wp1.latitude, wp1.longitude, wp2.latitude, wp2.longitude),
+                TrajectoryCalculator.initial_bearing(wp1.latitude, wp1.longitude, wp2.latitude, wp2.longitude))
+
+    def _refresh_legs(self, first_leg: int, last_leg: int):
+        """Recompute legs first_leg..last_leg (inclusive) after the route list changed."""
+        for leg in range(max(first_leg, 0), min(last_leg, len(self._route) - 2) + 1):
+            self._leg_distances[leg], self._leg_courses[leg] = self._leg(self._route[leg], self._route[leg + 1])
+        self._route_view = tuple(self._route)
+        self._update_cumulative()
+
+    @property
+    def origin(self) -> Waypoint:
+        return self._route[0]
+
+    @property
+    def destination(self) -> Waypoint:
+        return self._route[-1]
+
+    @property
+    def waypoints(self) -> Tuple[Waypoint, ...]:
+        """Intermediate waypoints; edit them through insert/remove_waypoint and replace_route_point."""
+        return self._route_view[1:-1]
+
+    @waypoints.setter
+    def waypoints(self, waypoints: List[Waypoint]):
+        self._set_route([self.origin] + list(waypoints) + [self.destination])
+
+    @property
+    def leg_distances(self) -> np.ndarray:
+        """Distance of each leg in km, leg i going from route point i to i + 1."""
+        return self._leg_distances
+
+    @property
+    def leg_courses(self) -> np.ndarray:
+        """Initial great-circle course of each leg in degrees."""
+        return self._leg_courses
+
+    @property
+    def cumulative_distances(self) -> np.ndarray:
+        """Along-track distance of each route point from the origin in km."""
+        return self._cumulative
+
+    def insert_waypoint(self, index: int, waypoint: Waypoint):
+        """
+        Insert an intermediate waypoint.
+
+        :param index: Position among the intermediate waypoints (0 = right after the origin)
+        :param waypoint: Waypoint to insert
+        """
+        if not 0 <= index <= len(self._route) - 2:
+            raise ValueError(f"Waypoint index {index} out of range")
+        position = index + 1
+        self._route.insert(position, waypoint)
+        # The leg into the new point is recomputed; one more leg is added after it
+        self._leg_distances = np.insert(self._leg_distances, position, 0.0)
+        self._leg_courses = np.insert(self._leg_courses, position, 0.0)
+        self._refresh_legs(position - 1, position)
+
+    def remove_waypoint(self, index: int) -> Waypoint:
+        """
+        Remove an intermediate waypoint, joining its neighbours with a single leg.
+
+        :param index: Position among the intermediate waypoints
+        :return: The removed waypoint
+        """
+        if not 0 <= index < len(self._route) - 2:
+            raise ValueError(f"Waypoint index {index} out of range")
+        position = index + 1
+        removed = self._route.pop(position)
+        self._leg_distances = np.delete(self._leg_distances, position)
+        self._leg_courses = np.delete(self._leg_courses, position)
+        self._refresh_legs(position - 1, position - 1)
+        return removed
+
+    def replace_route_point(self, index: int, waypoint: Waypoint) -> Waypoint:
+        """
+        Replace a route point in place, origin and destination included.
+
+        Unlike insert_waypoint and remove_waypoint, the index counts from the
+        origin: intermediate waypoint i is route point i + 1.
+
+        :param index: Position in the complete route (0 = origin, -1 = destination)
+        :param waypoint: New waypoint
+        :return: The replaced waypoint
+        """
+        if not -len(self._route) <= index < len(self._route):
+            raise ValueError(f"Route index {index} out of range")
+        position = index % len(self._route)
+        replaced = self._route[position]
+        self._route[position] = waypoint
+        self._refresh_legs(position - 1, position)
+        return replaced
+
+    def locate(self, along_track_km: float) -> Tuple[int, float]:
+        """
+        Find the leg containing an along-track position with a binary search.
+
+        :param along_track_km: Distance flown from the origin in km
+        :return: (leg index, distance already flown on that leg in km)
+        """
+        if len(self._leg_distances) == 0:
+            return 0, 0.0
+        x = min(max(along_track_km, 0.0), float(self._cumulative[-1]))
+        leg = int(np.searchsorted(self._cumulative, x, side='right')) - 1
+        leg = min(leg, len(self._leg_distances) - 1)
+        return leg, x - float(self._cumulative[leg])
+
+    def distance_remaining(self, along_track_km: float) -> float:
+        """Distance left to the destination from an along-track position, in km."""
+        return float(self._cumulative[-1]) - min(max(along_track_km, 0.0), float(self._cumulative[-1]))
+
+    def distance_to_next_waypoint(self, along_track_km: float) -> float:
+        """Distance left on the current leg from an along-track position, in km."""
+        if len(self._leg_distances) == 0:
+            return 0.0
+        leg, flown = self.locate(along_track_km)
+        return float(self._leg_distances[leg]) - flown
 
     def calculate_total_distance(self) -> float:
         """Calculate total flight distance."""
-        all_points = [self.origin] + self.waypoints + [self.destination]
-        return sum(
-            self.trajectory_calculator.calculate_great_circle_distance(all_points[i], all_points[i + 1])
-            for i in range(len(all_points) - 1)
-        )
+        return float(self._cumulative[-1])
 
-    def get_flight_route(self) -> List[Waypoint]:
+    def get_trajectory(self, spacing_km: float) -> np.ndarray:
+        """Great-circle trajectory sampled every spacing_km, cached until the route is edited."""
+        trajectory = self._trajectories.get(spacing_km)
+        if trajectory is None:
+            trajectory = self.trajectory_calculator.calculate_great_circle_trajectory(
+                self._route, spacing_km=spacing_km)
+            self._trajectories[spacing_km] = trajectory
+        return trajectory
+
+    def get_flight_route(self) -> Tuple[Waypoint, ...]:
         """Get complete flight route including origin, waypoints, and destination."""
-        return [self.origin] + self.waypoints + [self.destination]
+        return self._route_view
 
 
 class FlightPlanner:
-    def __init__(self, waypoint_manager: WaypointManager):
+    def __init__(self, waypoint_manager: WaypointManager, airways: Optional[Dict[str, List[str]]] = None,
+                 max_leg_km: Optional[float] = None):
         self.waypoint_manager = waypoint_manager
         self.trajectory_calculator = TrajectoryCalculator()
+        # Built once and reused by every find_route call; it tracks database changes itself
+        self.airway_graph = AirwayGraph(waypoint_manager, airways, max_leg_km)
 
     def create_flight_plan(self, origin_code: str, destination_code: str,
                            waypoint_codes: List[str] = None) -> FlightPlan:
@@ -38,30 +192,53 @@ class FlightPlanner:
         :param waypoint_codes: Optional list of waypoint ICAO codes
         :return: FlightPlan object
         """
-        origin = self.waypoint_manager.get_waypoint_by_code(origin_code)
-        destination = self.waypoint_manager.get_waypoint_by_code(destination_code)
+        waypoint_codes = waypoint_codes or []
+        origin, destination, *waypoints = self.waypoint_manager.get_waypoints_by_codes(
+            [origin_code, destination_code] + waypoint_codes
+        )
 
         if not origin or not destination:
             raise ValueError("Invalid origin or destination waypoint")
 
-        waypoints = []
-        if waypoint_codes:
-            for code in waypoint_codes:
-                wp = self.waypoint_manager.get_waypoint_by_code(code)
-                if wp:
-                    waypoints.append(wp)
-                else:
-                    raise ValueError(f"Waypoint with code {code} not found")
+        for code, wp in zip(waypoint_codes, waypoints):
+            if not wp:
+                raise ValueError(f"Waypoint with code {code} not found")
 
         return FlightPlan(origin, destination, waypoints)
 
-    def calculate_estimated_time_en_route(self, flight_plan: FlightPlan, avg_speed_knots: float = 450) -> float:
+    def find_route(self, origin_code: str, destination_code: str,
+                   constraints: Optional[RouteConstraints] = None) -> FlightPlan:
+        """
+        Find the shortest route through the airway graph and build a flight plan from it.
+
+        :param origin_code: ICAO code of origin airport
+        :param destination_code: ICAO code of destination airport
+        :param constraints: Optional RouteConstraints (avoid-lists, airways only, max leg length)
+        :return: FlightPlan object
+        """
+        route = self.airway_graph.find_route(origin_code, destination_code, constraints)
+        return self.create_flight_plan(origin_code, destination_code, route[1:-1])
+
+    def calculate_estimated_time_en_route(self, flight_plan: FlightPlan, avg_speed_knots: float = 450,
+                                          wind_field: Optional[WindField] = None, altitude_ft: float = 35000.0,
+                                          spacing_km: float = 25.0) -> float:
         """
         Calculate estimated time en route.
 
+        Without a wind field the distance is divided by avg_speed_knots. With
+        one, avg_speed_knots is used as true airspeed and ground speed is
+        integrated along the great-circle trajectory sampled every spacing_km.
+
         :param flight_plan: FlightPlan object
         :param avg_speed_knots: Average aircraft speed in knots
+        :param wind_field: Optional WindField (see load_wind_field)
+        :param altitude_ft: Cruise altitude used for the wind lookup
+        :param spacing_km: Trajectory sample spacing for the wind integration
         :return: Estimated time en route in hours
         """
+        if wind_field is not None:
+            trajectory = flight_plan.get_trajectory(spacing_km)
+            return wind_field.time_en_route(trajectory, avg_speed_knots, altitude_ft)
+
         total_distance_nm = flight_plan.calculate_total_distance() * 0.539957  # Convert km to nautical miles
         return total_distance_nm / avg_speed_knots
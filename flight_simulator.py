@@ -1,38 +1,208 @@
+import copy
+import math
 import time
-import random
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Tuple
+import numpy as np
 from src.database.waypoint_manager import Waypoint
-from src.navigation.trajectory_calculator import TrajectoryCalculator
+from src.navigation.trajectory_calculator import TrajectoryCalculator, TRAJ_COURSE, TRAJ_DISTANCE, TRAJ_LAT, TRAJ_LON
 from src.navigation.flight_planner import FlightPlan
+from src.navigation.vertical_profile import VerticalProfile, VerticalProfileBuilder
+from src.simulation.output_sinks import OutputSink, PrintSink, STATE_DTYPE
+
+DEFAULT_TAKEOFF_WEIGHT_KG = 70000.0
+DEFAULT_CRUISE_ALTITUDE_FT = 35000.0
 
 
 class AircraftState:
+    __slots__ = ('latitude', 'longitude', 'altitude', 'speed', 'heading', 'along_track_km')
+
     def __init__(self, initial_waypoint: Waypoint):
-        self.current_position = (initial_waypoint.latitude, initial_waypoint.longitude)
+        self.latitude = initial_waypoint.latitude
+        self.longitude = initial_waypoint.longitude
         self.altitude = 0  # feet
         self.speed = 0  # knots
         self.heading = 0  # degrees
+        self.along_track_km = 0.0
+
+    @property
+    def current_position(self):
+        return self.latitude, self.longitude
+
+    @current_position.setter
+    def current_position(self, position):
+        self.latitude, self.longitude = position
+
+
+@dataclass(frozen=True)
+class SimulatorSnapshot:
+    simulation_time: float
+    cursor: int
+    is_running: bool
+    aircraft_state: Tuple[float, ...]   # values of AircraftState.__slots__, in order
+    autopilot: Any = None               # AutopilotSnapshot, if an autopilot is attached
 
 
 class FlightSimulator:
-    def __init__(self, flight_plan: FlightPlan):
+    """
+    Plays an aircraft back along the precomputed trajectory of a flight plan.
+
+    The great-circle trajectory is sampled once, at a fixed time interval
+    and ground speed. Courses, along-track distances and the altitude from
+    the vertical profile are computed for every sample at the same time, and
+    the result is stored as a read-only array. A tick only moves an integer
+    cursor and copies one row into the AircraftState, so the simulator can
+    also be rewound or seeked. With an autopilot attached, the trajectory
+    only provides the starting state and each tick is flown by the
+    autopilot's control loop instead.
+    """
+
+    def __init__(self, flight_plan: FlightPlan, sample_interval_s: float = 1.0, ground_speed_knots: float = 450,
+                 vertical_profile: Optional[VerticalProfile] = None, sinks: Iterable[OutputSink] = (),
+                 verbose: bool = True, autopilot=None):
         self.flight_plan = flight_plan
+        # Optional Autopilot; when given, ticks are flown closed-loop instead of replayed
+        self.autopilot = autopilot
+        self.sinks: List[OutputSink] = list(sinks)
+        self.verbose = verbose
+        self.sample_interval_s = sample_interval_s
+        self.ground_speed_knots = ground_speed_knots
         self.trajectory_calculator = TrajectoryCalculator()
+        self.vertical_profile = vertical_profile or VerticalProfileBuilder().build(
+            flight_plan, DEFAULT_TAKEOFF_WEIGHT_KG, DEFAULT_CRUISE_ALTITUDE_FT)
         self.trajectory = self._generate_trajectory()
+        self.altitudes = self.vertical_profile.altitude_at(self.trajectory[:, TRAJ_DISTANCE])
+        self.altitudes.flags.writeable = False
+
+        # Plain-float columns so a tick reads them without creating NumPy scalars
+        self._latitudes = self.trajectory[:, TRAJ_LAT].tolist()
+        self._longitudes = self.trajectory[:, TRAJ_LON].tolist()
+        self._distances = self.trajectory[:, TRAJ_DISTANCE].tolist()
+        self._courses = self.trajectory[:, TRAJ_COURSE].tolist()
+        self._altitudes = self.altitudes.tolist()
+
+        self.cursor = 0
         self.current_state = AircraftState(flight_plan.origin)
         self.simulation_time = 0
         self.is_running = False
 
-    def _generate_trajectory(self) -> List[Tuple[float, float]]:
-        """Generate smooth trajectory from flight plan."""
-        route_waypoints = self.flight_plan.get_flight_route()
-        return self.trajectory_calculator.calculate_trajectory(route_waypoints)
+    def _generate_trajectory(self) -> np.ndarray:
+        """Sample the flight plan's great-circle route once per sample interval."""
+        trajectory = self.trajectory_calculator.calculate_great_circle_trajectory(
+            self.flight_plan.get_flight_route(), time_step_s=self.sample_interval_s,
+            ground_speed_knots=self.ground_speed_knots, include_waypoints=False)
+        trajectory.flags.writeable = False
+        return trajectory
+
+    def __len__(self) -> int:
+        return len(self._latitudes)
+
+    def _apply_cursor(self):
+        state = self.current_state
+        i = self.cursor
+        state.latitude = self._latitudes[i]
+        state.longitude = self._longitudes[i]
+        state.along_track_km = self._distances[i]
+        state.heading = self._courses[i]
+        state.altitude = self._altitudes[i]
+        state.speed = self.ground_speed_knots if i < len(self._latitudes) - 1 else 0
+
+    def seek(self, index: int) -> AircraftState:
+        """
+        Move the cursor to a trajectory sample (negative indexes count from the end).
+
+        :param index: Sample index
+        :return: Aircraft state at that sample
+        """
+        count = len(self._latitudes)
+        if not -count <= index < count:
+            raise ValueError(f"Trajectory index {index} out of range")
+        self.cursor = index % count
+        self.simulation_time = self.cursor * self.sample_interval_s
+        self._apply_cursor()
+        return self.current_state
+
+    def _sample_at(self, simulation_time: float) -> int:
+        """Index of the last sample at or before a simulation time (tolerant of float round-off)."""
+        index = int(simulation_time / self.sample_interval_s + 1e-9)
+        return min(max(index, 0), len(self._latitudes) - 1)
+
+    def seek_time(self, simulation_time: float) -> AircraftState:
+        """Move to the last sample at or before a simulation time in seconds."""
+        return self.seek(self._sample_at(simulation_time))
+
+    def seek_distance(self, along_track_km: float) -> AircraftState:
+        """Move to the last sample at or before an along-track distance."""
+        index = int(np.searchsorted(self.trajectory[:, TRAJ_DISTANCE], along_track_km, side='right')) - 1
+        return self.seek(min(max(index, 0), len(self._latitudes) - 1))
+
+    def rewind(self) -> AircraftState:
+        """Return to the origin without recomputing anything."""
+        return self.seek(0)
+
+    def snapshot(self) -> SimulatorSnapshot:
+        """Everything needed to resume the flight from this tick; the trajectory is not copied."""
+        state = self.current_state
+        return SimulatorSnapshot(
+            simulation_time=self.simulation_time,
+            cursor=self.cursor,
+            is_running=self.is_running,
+            aircraft_state=tuple(getattr(state, name) for name in AircraftState.__slots__),
+            autopilot=self.autopilot.snapshot() if self.autopilot is not None else None
+        )
+
+    def restore(self, snapshot: SimulatorSnapshot) -> AircraftState:
+        """
+        Resume from a snapshot of this simulator or of one forked from it.
+
+        :param snapshot: SimulatorSnapshot
+        :return: Restored aircraft state
+        """
+        if (snapshot.autopilot is None) != (self.autopilot is None):
+            raise ValueError("Snapshot and simulator differ in whether an autopilot is attached")
+        self.simulation_time = snapshot.simulation_time
+        self.cursor = snapshot.cursor
+        self.is_running = snapshot.is_running
+        for name, value in zip(AircraftState.__slots__, snapshot.aircraft_state):
+            setattr(self.current_state, name, value)
+        if self.autopilot is not None:
+            self.autopilot.restore(snapshot.autopilot, self.current_state)
+        return self.current_state
+
+    def fork(self, snapshot: Optional[SimulatorSnapshot] = None) -> 'FlightSimulator':
+        """
+        Independent simulator continuing from a snapshot (default: the current tick).
+
+        The fork shares the read-only trajectory arrays, columns and vertical
+        profile with this simulator, so creating one costs no more than a
+        snapshot. It starts without output sinks.
+
+        :param snapshot: SimulatorSnapshot to branch from
+        :return: New FlightSimulator
+        """
+        snapshot = snapshot or self.snapshot()
+        forked = copy.copy(self)
+        forked.sinks = []
+        forked.current_state = AircraftState(self.flight_plan.origin)
+        if self.autopilot is not None:
+            forked.autopilot = self.autopilot.fork(forked.current_state)
+        forked.restore(snapshot)
+        return forked
 
     def start_simulation(self):
         """Start the flight simulation."""
         self.is_running = True
         self.simulation_time = 0
-        print("Flight simulation started.")
+        self.cursor = 0
+        self._apply_cursor()
+        if self.autopilot is not None:
+            self.autopilot.engage(self.current_state)
+        if self.verbose:
+            print("Flight simulation started.")
+
+    def add_sink(self, sink: OutputSink):
+        """Send every following tick to an output sink."""
+        self.sinks.append(sink)
 
     def update_aircraft_state(self, time_step: float = 1.0):
         """
@@ -43,33 +213,129 @@ class FlightSimulator:
         if not self.is_running:
             return None
 
-        # Simulate movement along trajectory
-        if len(self.trajectory) > 0:
-            next_position = self.trajectory.pop(0)
-            self.current_state.current_position = next_position
-
-            # Simulate realistic aircraft parameters
-            self.current_state.altitude += random.uniform(50, 200)
-            self.current_state.speed = random.uniform(250, 450)
+        self.simulation_time += time_step
+        if self.autopilot is not None:
+            self.autopilot.update(self.current_state, time_step)
+            finished = self.autopilot.arrived
+        else:
+            # The sample follows the clock, so steps that are not whole sample intervals do not drift
+            self.cursor = self._sample_at(self.simulation_time)
+            self._apply_cursor()
+            finished = self.cursor == len(self._latitudes) - 1
+        for sink in self.sinks:
+            sink.write(self.simulation_time, self.current_state)
 
-            # Calculate heading to next waypoint if trajectory is not empty
-            if self.trajectory:
-                self.current_state.heading = self.trajectory_calculator.calculate_bearing(
-                    Waypoint(name="Current", icao_code="CURR",
-                             latitude=self.current_state.current_position[0],
-                             longitude=self.current_state.current_position[1], type="type"),
-                    Waypoint(name="Next", icao_code="NEXT",
-                             latitude=self.trajectory[0][0],
-                             longitude=self.trajectory[0][1], type="type")
-                )
+        # Check if simulation is complete
+        if finished:
+            self._complete()
 
-            self.simulation_time += time_step
+        return self.current_state
 
-        # Check if simulation is complete
-        if len(self.trajectory) == 0:
-            self.is_running = False
+    def _complete(self):
+        self.is_running = False
+        if self.verbose:
             print("Flight simulation completed.")
 
+    def records(self, indexes: np.ndarray, times: np.ndarray) -> np.ndarray:
+        """
+        STATE_DTYPE records of trajectory samples, gathered in one vectorized pass.
+
+        :param indexes: Trajectory sample indexes
+        :param times: Simulation time to stamp on each record
+        :return: STATE_DTYPE array
+        """
+        records = np.empty(len(indexes), dtype=STATE_DTYPE)
+        records['time'] = times
+        records['latitude'] = self.trajectory[indexes, TRAJ_LAT]
+        records['longitude'] = self.trajectory[indexes, TRAJ_LON]
+        records['altitude'] = self.altitudes[indexes]
+        records['speed'] = np.where(indexes < len(self._latitudes) - 1, self.ground_speed_knots, 0.0)
+        records['heading'] = self.trajectory[indexes, TRAJ_COURSE]
+        records['along_track_km'] = self.trajectory[indexes, TRAJ_DISTANCE]
+        return records
+
+    def step(self, n: int = 1, time_step: float = 1.0):
+        """
+        Advance up to n ticks in one call.
+
+        The visited samples are selected with one slice of the trajectory
+        and handed to the sinks as a single STATE_DTYPE batch.
+
+        :param n: Number of ticks
+        :param time_step: Time step of each tick in seconds
+        :return: Aircraft state after the last tick, or None if the simulation is not running
+        """
+        if not self.is_running:
+            return None
+        if self.autopilot is not None:
+            # Closed-loop ticks depend on each other and cannot be sliced out of the trajectory
+            for _ in range(n):
+                if not self.is_running:
+                    break
+                self.update_aircraft_state(time_step)
+            return self.current_state
+
+        last = len(self._latitudes) - 1
+        end_time = last * self.sample_interval_s
+        ticks = min(n, math.ceil((end_time - self.simulation_time) / time_step - 1e-9))
+        if ticks <= 0:
+            self._complete()
+            return self.current_state
+        times = self.simulation_time + time_step * np.arange(1, ticks + 1)
+        indexes = np.minimum((times / self.sample_interval_s + 1e-9).astype(np.intp), last)
+
+        if self.sinks:
+            records = self.records(indexes, times)
+            for sink in self.sinks:
+                sink.write_batch(records)
+
+        self.cursor = int(indexes[-1])
+        self.simulation_time = float(times[-1])
+        self._apply_cursor()
+        if self.cursor == last:
+            self._complete()
+        return self.current_state
+
+    def run(self, until: Optional[float] = None, time_scale: float = 1.0, time_step: float = 1.0,
+            batch_size: int = 10000):
+        """
+        Run the simulation, optionally faster than real time.
+
+        With a finite time_scale, ticks are paced against absolute wall-clock
+        deadlines (simulated seconds per wall-clock second). With
+        time_scale=math.inf the run is headless: no sleeping, and ticks are
+        advanced batch_size at a time through step().
+
+        :param until: Simulation time in seconds to stop at (default: end of the flight)
+        :param time_scale: Speed-up relative to real time, or math.inf for as fast as possible
+        :param time_step: Time step of each tick in seconds
+        :param batch_size: Ticks per step() call in headless mode
+        :return: Final aircraft state
+        """
+        if not self.is_running:
+            self.start_simulation()
+
+        def ticks_left() -> int:
+            if until is None:
+                return batch_size
+            return min(batch_size, math.ceil((until - self.simulation_time) / time_step - 1e-9))
+
+        if math.isinf(time_scale):
+            while self.is_running and ticks_left() > 0:
+                self.step(ticks_left(), time_step)
+        else:
+            wall_start = time.perf_counter()
+            simulation_start = self.simulation_time
+            while self.is_running and ticks_left() > 0:
+                self.update_aircraft_state(time_step)
+                deadline = wall_start + (self.simulation_time - simulation_start) / time_scale
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+        if not self.is_running:
+            for sink in self.sinks:
+                sink.close()
         return self.current_state
 
     def run_simulation(self, update_interval: float = 1.0):
@@ -78,16 +344,7 @@ class FlightSimulator:
 
         :param update_interval: Time between state updates in seconds
         """
+        if not self.sinks:
+            self.add_sink(PrintSink())
         self.start_simulation()
-
-        while self.is_running:
-            state = self.update_aircraft_state(update_interval)
-            if state:
-                print(f"Time: {self.simulation_time}s")
-                print(f"Position: {state.current_position}")
-                print(f"Altitude: {state.altitude} ft")
-                print(f"Speed: {state.speed} knots")
-                print(f"Heading: {state.heading}°")
-                print("---")
-
-            time.sleep(update_interval)
+        self.run(time_scale=1.0, time_step=update_interval)
@@ -13,9 +13,8 @@ from src.gui.flight_data_panel import FlightDataPanel
 # Add project root to Python path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-def demonstrate_waypoint_management():
+def demonstrate_waypoint_management(waypoint_manager: WaypointManager):
     print("\n--- Waypoint Management Demonstration ---")
-    waypoint_manager = WaypointManager()
 
     # Display existing waypoints
     print("Existing Waypoints:")
@@ -42,9 +41,8 @@ def demonstrate_waypoint_management():
         print(f"Error: {e}")
 
 
-def demonstrate_flight_planning():
+def demonstrate_flight_planning(waypoint_manager: WaypointManager):
     print("\n--- Flight Planning Demonstration ---")
-    waypoint_manager = WaypointManager()
     flight_planner = FlightPlanner(waypoint_manager)
     trajectory_calculator = TrajectoryCalculator()
 
@@ -68,31 +66,27 @@ def demonstrate_flight_planning():
         print(f"Flight Planning Error: {e}")
 
 
-def demonstrate_flight_simulation():
+def demonstrate_flight_simulation(waypoint_manager: WaypointManager):
     print("\n--- Flight Simulation Demonstration ---")
-    waypoint_manager = WaypointManager()
     flight_planner = FlightPlanner(waypoint_manager)
 
     try:
         # Create a flight plan
         flight_plan = flight_planner.create_flight_plan("GMMN", "GMAD")
 
-        # Create flight simulator
-        flight_simulator = FlightSimulator(flight_plan)
-
         # Create autopilot
         autopilot = Autopilot(flight_plan)
 
-        # Start simulation
-        flight_simulator.start_simulation()
+        # Create flight simulator, flown by the autopilot
+        flight_simulator = FlightSimulator(flight_plan, autopilot=autopilot)
 
-        # Engage autopilot
-        autopilot.engage(flight_simulator.current_state)
+        # Start simulation (engages the autopilot)
+        flight_simulator.start_simulation()
 
         # Simulate a few state updates
         print("Simulation Updates:")
         for _ in range(5):
-            state = flight_simulator.update_aircraft_state()
+            state = flight_simulator.update_aircraft_state(60.0)
             if state:
                 print(f"Position: {state.current_position}")
                 print(f"Altitude: {state.altitude:.2f} ft")
@@ -107,13 +101,12 @@ def demonstrate_flight_simulation():
         print(f"Simulation Error: {e}")
 
 
-def launch_gui():
+def launch_gui(waypoint_manager: WaypointManager):
     print("\n--- Launching Flight Management System GUI ---")
     root = tk.Tk()
     root.title("Flight Management System")
 
     # Create main window with multiple panels
-    waypoint_manager = WaypointManager()
     flight_planner = FlightPlanner(waypoint_manager)
 
     # Create a sample flight plan
@@ -123,7 +116,7 @@ def launch_gui():
     cdu_frame = tk.Frame(root)
     cdu_frame.pack(side=tk.LEFT, padx=10, pady=10)
     tk.Label(cdu_frame, text="CDU Simulator", font=('Arial', 12, 'bold')).pack()
-    cdu_simulator = CDUSimulator(cdu_frame)
+    cdu_simulator = CDUSimulator(cdu_frame, waypoint_manager)
 
     # Create Flight Data Panel
     data_frame = tk.Frame(root)
@@ -137,15 +130,18 @@ def launch_gui():
 def main():
     print("Moroccan Flight Management System Demonstration")
 
+    # Load the waypoint database once and share it between demonstrations
+    waypoint_manager = WaypointManager()
+
     # Demonstrate key functionalities
-    demonstrate_waypoint_management()
-    demonstrate_flight_planning()
-    demonstrate_flight_simulation()
+    demonstrate_waypoint_management(waypoint_manager)
+    demonstrate_flight_planning(waypoint_manager)
+    demonstrate_flight_simulation(waypoint_manager)
 
     # Optional: Launch GUI
     launch_choice = input("\nDo you want to launch the GUI? (yes/no): ").lower()
     if launch_choice == 'yes':
-        launch_gui()
+        launch_gui(waypoint_manager)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,28 @@
+import time
+from typing import Optional
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
 import tkinter as tk
+from src.database.morocco_boundary import get_morocco_boundary
 from src.navigation.trajectory_calculator import TrajectoryCalculator
 from src.navigation.flight_planner import FlightPlan
 
 
 class MapDisplay:
-    def __init__(self, master, flight_plan: FlightPlan):
+    """
+    Map of the flight route with live aircraft positions.
+
+    The static map (boundaries, route, waypoints) is rendered once and
+    cached as a background bitmap on every full draw. Aircraft markers and
+    the trail are persistent animated artists whose data is updated in
+    place; position updates only mark the overlay dirty, and at most
+    max_fps times per second the background is restored and the overlay
+    blitted on top. Any number of updates between two frames costs a
+    single redraw.
+    """
+
+    def __init__(self, master, flight_plan: FlightPlan, max_fps: float = 30.0, trail_length: int = 500):
         self.master = master
         self.flight_plan = flight_plan
         self.trajectory_calculator = TrajectoryCalculator()
@@ -16,6 +32,7 @@ class MapDisplay:
         self.canvas = FigureCanvasTkAgg(self.fig, master=master)
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.pack(fill=tk.BOTH, expand=True)
+        self._create_overlay(max_fps, trail_length)
 
         # Plot Morocco boundaries
         self._plot_morocco_boundaries()
@@ -23,22 +40,39 @@ class MapDisplay:
         # Plot waypoints and trajectory
         self._plot_flight_route()
 
+    def _create_overlay(self, max_fps: float, trail_length: int):
+        """
+        Create the animated overlay artists and the trail and frame state on self.ax and self.canvas.
+
+        :param max_fps: Maximum overlay redraws per second
+        :param trail_length: Number of trail points kept for the tracked aircraft
+        """
+        self.frame_interval_s = 1.0 / max_fps
+
+        # Persistent overlay: every aircraft marker in one artist, plus the trail of the tracked aircraft
+        self.aircraft_markers, = self.ax.plot([], [], 'go', markersize=10, label='_aircraft', animated=True,
+                                              zorder=10)
+        self.trail_line, = self.ax.plot([], [], 'g-', linewidth=1.5, alpha=0.6, label='_trail', animated=True,
+                                        zorder=9)
+        self._trail = np.full((2, trail_length), np.nan)
+        self._trail_count = 0
+        self._background = None
+        self._frame_pending = False
+        self._last_frame = 0.0
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
     def _plot_morocco_boundaries(self):
-        """Plot approximate Morocco boundaries."""
-        # Moroccan boundary coordinates (simplified)
-        lat_min, lat_max = 21.4, 36.0
-        lon_min, lon_max = -17.0, -1.0
+        """Plot Morocco boundaries from the shared boundary polygon."""
+        boundary = get_morocco_boundary()
 
         # Fill background
         self.ax.set_facecolor('#F0F0F0')
 
         # Plot country boundaries
-        self.ax.plot([lon_min, lon_max, lon_max, lon_min, lon_min],
-                     [lat_min, lat_min, lat_max, lat_max, lat_min],
-                     color='black', linewidth=2)
+        self.ax.plot(boundary.longitudes, boundary.latitudes, color='black', linewidth=2)
 
-        self.ax.set_xlim(lon_min - 1, lon_max + 1)
-        self.ax.set_ylim(lat_min - 1, lat_max + 1)
+        self.ax.set_xlim(boundary.lon_min - 1, boundary.lon_max + 1)
+        self.ax.set_ylim(boundary.lat_min - 1, boundary.lat_max + 1)
         self.ax.set_title('Moroccan Flight Route')
         self.ax.set_xlabel('Longitude')
         self.ax.set_ylabel('Latitude')
@@ -72,15 +106,68 @@ class MapDisplay:
         self.ax.legend()
         self.canvas.draw()
 
-    def update_aircraft_position(self, position):
-        """Update aircraft position on the map."""
-        # Clear previous aircraft position
-        for artist in self.ax.get_children():
-            if isinstance(artist, plt.Line2D) and artist.get_label() == 'Aircraft':
-                artist.remove()
+    def _on_draw(self, event):
+        """Cache the freshly drawn static map and put the overlay back on top."""
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_overlay()
 
-        # Plot new aircraft position
-        self.ax.plot(position[1], position[0], 'go', markersize=10, label='Aircraft')
-        self.canvas.draw()
+    def _draw_overlay(self):
+        self.ax.draw_artist(self.trail_line)
+        self.ax.draw_artist(self.aircraft_markers)
 
+    def _append_trail(self, latitude: float, longitude: float):
+        slot = self._trail_count % self._trail.shape[1]
+        self._trail[0, slot] = longitude
+        self._trail[1, slot] = latitude
+        self._trail_count += 1
 
+    def _trail_data(self):
+        length = self._trail.shape[1]
+        if self._trail_count <= length:
+            return self._trail[:, :self._trail_count]
+        start = self._trail_count % length
+        return np.concatenate((self._trail[:, start:], self._trail[:, :start]), axis=1)
+
+    def update_aircraft_position(self, position):
+        """Update aircraft position on the map."""
+        latitude, longitude = position
+        self._append_trail(latitude, longitude)
+        self.aircraft_markers.set_data([longitude], [latitude])
+        self._request_frame()
+
+    def update_aircraft_positions(self, latitudes, longitudes, tracked: Optional[int] = None):
+        """
+        Show many aircraft at once, e.g. from a FleetSimulator.
+
+        :param latitudes: Latitudes of all aircraft
+        :param longitudes: Longitudes of all aircraft
+        :param tracked: Index of the aircraft whose trail is drawn (default: no trail update)
+        """
+        self.aircraft_markers.set_data(longitudes, latitudes)
+        if tracked is not None:
+            self._append_trail(latitudes[tracked], longitudes[tracked])
+        self._request_frame()
+
+    def clear_trail(self):
+        self._trail_count = 0
+        self._request_frame()
+
+    def _request_frame(self):
+        """Coalesce updates into at most one frame per frame interval."""
+        if self._frame_pending:
+            return
+        self._frame_pending = True
+        delay = self._last_frame + self.frame_interval_s - time.perf_counter()
+        self.master.after(max(int(delay * 1000), 0), self._render_frame)
+
+    def _render_frame(self):
+        self._frame_pending = False
+        self._last_frame = time.perf_counter()
+        self.trail_line.set_data(*self._trail_data())
+        if self._background is None or not getattr(self.canvas, 'supports_blit', True):
+            # No cached map yet (or no blitting): a full draw caches it via _on_draw
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_overlay()
+        self.canvas.blit(self.ax.bbox)
@@ -0,0 +1,91 @@
+import json
+import os
+from functools import lru_cache
+from typing import Union
+import numpy as np
+
+DEFAULT_BOUNDARY_PATH = os.path.join(os.path.dirname(__file__), 'morocco_boundary.json')
+
+
+class BoundaryPolygon:
+    """
+    Closed lat/lon polygon with vectorized point-in-polygon tests.
+
+    Points are first checked against the polygon bounding box; only the
+    candidates inside it go through the even-odd crossing test, which is
+    evaluated for a block of points against every edge at once.
+    """
+
+    BLOCK_SIZE = 4096
+
+    def __init__(self, longitudes, latitudes):
+        longitudes = np.asarray(longitudes, dtype=float)
+        latitudes = np.asarray(latitudes, dtype=float)
+        if len(longitudes) < 3 or len(longitudes) != len(latitudes):
+            raise ValueError("A boundary polygon needs at least three vertices")
+        if longitudes[0] != longitudes[-1] or latitudes[0] != latitudes[-1]:
+            longitudes = np.append(longitudes, longitudes[0])
+            latitudes = np.append(latitudes, latitudes[0])
+
+        self.longitudes = longitudes
+        self.latitudes = latitudes
+        self.lat_min, self.lat_max = float(latitudes.min()), float(latitudes.max())
+        self.lon_min, self.lon_max = float(longitudes.min()), float(longitudes.max())
+
+        # Edge table for the crossing test, skipping horizontal edges
+        x0, y0 = longitudes[:-1], latitudes[:-1]
+        x1, y1 = longitudes[1:], latitudes[1:]
+        keep = y0 != y1
+        self._x0, self._y0, self._y1 = x0[keep], y0[keep], y1[keep]
+        self._slope = (x1[keep] - x0[keep]) / (y1[keep] - y0[keep])
+
+    def bbox_mask(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        return ((latitudes >= self.lat_min) & (latitudes <= self.lat_max)
+                & (longitudes >= self.lon_min) & (longitudes <= self.lon_max))
+
+    def contains(self, latitudes, longitudes) -> Union[bool, np.ndarray]:
+        """
+        Test whether points lie inside the polygon.
+
+        :param latitudes: Latitude or array of latitudes in degrees
+        :param longitudes: Longitude or array of longitudes in degrees
+        :return: bool for scalar input, otherwise a boolean array of the input shape
+        """
+        lats = np.asarray(latitudes, dtype=float)
+        lons = np.asarray(longitudes, dtype=float)
+        scalar = lats.ndim == 0 and lons.ndim == 0
+        lats, lons = np.broadcast_arrays(lats, lons)
+        shape = lats.shape
+        lats, lons = lats.ravel(), lons.ravel()
+
+        inside = np.zeros(lats.shape, dtype=bool)
+        candidates = np.flatnonzero(self.bbox_mask(lats, lons))
+        for start in range(0, len(candidates), self.BLOCK_SIZE):
+            block = candidates[start:start + self.BLOCK_SIZE]
+            py = lats[block, None]
+            px = lons[block, None]
+            straddles = (self._y0 > py) != (self._y1 > py)
+            crossing_x = self._x0 + (py - self._y0) * self._slope
+            crossings = np.count_nonzero(straddles & (px < crossing_x), axis=1)
+            inside[block] = crossings % 2 == 1
+
+        if scalar:
+            return bool(inside[0])
+        return inside.reshape(shape)
+
+
+@lru_cache(maxsize=None)
+def load_boundary(path: str = DEFAULT_BOUNDARY_PATH) -> BoundaryPolygon:
+    """Load a GeoJSON polygon (Feature or bare geometry) once and cache it."""
+    with open(path, 'r') as f:
+        document = json.load(f)
+    geometry = document.get('geometry', document)
+    if geometry.get('type') != 'Polygon':
+        raise ValueError(f"{path} does not contain a Polygon geometry")
+    exterior = np.asarray(geometry['coordinates'][0], dtype=float)
+    return BoundaryPolygon(exterior[:, 0], exterior[:, 1])
+
+
+def get_morocco_boundary() -> BoundaryPolygon:
+    """Shared, cached Moroccan boundary used for validation and by the map display."""
+    return load_boundary(DEFAULT_BOUNDARY_PATH)
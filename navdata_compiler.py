@@ -0,0 +1,248 @@
+import mmap
+import os
+import struct
+import sys
+from typing import List, Optional
+import numpy as np
+
+NAVDATA_MAGIC = b'FMSNAV\x00\x00'
+NAVDATA_VERSION = 1
+NAVDATA_EXTENSION = '.fmsnav'
+
+# magic, version, reserved, record count, type count,
+# source size, source mtime (ns),
+# records offset, code index offset, type table offset, string table offset, string table size
+HEADER = struct.Struct('<8sHHIIQqQQQQQ')
+
+MAX_CODE_LENGTH = 12
+RECORD_DTYPE = np.dtype([
+    ('latitude', '<f8'),
+    ('longitude', '<f8'),
+    ('elevation', '<f8'),
+    ('name_offset', '<u4'),
+    ('name_length', '<u4'),
+    ('code', f'S{MAX_CODE_LENGTH}'),
+    ('type_id', '<u2'),
+    ('reserved', 'V2'),
+])
+CODE_DTYPE = np.dtype(f'S{MAX_CODE_LENGTH}')
+STRING_REF_DTYPE = np.dtype([('offset', '<u4'), ('length', '<u4')])
+
+
+def compiled_path_for(database_path: str) -> str:
+    """Default location of the compiled navdata file for a JSON database."""
+    return os.path.splitext(database_path)[0] + NAVDATA_EXTENSION
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def compile_navdata(database_path: str, output_path: Optional[str] = None) -> str:
+    """
+    Compile a JSON waypoint database into the binary navdata format.
+
+    Any pending journal is compacted first so that the binary file mirrors
+    the JSON base file exactly; the JSON stays the editable source of truth.
+
+    :param database_path: Path to the JSON waypoint database
+    :param output_path: Destination file (defaults to compiled_path_for(database_path))
+    :return: Path of the written file
+    """
+    from src.database.waypoint_manager import WaypointManager
+
+    if output_path is None:
+        output_path = compiled_path_for(database_path)
+
+    manager = WaypointManager(database_path, use_compiled=False)
+    if os.path.exists(manager.journal_path):
+        manager.compact()
+    store = manager.store
+    count = len(store)
+
+    strings = bytearray()
+
+    def add_string(text: str):
+        encoded = text.encode('utf-8')
+        offset = len(strings)
+        strings.extend(encoded)
+        return offset, len(encoded)
+
+    records = np.zeros(count, dtype=RECORD_DTYPE)
+    records['latitude'] = store.latitudes
+    records['longitude'] = store.longitudes
+    records['elevation'] = store.elevations
+    records['type_id'] = store.type_ids
+    for row, waypoint in enumerate(store):
+        code = waypoint.icao_code.encode('utf-8')
+        if len(code) > MAX_CODE_LENGTH or code != code.rstrip(b'\x00'):
+            raise ValueError(f"Waypoint code {waypoint.icao_code!r} cannot be stored in navdata format")
+        records['code'][row] = code
+        records['name_offset'][row], records['name_length'][row] = add_string(waypoint.name)
+
+    type_table = np.zeros(len(store.types), dtype=STRING_REF_DTYPE)
+    for type_id, waypoint_type in enumerate(store.types):
+        type_table[type_id] = add_string(waypoint_type)
+
+    # Prebuilt code index: codes in sorted order plus the row each one maps to
+    order = np.argsort(records['code'], kind='stable')
+    sorted_codes = records['code'][order]
+    sorted_rows = order.astype('<u4')
+
+    records_offset = _align(HEADER.size)
+    code_index_offset = _align(records_offset + records.nbytes)
+    type_table_offset = _align(code_index_offset + sorted_codes.nbytes + sorted_rows.nbytes)
+    strings_offset = _align(type_table_offset + type_table.nbytes)
+
+    source = os.stat(database_path)
+    header = HEADER.pack(NAVDATA_MAGIC, NAVDATA_VERSION, 0, count, len(type_table),
+                         source.st_size, source.st_mtime_ns,
+                         records_offset, code_index_offset, type_table_offset,
+                         strings_offset, len(strings))
+
+    temp_path = output_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        for offset, blob in ((0, header),
+                             (records_offset, records.tobytes()),
+                             (code_index_offset, sorted_codes.tobytes() + sorted_rows.tobytes()),
+                             (type_table_offset, type_table.tobytes()),
+                             (strings_offset, bytes(strings))):
+            f.write(b'\x00' * (offset - f.tell()))
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, output_path)
+    return output_path
+
+
+class CompiledNavdata:
+    """
+    Read-only, memory-mapped view of a compiled navdata file.
+
+    Opening only parses the fixed-size header; records, the code index and
+    strings are paged in by the OS as they are touched. close() (or a with
+    block) unmaps the file, which Windows requires before it can be replaced.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except ValueError:
+            self.close()
+            raise
+
+    def _parse(self):
+        path = self.path
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"{path} is not a navdata file")
+        (magic, version, _, count, type_count, self.source_size, self.source_mtime_ns,
+         records_offset, code_index_offset, type_table_offset,
+         strings_offset, strings_size) = HEADER.unpack_from(self._mmap, 0)
+        if magic != NAVDATA_MAGIC:
+            raise ValueError(f"{path} is not a navdata file")
+        if version != NAVDATA_VERSION:
+            raise ValueError(f"Unsupported navdata version {version} in {path}")
+
+        self._count = count
+        self.records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=count, offset=records_offset)
+        self._sorted_codes = np.frombuffer(self._mmap, dtype=CODE_DTYPE, count=count, offset=code_index_offset)
+        self._sorted_rows = np.frombuffer(self._mmap, dtype='<u4', count=count,
+                                          offset=code_index_offset + count * CODE_DTYPE.itemsize)
+        self._strings_offset = strings_offset
+        self._strings_end = strings_offset + strings_size
+
+        type_table = np.frombuffer(self._mmap, dtype=STRING_REF_DTYPE, count=type_count, offset=type_table_offset)
+        self.types: List[str] = [self._string(int(ref['offset']), int(ref['length'])) for ref in type_table]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> 'CompiledNavdata':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._mmap is None
+
+    def close(self):
+        """Unmap the file; arrays taken from it must not be used afterwards."""
+        if self._mmap is None:
+            return
+        self.records = self._sorted_codes = self._sorted_rows = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # columns handed out earlier still reference it; it is unmapped once they are collected
+        self._mmap = None
+
+    def is_fresh_for(self, database_path: str) -> bool:
+        """Whether this file still mirrors the JSON database it was compiled from."""
+        from src.database.waypoint_manager import WaypointManager
+
+        try:
+            source = os.stat(database_path)
+        except FileNotFoundError:
+            return False
+        return (source.st_size == self.source_size
+                and source.st_mtime_ns == self.source_mtime_ns
+                and not os.path.exists(WaypointManager.journal_path_for(database_path)))
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_offset + offset
+        return self._mmap[start:start + length].decode('utf-8')
+
+    @property
+    def latitudes(self) -> np.ndarray:
+        return self.records['latitude']
+
+    @property
+    def longitudes(self) -> np.ndarray:
+        return self.records['longitude']
+
+    @property
+    def elevations(self) -> np.ndarray:
+        return self.records['elevation']
+
+    @property
+    def type_ids(self) -> np.ndarray:
+        return self.records['type_id']
+
+    def row_of(self, icao_code: str) -> int:
+        """Binary-search the prebuilt code index. Returns -1 if the code is unknown."""
+        key = icao_code.encode('utf-8')
+        if len(key) > MAX_CODE_LENGTH:
+            return -1
+        i = int(np.searchsorted(self._sorted_codes, key))
+        if i < self._count and self._sorted_codes[i] == key:
+            return int(self._sorted_rows[i])
+        return -1
+
+    def code_at(self, row: int) -> str:
+        return self.records[row]['code'].decode('utf-8')
+
+    def name_at(self, row: int) -> str:
+        record = self.records[row]
+        return self._string(int(record['name_offset']), int(record['name_length']))
+
+    def codes(self) -> List[str]:
+        return [code.decode('utf-8') for code in self.records['code'].tolist()]
+
+    def names(self) -> List[str]:
+        blob = self._mmap[self._strings_offset:self._strings_end]
+        return [blob[offset:offset + length].decode('utf-8')
+                for offset, length in zip(self.records['name_offset'].tolist(),
+                                          self.records['name_length'].tolist())]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 3):
+        print("Usage: navdata_compiler.py <waypoints.json> [output.fmsnav]")
+        sys.exit(1)
+    written = compile_navdata(*sys.argv[1:])
+    print(f"Compiled navdata written to {written}")
@@ -0,0 +1,246 @@
+import csv
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from src.database.waypoint_manager import WaypointManager
+from src.database.waypoint_store import Waypoint
+
+FEET_TO_METERS = 0.3048
+
+# ARINC 424 column slices (0-based, end exclusive) for the supported records
+ARINC_LATITUDE = slice(32, 41)     # N/S DD MM SS ss
+ARINC_LONGITUDE = slice(41, 51)    # E/W DDD MM SS ss
+ARINC_RECORD_FORMATS = {
+    # (section, subsection): (identifier, name, elevation in feet, waypoint type)
+    ('E', 'A'): (slice(13, 18), slice(98, 123), None, 'waypoint'),
+    ('D', ' '): (slice(13, 17), slice(93, 123), slice(79, 84), 'VOR'),
+    ('D', 'B'): (slice(13, 17), slice(93, 123), None, 'NDB'),
+    ('P', 'A'): (slice(6, 10), slice(93, 123), slice(56, 61), 'airport'),
+}
+
+
+@dataclass
+class RejectedRow:
+    line_number: int
+    icao_code: str
+    reason: str
+
+
+@dataclass
+class ImportReport:
+    accepted: int = 0
+    duplicates: int = 0
+    rejected_count: int = 0
+    rejected: List[RejectedRow] = field(default_factory=list)
+
+    def reject(self, row: RejectedRow, max_reported: int):
+        """Count a rejected row, keeping its details only up to max_reported rows."""
+        self.rejected_count += 1
+        if len(self.rejected) < max_reported:
+            self.rejected.append(row)
+
+
+@dataclass
+class _Chunk:
+    """Parsed rows awaiting validation, one list entry per source line."""
+    line_numbers: List[int] = field(default_factory=list)
+    codes: List[str] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    types: List[str] = field(default_factory=list)
+    latitudes: Optional[np.ndarray] = None
+    longitudes: Optional[np.ndarray] = None
+    elevations: Optional[np.ndarray] = None
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _to_floats(values: List[str]) -> np.ndarray:
+    """Convert strings to floats in one call, falling back to NaN for bad entries."""
+    try:
+        return np.array(values, dtype=float)
+    except ValueError:
+        result = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                result[i] = float(value)
+            except ValueError:
+                result[i] = np.nan
+        return result
+
+
+def decode_arinc_coordinates(fields: List[str], degree_digits: int) -> np.ndarray:
+    """
+    Decode ARINC 424 hemisphere/degrees/minutes/seconds/hundredths fields.
+
+    Every field of the batch is decoded with array arithmetic on its ASCII
+    digits; malformed fields come back as NaN.
+
+    :param fields: Raw coordinate fields, e.g. 'N33215400' or 'W007345300'
+    :param degree_digits: 2 for latitudes, 3 for longitudes
+    :return: Signed decimal degrees
+    """
+    width = 1 + degree_digits + 6
+    if not fields:
+        return np.empty(0)
+    blob = "".join(f.ljust(width)[:width] for f in fields).encode('ascii', 'replace')
+    raw = np.frombuffer(blob, dtype=np.uint8).reshape(-1, width)
+
+    digits = raw[:, 1:].astype(np.int16) - ord('0')
+    valid = ((digits >= 0) & (digits <= 9)).all(axis=1)
+
+    place_values = 10 ** np.arange(degree_digits - 1, -1, -1)
+    degrees = digits[:, :degree_digits] @ place_values
+    minutes = digits[:, degree_digits] * 10 + digits[:, degree_digits + 1]
+    seconds = digits[:, degree_digits + 2] * 10 + digits[:, degree_digits + 3]
+    hundredths = digits[:, degree_digits + 4] * 10 + digits[:, degree_digits + 5]
+    valid &= (minutes < 60) & (seconds < 60)
+
+    hemisphere = raw[:, 0]
+    positive, negative = (b'N', b'S') if degree_digits == 2 else (b'E', b'W')
+    valid &= (hemisphere == positive[0]) | (hemisphere == negative[0])
+    sign = np.where(hemisphere == negative[0], -1.0, 1.0)
+
+    value = sign * (degrees + minutes / 60.0 + (seconds + hundredths / 100.0) / 3600.0)
+    value[~valid] = np.nan
+    return value
+
+
+class NavdataImporter:
+    """
+    Streaming importer for external navdata files.
+
+    Files are read line by line and processed in fixed-size chunks, so memory
+    use depends on the chunk size rather than on the file size. Each chunk is
+    validated with array operations, deduplicated against the database code
+    index and stored with a single WaypointManager.add_waypoints call.
+    """
+
+    def __init__(self, waypoint_manager: WaypointManager, chunk_size: int = 5000,
+                 max_reported_rejections: int = 1000):
+        self.waypoint_manager = waypoint_manager
+        self.chunk_size = chunk_size
+        self.max_reported_rejections = max_reported_rejections
+
+    def import_csv(self, path: str, delimiter: str = ',') -> ImportReport:
+        """
+        Import waypoints from a CSV file with a header row.
+
+        Required columns are icao_code, latitude and longitude (decimal
+        degrees); name, type and elevation are optional.
+
+        :param path: CSV file path
+        :param delimiter: Field delimiter
+        :return: ImportReport
+        """
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f, delimiter=delimiter)
+            missing = {'icao_code', 'latitude', 'longitude'} - set(reader.fieldnames or ())
+            if missing:
+                raise ValueError(f"CSV file is missing columns: {', '.join(sorted(missing))}")
+            rows = ((reader.line_num, row) for row in reader)
+            return self._run(self._parse_csv_chunk(chunk) for chunk in _chunked(rows, self.chunk_size))
+
+    def import_arinc424(self, path: str) -> ImportReport:
+        """
+        Import enroute waypoints, VHF navaids, NDBs and airports from an
+        ARINC 424 fixed-width file. Other record types are skipped.
+
+        :param path: ARINC 424 file path
+        :return: ImportReport
+        """
+        with open(path, encoding='ascii', errors='replace') as f:
+            records = ((line_number, line.rstrip('\r\n'))
+                       for line_number, line in enumerate(f, start=1)
+                       if self._arinc_format(line) is not None)
+            return self._run(self._parse_arinc_chunk(chunk) for chunk in _chunked(records, self.chunk_size))
+
+    @staticmethod
+    def _arinc_format(line: str):
+        if len(line) < 51 or line[0] != 'S':
+            return None
+        subsection = line[12] if line[4] == 'P' else line[5]
+        return ARINC_RECORD_FORMATS.get((line[4], subsection))
+
+    def _parse_csv_chunk(self, rows: List[Tuple[int, dict]]) -> _Chunk:
+        chunk = _Chunk()
+        for line_number, row in rows:
+            code = (row.get('icao_code') or '').strip()
+            chunk.line_numbers.append(line_number)
+            chunk.codes.append(code)
+            chunk.names.append((row.get('name') or code).strip())
+            chunk.types.append((row.get('type') or 'waypoint').strip())
+
+        chunk.latitudes = _to_floats([(row.get('latitude') or 'nan') for _, row in rows])
+        chunk.longitudes = _to_floats([(row.get('longitude') or 'nan') for _, row in rows])
+        elevations = _to_floats([(row.get('elevation') or '0') for _, row in rows])
+        chunk.elevations = np.where(np.isnan(elevations), 0.0, elevations)
+        return chunk
+
+    def _parse_arinc_chunk(self, records: List[Tuple[int, str]]) -> _Chunk:
+        chunk = _Chunk()
+        elevation_fields = []
+        for line_number, line in records:
+            ident, name, elevation, waypoint_type = self._arinc_format(line)
+            code = line[ident].strip()
+            chunk.line_numbers.append(line_number)
+            chunk.codes.append(code)
+            chunk.names.append(line[name].strip() or code)
+            chunk.types.append(waypoint_type)
+            elevation_fields.append(line[elevation].strip() if elevation else '0')
+
+        chunk.latitudes = decode_arinc_coordinates([line[ARINC_LATITUDE] for _, line in records], 2)
+        chunk.longitudes = decode_arinc_coordinates([line[ARINC_LONGITUDE] for _, line in records], 3)
+        elevations = _to_floats([value or '0' for value in elevation_fields])
+        chunk.elevations = np.where(np.isnan(elevations), 0.0, elevations) * FEET_TO_METERS
+        return chunk
+
+    def _run(self, chunks: Iterable[_Chunk]) -> ImportReport:
+        report = ImportReport()
+        with self.waypoint_manager.bulk_update():
+            for chunk in chunks:
+                self._store_chunk(chunk, report)
+        return report
+
+    def _store_chunk(self, chunk: _Chunk, report: ImportReport):
+        """Validate a parsed chunk with array operations and store the accepted rows."""
+        lats, lons = chunk.latitudes, chunk.longitudes
+        finite = np.isfinite(lats) & np.isfinite(lons)
+        in_range = finite & (np.abs(lats) <= 90.0) & (np.abs(lons) <= 180.0)
+        in_morocco = in_range & self.waypoint_manager.in_morocco_mask(
+            np.where(in_range, lats, 0.0), np.where(in_range, lons, 0.0))
+        known = self.waypoint_manager.get_rows_by_codes(chunk.codes) >= 0
+
+        accepted = []
+        seen = set()
+        for i, code in enumerate(chunk.codes):
+            if not code:
+                reason = "missing identifier"
+            elif not in_range[i]:
+                reason = "invalid coordinates"
+            elif not in_morocco[i]:
+                reason = "outside Morocco"
+            elif known[i] or code in seen:
+                report.duplicates += 1
+                continue
+            else:
+                seen.add(code)
+                accepted.append(Waypoint(
+                    name=chunk.names[i],
+                    icao_code=code,
+                    latitude=float(lats[i]),
+                    longitude=float(lons[i]),
+                    type=chunk.types[i],
+                    elevation=float(chunk.elevations[i])
+                ))
+                continue
+            report.reject(RejectedRow(chunk.line_numbers[i], code, reason), self.max_reported_rejections)
+
+        report.accepted += self.waypoint_manager.add_waypoints(accepted)
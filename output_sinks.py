@@ -0,0 +1,108 @@
+import csv
+from abc import ABC, abstractmethod
+from typing import List
+import numpy as np
+
+# One simulator tick, as handed to OutputSink.write_batch
+STATE_DTYPE = np.dtype([
+    ('time', 'f8'),
+    ('latitude', 'f8'),
+    ('longitude', 'f8'),
+    ('altitude', 'f8'),
+    ('speed', 'f8'),
+    ('heading', 'f8'),
+    ('along_track_km', 'f8'),
+])
+
+
+class OutputSink(ABC):
+    """
+    Receives simulator output instead of it being printed.
+
+    write() is called for single ticks and write_batch() when the simulator
+    advances many ticks at once; sinks that can handle arrays directly should
+    override write_batch, the default falls back to one write() per record.
+    """
+
+    @abstractmethod
+    def write(self, simulation_time: float, state) -> None:
+        pass
+
+    def write_batch(self, records: np.ndarray) -> None:
+        for record in records:
+            self.write(float(record['time']), _RecordState(record))
+
+    def close(self) -> None:
+        pass
+
+
+class _RecordState:
+    """Read-only AircraftState look-alike over one STATE_DTYPE record."""
+    __slots__ = ('latitude', 'longitude', 'altitude', 'speed', 'heading', 'along_track_km')
+
+    def __init__(self, record):
+        for name in self.__slots__:
+            setattr(self, name, float(record[name]))
+
+    @property
+    def current_position(self):
+        return self.latitude, self.longitude
+
+
+class PrintSink(OutputSink):
+    """The original console output of run_simulation, optionally thinned to every n-th tick."""
+
+    def __init__(self, every: int = 1):
+        self.every = every
+        self._count = 0
+
+    def write(self, simulation_time: float, state) -> None:
+        self._count += 1
+        if (self._count - 1) % self.every:
+            return
+        print(f"Time: {simulation_time}s")
+        print(f"Position: {state.current_position}")
+        print(f"Altitude: {state.altitude} ft")
+        print(f"Speed: {state.speed} knots")
+        print(f"Heading: {state.heading}°")
+        print("---")
+
+
+class RecordingSink(OutputSink):
+    """Keeps every tick in memory as STATE_DTYPE records, e.g. for regression tests."""
+
+    def __init__(self):
+        self._batches: List[np.ndarray] = []
+
+    def write(self, simulation_time: float, state) -> None:
+        record = np.array([(simulation_time, state.latitude, state.longitude, state.altitude, state.speed,
+                            state.heading, state.along_track_km)], dtype=STATE_DTYPE)
+        self._batches.append(record)
+
+    def write_batch(self, records: np.ndarray) -> None:
+        self._batches.append(np.array(records, dtype=STATE_DTYPE))
+
+    @property
+    def records(self) -> np.ndarray:
+        if len(self._batches) > 1:
+            self._batches = [np.concatenate(self._batches)]
+        return self._batches[0] if self._batches else np.empty(0, dtype=STATE_DTYPE)
+
+
+class CSVSink(OutputSink):
+    """Writes one CSV row per tick, with the STATE_DTYPE field names as header."""
+
+    def __init__(self, path: str):
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(STATE_DTYPE.names)
+
+    def write(self, simulation_time: float, state) -> None:
+        self._writer.writerow((simulation_time, state.latitude, state.longitude, state.altitude, state.speed,
+                               state.heading, state.along_track_km))
+
+    def write_batch(self, records: np.ndarray) -> None:
+        self._writer.writerows(records.tolist())
+
+    def close(self) -> None:
+        self._file.close()
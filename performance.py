@@ -0,0 +1,109 @@
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Sequence, Tuple
+import numpy as np
+
+DEFAULT_PERFORMANCE_PATH = os.path.join(os.path.dirname(__file__), 'aircraft_performance.json')
+
+# Quantities every performance table must provide, in the order they are stacked
+PERFORMANCE_FIELDS = (
+    'climb_rate_fpm', 'descent_rate_fpm',
+    'tas_climb_knots', 'tas_cruise_knots', 'tas_descent_knots',
+    'fuel_flow_climb_kgph', 'fuel_flow_cruise_kgph', 'fuel_flow_descent_kgph',
+)
+PERFORMANCE_AXES = ('weight_kg', 'altitude_ft', 'isa_deviation_c')
+
+# Scalar lookups memoized per AircraftPerformance; the oldest is dropped when full
+AT_CACHE_SIZE = 4096
+
+
+class AircraftPerformance:
+    """
+    Climb, descent and cruise performance of one aircraft type.
+
+    Every quantity is tabulated against weight, altitude and ISA deviation.
+    The tables are stacked into one array so a lookup interpolates all of
+    them at once; lookups are multilinear, vectorized over any number of
+    points and clamped to the table edges.
+    """
+
+    def __init__(self, aircraft_type: str, axes: Dict[str, Sequence[float]], tables: Dict[str, Sequence]):
+        self.aircraft_type = aircraft_type
+        missing = [name for name in PERFORMANCE_AXES if name not in axes]
+        missing += [name for name in PERFORMANCE_FIELDS if name not in tables]
+        if missing:
+            raise ValueError(f"Performance data for {aircraft_type} is missing: {', '.join(missing)}")
+
+        self.axes = tuple(np.asarray(axes[name], dtype=float) for name in PERFORMANCE_AXES)
+        if any(len(axis) < 2 or np.any(np.diff(axis) <= 0) for axis in self.axes):
+            raise ValueError("Performance table axes must be strictly increasing with at least two points")
+        shape = tuple(len(axis) for axis in self.axes)
+        grids = [np.asarray(tables[name], dtype=float) for name in PERFORMANCE_FIELDS]
+        if any(grid.shape != shape for grid in grids):
+            raise ValueError(f"Performance tables for {aircraft_type} must have shape {shape}")
+        self._values = np.ascontiguousarray(np.stack(grids, axis=-1))
+        self._at_cache: Dict[Tuple[float, float, float], Mapping[str, float]] = {}
+
+    def interpolate(self, weights_kg, altitudes_ft, isa_deviations_c=0.0) -> Dict[str, np.ndarray]:
+        """
+        Interpolate every performance quantity at a batch of points.
+
+        :param weights_kg: Aircraft weights (broadcast with the other inputs)
+        :param altitudes_ft: Pressure altitudes
+        :param isa_deviations_c: Temperature deviations from ISA
+        :return: Dict mapping each name in PERFORMANCE_FIELDS to an array
+        """
+        points = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in
+                                       (weights_kg, altitudes_ft, isa_deviations_c)))
+        indexes, weights = [], []
+        for axis, values in zip(self.axes, points):
+            index = np.clip(np.searchsorted(axis, values, side='right') - 1, 0, len(axis) - 2)
+            indexes.append(index)
+            weights.append(np.clip((values - axis[index]) / (axis[index + 1] - axis[index]), 0.0, 1.0))
+
+        result = np.zeros(points[0].shape + (len(PERFORMANCE_FIELDS),))
+        for corner in range(8):
+            factor = np.ones(points[0].shape)
+            corner_index = []
+            for dim in range(3):
+                upper = (corner >> dim) & 1
+                factor = factor * (weights[dim] if upper else 1.0 - weights[dim])
+                corner_index.append(indexes[dim] + upper)
+            result += factor[..., None] * self._values[tuple(corner_index)]
+        return {name: result[..., i] for i, name in enumerate(PERFORMANCE_FIELDS)}
+
+    def at(self, weight_kg: float, altitude_ft: float, isa_deviation_c: float = 0.0) -> Mapping[str, float]:
+        """Scalar lookup as a read-only mapping, memoized for the repeated queries of the CDU pages."""
+        key = (weight_kg, altitude_ft, isa_deviation_c)
+        cached = self._at_cache.get(key)
+        if cached is None:
+            if len(self._at_cache) >= AT_CACHE_SIZE:
+                del self._at_cache[next(iter(self._at_cache))]
+            values = self.interpolate(weight_kg, altitude_ft, isa_deviation_c)
+            cached = self._at_cache[key] = MappingProxyType({name: float(value) for name, value in values.items()})
+        return cached
+
+
+@lru_cache(maxsize=None)
+def load_performance_tables(path: str = DEFAULT_PERFORMANCE_PATH) -> Mapping[str, AircraftPerformance]:
+    """Load every aircraft type of a performance file once and cache the result (read-only, shared)."""
+    with open(path, 'r') as f:
+        document = json.load(f)
+    return MappingProxyType({aircraft_type: AircraftPerformance(aircraft_type, data['axes'], data['tables'])
+                             for aircraft_type, data in document.items()})
+
+
+def get_aircraft_performance(aircraft_type: str = 'A320', path: str = DEFAULT_PERFORMANCE_PATH) -> AircraftPerformance:
+    """
+    Performance model for an aircraft type.
+
+    :param aircraft_type: Type designator as used in the performance file
+    :param path: Performance file path
+    :return: AircraftPerformance
+    """
+    tables = load_performance_tables(path)
+    if aircraft_type not in tables:
+        raise ValueError(f"No performance data for aircraft type {aircraft_type}")
+    return tables[aircraft_type]
@@ -0,0 +1,160 @@
+import asyncio
+import math
+from dataclasses import dataclass
+from typing import Callable, List, NamedTuple, Optional
+from src.simulation.flight_simulator import FlightSimulator
+
+
+class StateUpdate(NamedTuple):
+    """Immutable copy of the aircraft state at one tick, as published to subscribers."""
+    simulation_time: float
+    latitude: float
+    longitude: float
+    altitude: float
+    speed: float
+    heading: float
+    along_track_km: float
+
+    @property
+    def current_position(self):
+        return self.latitude, self.longitude
+
+
+@dataclass
+class ClockStats:
+    ticks: int = 0
+    overruns: int = 0              # ticks that finished after the next deadline
+    skipped_deadlines: int = 0     # deadlines dropped to recover from overruns
+    max_lateness_s: float = 0.0    # worst wall-clock lateness of a tick
+
+
+class StateSubscription:
+    """
+    Bounded queue of StateUpdates for one consumer.
+
+    When the consumer falls behind, the oldest pending update is dropped so
+    the clock never waits for it; a slow consumer therefore always sees the
+    most recent states. Iterate with ``async for`` until the clock stops.
+    """
+
+    def __init__(self, maxsize: int = 16):
+        if maxsize < 1:
+            raise ValueError("Subscription queue size must be at least 1")
+        self.maxsize = maxsize
+        # Bounded by _publish rather than by the queue, so the end-of-run marker always fits
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self.dropped = 0
+        self.closed = False
+
+    def _publish(self, update: Optional[StateUpdate]):
+        if update is not None and self._queue.qsize() >= self.maxsize:
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(update)
+
+    async def get(self) -> Optional[StateUpdate]:
+        """Next state, or None once the clock has stopped."""
+        if self.closed:
+            return None
+        update = await self._queue.get()
+        if update is None:
+            self.closed = True
+        return update
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> StateUpdate:
+        update = await self.get()
+        if update is None:
+            raise StopAsyncIteration
+        return update
+
+
+class SimulationClock:
+    """
+    Drives a FlightSimulator at a fixed rate from an asyncio event loop.
+
+    Tick k is due at start + k * time_step / time_scale on the loop's
+    monotonic clock, so the cost of a tick never accumulates into drift.
+    A tick that finishes after the next deadline is counted as an overrun;
+    deadlines that have already passed by a whole interval are skipped
+    rather than replayed in a burst. Every tick is published to all
+    subscribers without awaiting them.
+    """
+
+    def __init__(self, simulator: FlightSimulator, time_step: float = 1.0, time_scale: float = 1.0,
+                 on_overrun: Optional[Callable[[int, float], None]] = None):
+        if time_step <= 0 or time_scale <= 0 or math.isinf(time_scale):
+            raise ValueError("Time step and time scale must be positive and finite")
+        self.simulator = simulator
+        self.time_step = time_step
+        self.time_scale = time_scale
+        self.on_overrun = on_overrun
+        self.stats = ClockStats()
+        self._subscriptions: List[StateSubscription] = []
+        self._stopping = False
+
+    def subscribe(self, maxsize: int = 16) -> StateSubscription:
+        """Register a consumer that receives every following tick."""
+        subscription = StateSubscription(maxsize)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: StateSubscription):
+        self._subscriptions.remove(subscription)
+
+    def stop(self):
+        """Ask a running clock to stop after the current tick."""
+        self._stopping = True
+
+    def _publish(self, update: Optional[StateUpdate]):
+        for subscription in self._subscriptions:
+            subscription._publish(update)
+
+    async def run(self, until: Optional[float] = None) -> ClockStats:
+        """
+        Tick the simulator until the flight ends, until is reached or stop() is called.
+
+        :param until: Simulation time in seconds to stop at (default: end of the flight)
+        :return: ClockStats of the run
+        """
+        simulator = self.simulator
+        if not simulator.is_running:
+            simulator.start_simulation()
+        loop = asyncio.get_running_loop()
+        interval = self.time_step / self.time_scale
+        start = loop.time()
+        tick = 0
+        self._stopping = False
+
+        try:
+            while simulator.is_running and not self._stopping:
+                if until is not None and simulator.simulation_time + self.time_step > until + 1e-9:
+                    break
+                state = simulator.update_aircraft_state(self.time_step)
+                self.stats.ticks += 1
+                self._publish(StateUpdate(simulator.simulation_time, state.latitude, state.longitude,
+                                          state.altitude, state.speed, state.heading, state.along_track_km))
+
+                tick += 1
+                now = loop.time()
+                lateness = now - (start + tick * interval)
+                if lateness > 0:
+                    self.stats.overruns += 1
+                    self.stats.max_lateness_s = max(self.stats.max_lateness_s, lateness)
+                    if self.on_overrun is not None:
+                        self.on_overrun(self.stats.ticks, lateness)
+                    missed = int(lateness // interval)
+                    if missed:
+                        self.stats.skipped_deadlines += missed
+                        tick += missed
+                # Always yield, so subscribers run even when the clock is behind
+                await asyncio.sleep(max(start + tick * interval - now, 0.0))
+        finally:
+            self._publish(None)
+
+        if not simulator.is_running:
+            for sink in simulator.sinks:
+                sink.close()
+        return self.stats
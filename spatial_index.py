@@ -0,0 +1,214 @@
+import math
+from typing import Dict, Hashable, List, Optional, Tuple
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+
+class SpatialIndex:
+    """
+    Uniform latitude/longitude grid over the sphere for proximity queries.
+
+    Points are bucketed into square cells of ``cell_size_deg``; a query only
+    gathers the cells overlapping the search circle and then filters the
+    candidates with a vectorized haversine distance.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.5, initial_capacity: int = 1024):
+        if cell_size_deg <= 0:
+            raise ValueError("Cell size must be positive")
+        self.cell_size_deg = cell_size_deg
+        self._n_rows = int(math.ceil(180.0 / cell_size_deg))
+        self._n_cols = int(math.ceil(360.0 / cell_size_deg))
+
+        # Slot storage (radians) with amortized growth and a free list
+        self._lat = np.empty(initial_capacity)
+        self._lon = np.empty(initial_capacity)
+        self._cos_lat = np.empty(initial_capacity)
+        self._type_ids = np.empty(initial_capacity, dtype=np.int32)
+        self._slot_keys: List[Optional[Hashable]] = []
+        self._slot_cells: List[Optional[Tuple[int, int]]] = []
+        self._free_slots: List[int] = []
+
+        self._slots: Dict[Hashable, int] = {}
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._type_codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slots
+
+    def _cell_of(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        row = min(int((latitude + 90.0) // self.cell_size_deg), self._n_rows - 1)
+        col = int(((longitude + 180.0) % 360.0) // self.cell_size_deg) % self._n_cols
+        return row, col
+
+    def _type_id(self, point_type: Optional[str]) -> int:
+        if point_type is None:
+            return -1
+        return self._type_codes.setdefault(point_type, len(self._type_codes))
+
+    def _grow(self, min_capacity: int):
+        capacity = max(min_capacity, 2 * len(self._lat))
+        for name in ('_lat', '_lon', '_cos_lat', '_type_ids'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def insert(self, key: Hashable, latitude: float, longitude: float, point_type: Optional[str] = None):
+        """
+        Add a point to the index, replacing any existing point with the same key.
+
+        :param key: Identifier returned by queries (e.g. an ICAO code)
+        :param latitude: Latitude in degrees
+        :param longitude: Longitude in degrees
+        :param point_type: Optional category used to filter queries
+        """
+        if key in self._slots:
+            self.remove(key)
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._slot_keys)
+            self._slot_keys.append(None)
+            self._slot_cells.append(None)
+            if slot >= len(self._lat):
+                self._grow(slot + 1)
+
+        lat_rad = math.radians(latitude)
+        self._lat[slot] = lat_rad
+        self._lon[slot] = math.radians(longitude)
+        self._cos_lat[slot] = math.cos(lat_rad)
+        self._type_ids[slot] = self._type_id(point_type)
+        self._slot_keys[slot] = key
+        self._slots[key] = slot
+        cell = self._cell_of(latitude, longitude)
+        self._slot_cells[slot] = cell
+        self._cells.setdefault(cell, []).append(slot)
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove a point by key. Returns False if the key is not indexed."""
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return False
+
+        cell = self._slot_cells[slot]
+        bucket = self._cells[cell]
+        bucket.remove(slot)
+        if not bucket:
+            del self._cells[cell]
+
+        self._slot_keys[slot] = None
+        self._slot_cells[slot] = None
+        self._free_slots.append(slot)
+        return True
+
+    def _candidate_slots(self, latitude: float, longitude: float, radius_km: float) -> np.ndarray:
+        """Collect slots from every cell that may intersect the search circle."""
+        radius_deg = math.degrees(radius_km / EARTH_RADIUS_KM)
+        lat_lo = max(latitude - radius_deg, -90.0)
+        lat_hi = min(latitude + radius_deg, 90.0)
+
+        max_abs_lat = max(abs(lat_lo), abs(lat_hi))
+        if max_abs_lat >= 89.999 or radius_deg >= 90.0:
+            lon_half_width = 180.0
+        else:
+            lon_half_width = min(radius_deg / math.cos(math.radians(max_abs_lat)), 180.0)
+
+        row_lo, _ = self._cell_of(lat_lo, 0.0)
+        row_hi, _ = self._cell_of(lat_hi, 0.0)
+        if lon_half_width >= 180.0:
+            cols = range(self._n_cols)
+        else:
+            _, col_lo = self._cell_of(0.0, longitude - lon_half_width)
+            n_span = int(math.ceil(2 * lon_half_width / self.cell_size_deg)) + 1
+            cols = [(col_lo + i) % self._n_cols for i in range(min(n_span, self._n_cols))]
+
+        slots: List[int] = []
+        n_cells = (row_hi - row_lo + 1) * len(cols)
+        if n_cells > len(self._cells):
+            # Sparse index: cheaper to walk the populated cells
+            col_set = set(cols)
+            for (row, col), bucket in self._cells.items():
+                if row_lo <= row <= row_hi and col in col_set:
+                    slots.extend(bucket)
+        else:
+            cells = self._cells
+            for row in range(row_lo, row_hi + 1):
+                for col in cols:
+                    bucket = cells.get((row, col))
+                    if bucket:
+                        slots.extend(bucket)
+        return np.array(slots, dtype=np.intp)
+
+    def _distances(self, latitude: float, longitude: float, slots: np.ndarray) -> np.ndarray:
+        """Vectorized haversine distance (km) from a point to the given slots."""
+        lat_rad = math.radians(latitude)
+        lon_rad = math.radians(longitude)
+        dlat = self._lat[slots] - lat_rad
+        dlon = self._lon[slots] - lon_rad
+        a = np.sin(dlat / 2) ** 2 + math.cos(lat_rad) * self._cos_lat[slots] * np.sin(dlon / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def _filter_type(self, slots: np.ndarray, point_type: Optional[str]) -> np.ndarray:
+        if point_type is None:
+            return slots
+        type_id = self._type_codes.get(point_type)
+        if type_id is None:
+            return slots[:0]
+        return slots[self._type_ids[slots] == type_id]
+
+    def _query(self, latitude: float, longitude: float, radius_km: float,
+               point_type: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        slots = self._filter_type(self._candidate_slots(latitude, longitude, radius_km), point_type)
+        distances = self._distances(latitude, longitude, slots)
+        inside = distances <= radius_km
+        return slots[inside], distances[inside]
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float,
+                      point_type: Optional[str] = None) -> List[Tuple[Hashable, float]]:
+        """
+        Find all points within a great-circle radius.
+
+        :param latitude: Query latitude in degrees
+        :param longitude: Query longitude in degrees
+        :param radius_km: Search radius in kilometers
+        :param point_type: Optional type filter
+        :return: (key, distance_km) pairs sorted by increasing distance
+        """
+        slots, distances = self._query(latitude, longitude, radius_km, point_type)
+        order = np.argsort(distances, kind='stable')
+        keys = self._slot_keys
+        return [(keys[slot], dist) for slot, dist in zip(slots[order].tolist(), distances[order].tolist())]
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1,
+                point_type: Optional[str] = None) -> List[Tuple[Hashable, float]]:
+        """
+        Find the k nearest points, optionally restricted to a type.
+
+        The search radius starts at one cell and doubles until at least k
+        points lie inside it, so only the neighbourhood of the query is scanned.
+
+        :return: Up to k (key, distance_km) pairs sorted by increasing distance
+        """
+        if k <= 0 or not self._slots:
+            return []
+
+        radius_km = math.radians(self.cell_size_deg) * EARTH_RADIUS_KM
+        half_circumference_km = math.pi * EARTH_RADIUS_KM
+        while True:
+            slots, distances = self._query(latitude, longitude, radius_km, point_type)
+            if len(slots) >= k or radius_km >= half_circumference_km:
+                break
+            radius_km *= 2
+
+        if len(slots) > k:
+            part = np.argpartition(distances, k - 1)[:k]
+            slots, distances = slots[part], distances[part]
+        order = np.argsort(distances, kind='stable')
+        keys = self._slot_keys
+        return [(keys[slot], dist) for slot, dist in zip(slots[order].tolist(), distances[order].tolist())]
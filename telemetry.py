@@ -0,0 +1,149 @@
+import os
+import struct
+from typing import Optional
+import numpy as np
+from src.simulation.output_sinks import OutputSink, STATE_DTYPE
+
+# Simulator state plus the autopilot targets of the tick (NaN when no autopilot is engaged)
+TELEMETRY_DTYPE = np.dtype(STATE_DTYPE.descr + [
+    ('target_altitude', 'f8'),
+    ('target_speed', 'f8'),
+    ('target_heading', 'f8'),
+])
+
+# File header: magic, record size in bytes, number of fields
+TELEMETRY_MAGIC = b'FMSTLM01'
+_HEADER = struct.Struct('<8sII')
+
+_TARGETS = ('target_altitude', 'target_speed', 'target_heading')
+
+
+class TelemetryRecorder(OutputSink):
+    """
+    Appends simulator ticks to a binary file of fixed-size TELEMETRY_DTYPE records.
+
+    Ticks are copied into a preallocated record buffer and the buffer is
+    written to disk in one call whenever it fills up, so a tick costs a
+    single row assignment. Batches larger than the buffer bypass it. The
+    file is a small header followed by raw records, and can be read back
+    with TelemetryReader even if the run was interrupted.
+    """
+
+    def __init__(self, path: str, buffer_records: int = 4096, autopilot=None):
+        if buffer_records < 1:
+            raise ValueError("Telemetry buffer must hold at least one record")
+        self.path = path
+        self.autopilot = autopilot
+        self._buffer = np.zeros(buffer_records, dtype=TELEMETRY_DTYPE)
+        self._count = 0
+        self.records_written = 0
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(TELEMETRY_MAGIC, TELEMETRY_DTYPE.itemsize, len(TELEMETRY_DTYPE.names)))
+
+    def _targets(self):
+        autopilot = self.autopilot
+        if autopilot is None:
+            return np.nan, np.nan, np.nan
+        return tuple(getattr(autopilot, name, np.nan) for name in _TARGETS)
+
+    def write(self, simulation_time: float, state) -> None:
+        self._buffer[self._count] = (simulation_time, state.latitude, state.longitude, state.altitude, state.speed,
+                                     state.heading, state.along_track_km) + self._targets()
+        self._count += 1
+        if self._count == len(self._buffer):
+            self.flush()
+
+    def write_batch(self, records: np.ndarray) -> None:
+        n = len(records)
+        if self._count + n > len(self._buffer):
+            self.flush()
+        if n > len(self._buffer):
+            block = np.empty(n, dtype=TELEMETRY_DTYPE)
+            self._fill(block, records)
+            self._file.write(block.tobytes())
+            self.records_written += n
+            return
+        self._fill(self._buffer[self._count:self._count + n], records)
+        self._count += n
+        if self._count == len(self._buffer):
+            self.flush()
+
+    def _fill(self, block: np.ndarray, records: np.ndarray):
+        for name in STATE_DTYPE.names:
+            block[name] = records[name]
+        for name, value in zip(_TARGETS, self._targets()):
+            block[name] = value
+
+    def flush(self) -> None:
+        """Write the buffered records to the file."""
+        if self._count:
+            self._file.write(self._buffer[:self._count].tobytes())
+            self.records_written += self._count
+            self._count = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class TelemetryReader:
+    """
+    Memory-mapped view of a telemetry file written by TelemetryRecorder.
+
+    Columns are returned as NumPy views into the mapping, so nothing is read
+    until it is used. Times are increasing, which lets time-range queries
+    use a binary search instead of a scan.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"{path} is not a telemetry file")
+        magic, record_size, field_count = _HEADER.unpack(header)
+        if magic != TELEMETRY_MAGIC or record_size != TELEMETRY_DTYPE.itemsize \
+                or field_count != len(TELEMETRY_DTYPE.names):
+            raise ValueError(f"{path} is not a telemetry file of this version")
+
+        self.path = path
+        # A trailing partial record (interrupted run) is ignored
+        count = (os.path.getsize(path) - _HEADER.size) // TELEMETRY_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=TELEMETRY_DTYPE, mode='r', offset=_HEADER.size, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=TELEMETRY_DTYPE)
+        self.times = self.records['time']
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy view of one field over all records."""
+        if name not in TELEMETRY_DTYPE.names:
+            raise ValueError(f"Unknown telemetry field: {name}")
+        return self.records[name]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.column(name)
+
+    def index_at(self, simulation_time: float) -> int:
+        """Index of the last record at or before a simulation time."""
+        return max(int(np.searchsorted(self.times, simulation_time, side='right')) - 1, 0)
+
+    def time_range(self, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """
+        Records with start <= time <= end, as a view into the file.
+
+        :param start: First simulation time (default: beginning of the recording)
+        :param end: Last simulation time (default: end of the recording)
+        :return: TELEMETRY_DTYPE records
+        """
+        first = 0 if start is None else int(np.searchsorted(self.times, start, side='left'))
+        last = len(self.times) if end is None else int(np.searchsorted(self.times, end, side='right'))
+        return self.records[first:last]
+
+    def close(self):
+        """Drop the mapping; it is released once no column views are left."""
+        self.times = self.records = None
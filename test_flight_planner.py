@@ -0,0 +1,250 @@
+import sys
+import os
+import unittest
+import shutil
+import tempfile
+import numpy as np
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database.waypoint_manager import WaypointManager, Waypoint
+from src.navigation.airway_graph import RouteConstraints
+from src.navigation.batch_planner import BatchPlanner, evaluate_chunk
+from src.navigation.flight_planner import FlightPlan, FlightPlanner
+from src.navigation.performance import get_aircraft_performance, load_performance_tables
+from src.navigation.vertical_profile import VerticalProfileBuilder
+from src.navigation.wind_field import WIND_CACHE_SIZE, WindField, load_wind_field
+
+
+class TestFlightPlanner(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.waypoint_manager = WaypointManager(os.path.join(temp_dir, 'waypoints.json'))
+        self.waypoint_manager.add_waypoints([
+            Waypoint(name="Mohammed V International Airport", icao_code="GMMN", latitude=33.3675,
+                     longitude=-7.5898, type="airport"),
+            Waypoint(name="Marrakesh Menara Airport", icao_code="GMMX", latitude=31.6069, longitude=-8.0364,
+                     type="airport"),
+            Waypoint(name="Agadir–Al Massira Airport", icao_code="GMAD", latitude=30.3753, longitude=-9.5478,
+                     type="airport"),
+            Waypoint(name="Essaouira Mogador Airport", icao_code="GMMI", latitude=31.3975, longitude=-9.6817,
+                     type="airport"),
+        ])
+
+    def test_create_flight_plan(self):
+        flight_plan = FlightPlanner(self.waypoint_manager).create_flight_plan("GMMN", "GMAD", ["GMMX"])
+        self.assertEqual([wp.icao_code for wp in flight_plan.get_flight_route()], ["GMMN", "GMMX", "GMAD"])
+        with self.assertRaises(ValueError):
+            FlightPlanner(self.waypoint_manager).create_flight_plan("GMMN", "GMAD", ["UNKNOWN"])
+
+    def test_leg_table_follows_route_edits(self):
+        manager = self.waypoint_manager
+        gmmn, gmmx, gmad, gmmi = manager.get_waypoints_by_codes(["GMMN", "GMMX", "GMAD", "GMMI"])
+        flight_plan = FlightPlan(gmmn, gmad)
+        direct = flight_plan.calculate_total_distance()
+
+        flight_plan.insert_waypoint(0, gmmi)
+        flight_plan.insert_waypoint(0, gmmx)
+        self.assertEqual([wp.icao_code for wp in flight_plan.get_flight_route()], ["GMMN", "GMMX", "GMMI", "GMAD"])
+        self._assert_leg_table_matches(flight_plan)
+
+        self.assertEqual(flight_plan.replace_route_point(2, gmmx).icao_code, "GMMI")
+        self.assertEqual(flight_plan.remove_waypoint(1).icao_code, "GMMX")
+        self._assert_leg_table_matches(flight_plan)
+
+        flight_plan.remove_waypoint(0)
+        self.assertAlmostEqual(flight_plan.calculate_total_distance(), direct)
+
+    def test_locate_along_track_position(self):
+        gmmn, gmmx, gmad = self.waypoint_manager.get_waypoints_by_codes(["GMMN", "GMMX", "GMAD"])
+        flight_plan = FlightPlan(gmmn, gmad, [gmmx])
+        first_leg, second_leg = flight_plan.leg_distances
+
+        self.assertEqual(flight_plan.locate(10.0), (0, 10.0))
+        leg, flown = flight_plan.locate(first_leg + 5.0)
+        self.assertEqual(leg, 1)
+        self.assertAlmostEqual(flown, 5.0)
+        self.assertAlmostEqual(flight_plan.distance_remaining(first_leg + 5.0), second_leg - 5.0)
+        self.assertAlmostEqual(flight_plan.distance_to_next_waypoint(10.0), first_leg - 10.0)
+        self.assertEqual(flight_plan.distance_remaining(1e6), 0.0)
+
+    def _assert_leg_table_matches(self, flight_plan):
+        rebuilt = FlightPlan(flight_plan.origin, flight_plan.destination, list(flight_plan.waypoints))
+        np.testing.assert_allclose(flight_plan.leg_distances, rebuilt.leg_distances)
+        np.testing.assert_allclose(flight_plan.leg_courses, rebuilt.leg_courses)
+        np.testing.assert_allclose(flight_plan.cumulative_distances, rebuilt.cumulative_distances)
+
+    def test_batch_evaluation_matches_single_plans(self):
+        planner = FlightPlanner(self.waypoint_manager)
+        schedule = [
+            ("GMMN", "GMAD", ["GMMX"], 450),
+            ("GMMN", "GMAD", "GMMX GMMI", 420),
+            ("GMMN", "XXXX", None, 450),
+            ("GMMN", "GMAD", ["GMMX", "NOPE"], 450),
+            ("GMMX", "GMMI", [], 0),
+        ]
+        result = evaluate_chunk(self.waypoint_manager, schedule)
+
+        for i, (origin, destination, via, speed) in enumerate(schedule[:2]):
+            flight_plan = planner.create_flight_plan(origin, destination, via.split() if isinstance(via, str) else via)
+            self.assertAlmostEqual(result.distances_km[i], flight_plan.calculate_total_distance())
+            self.assertAlmostEqual(result.ete_hours[i], planner.calculate_estimated_time_en_route(flight_plan, speed))
+        self.assertEqual(result.errors[2:], ["Invalid origin or destination waypoint",
+                                             "Waypoint with code NOPE not found",
+                                             "Average speed must be positive"])
+        self.assertEqual(result.valid.tolist(), [True, True, False, False, False])
+        self.assertTrue(np.isnan(result.ete_hours[2:]).all())
+
+        pooled = BatchPlanner(self.waypoint_manager.database_path, workers=2, chunk_size=2).evaluate(schedule)
+        np.testing.assert_allclose(pooled.distances_km, result.distances_km)
+        self.assertEqual(pooled.errors, result.errors)
+
+        # Every code is unknown to an empty database
+        empty = WaypointManager(os.path.join(os.path.dirname(self.waypoint_manager.database_path), 'empty.json'))
+        empty.remove_waypoint("CAS")
+        self.assertEqual(len(empty.store), 0)
+        result = evaluate_chunk(empty, schedule[:2])
+        self.assertEqual(result.errors, ["Invalid origin or destination waypoint"] * 2)
+        self.assertTrue(np.isnan(result.distances_km).all())
+
+    def test_wind_field_interpolation_and_cache(self):
+        wind_path = os.path.join(os.path.dirname(self.waypoint_manager.database_path), 'winds.npz')
+        altitudes = [10000.0, 30000.0]
+        latitudes = [36.0, 28.0]  # north to south, as in most gridded products
+        longitudes = [-12.0, -2.0]
+        u = np.array([[[0.0, 10.0], [20.0, 30.0]], [[40.0, 50.0], [60.0, 70.0]]])
+        np.savez(wind_path, altitudes_ft=altitudes, latitudes=latitudes, longitudes=longitudes,
+                 u=u, v=np.zeros_like(u))
+
+        wind_field = load_wind_field(wind_path)
+        self.assertIs(load_wind_field(wind_path), wind_field)
+        wind_u, wind_v, _ = wind_field.interpolate([20000.0, 40000.0], [32.0, 36.0], [-7.0, -12.0])
+        np.testing.assert_allclose(wind_u, [35.0, 40.0])
+        np.testing.assert_allclose(wind_v, [0.0, 0.0])
+
+        np.savez(wind_path, altitudes_ft=altitudes, latitudes=latitudes, longitudes=longitudes,
+                 u=u + 5.0, v=np.zeros_like(u), temperature=np.full_like(u, -40.0))
+        os.utime(wind_path, ns=(0, 0))
+        reloaded = load_wind_field(wind_path)
+        self.assertIsNot(reloaded, wind_field)
+        self.assertAlmostEqual(float(reloaded.interpolate(20000.0, 32.0, -7.0)[2]), -40.0)
+
+        # The cache is bounded: loading more files drops the least recently used one
+        for i in range(WIND_CACHE_SIZE):
+            other_path = os.path.join(os.path.dirname(wind_path), f'winds_{i}.npz')
+            np.savez(other_path, altitudes_ft=altitudes, latitudes=latitudes, longitudes=longitudes,
+                     u=u, v=np.zeros_like(u))
+            load_wind_field(other_path)
+        self.assertIsNot(load_wind_field(wind_path), reloaded)
+        self.assertIs(load_wind_field(other_path), load_wind_field(other_path))
+
+    def test_wind_field_wraps_0_360_longitudes(self):
+        # ERA5-style grid: longitudes 0..360, eastward wind equal to the column number times 10 kt
+        wind_path = os.path.join(os.path.dirname(self.waypoint_manager.database_path), 'winds_era5.npz')
+        u = np.broadcast_to(np.array([0.0, 10.0, 20.0, 30.0]), (1, 2, 4))
+        np.savez(wind_path, altitudes_ft=[35000.0], latitudes=[40.0, 20.0], longitudes=[0.0, 90.0, 180.0, 270.0],
+                 u=u, v=np.zeros_like(u), temperature=u - 50.0)
+
+        wind_field = load_wind_field(wind_path)
+        np.testing.assert_array_equal(wind_field.longitudes, [-180.0, -90.0, 0.0, 90.0])
+        wind_u, _, temperature = wind_field.interpolate(35000.0, [30.0, 30.0], [-45.0, 315.0])
+        np.testing.assert_allclose(wind_u, [15.0, 15.0])
+        np.testing.assert_allclose(temperature, [-35.0, -35.0])
+
+        # Positions outside the grid are rejected instead of clamped to its edge
+        with self.assertRaises(ValueError):
+            wind_field.interpolate(35000.0, 45.0, -8.0)
+        with self.assertRaises(ValueError):
+            wind_field.interpolate(35000.0, 30.0, 135.0)
+
+    def test_wind_aware_ete(self):
+        planner = FlightPlanner(self.waypoint_manager)
+        # Southbound route: a northerly wind is a tailwind, a southerly one a headwind
+        flight_plan = planner.create_flight_plan("GMMN", "GMMX")
+        calm = planner.calculate_estimated_time_en_route(flight_plan, 450)
+
+        def uniform_wind(v_knots):
+            grid = np.full((1, 2, 2), v_knots)
+            return WindField([35000.0], [28.0, 36.0], [-12.0, -2.0], np.zeros_like(grid), grid)
+
+        still = planner.calculate_estimated_time_en_route(flight_plan, 450, wind_field=uniform_wind(0.0))
+        tailwind = planner.calculate_estimated_time_en_route(flight_plan, 450, wind_field=uniform_wind(-50.0))
+        headwind = planner.calculate_estimated_time_en_route(flight_plan, 450, wind_field=uniform_wind(50.0))
+        self.assertAlmostEqual(still, calm, places=4)
+        self.assertLess(tailwind, calm)
+        self.assertGreater(headwind, calm)
+        self.assertAlmostEqual(headwind, calm * 450 / 400, delta=calm * 0.01)
+
+    def test_performance_table_interpolation(self):
+        performance = get_aircraft_performance('A320')
+        at_node = performance.at(60000.0, 10000.0, 0.0)
+        self.assertEqual(at_node['tas_cruise_knots'], 341.0)
+        self.assertIs(performance.at(60000.0, 10000.0, 0.0), at_node)
+        # Cached results are shared, so they must not be writable
+        with self.assertRaises(TypeError):
+            at_node['tas_cruise_knots'] = 0.0
+        with self.assertRaises(TypeError):
+            load_performance_tables()['B999'] = performance
+        between = performance.interpolate([55000.0, 60000.0], [10000.0, 15000.0], 0.0)
+        self.assertAlmostEqual(between['climb_rate_fpm'][0], (3088.0 + 2527.0) / 2)
+        self.assertAlmostEqual(between['tas_cruise_knots'][1], (341.0 + 382.0) / 2)
+        with self.assertRaises(ValueError):
+            get_aircraft_performance('B999')
+
+    def test_vertical_profile(self):
+        gmmn, gmmx, gmad = self.waypoint_manager.get_waypoints_by_codes(["GMMN", "GMMX", "GMAD"])
+        flight_plan = FlightPlan(gmmn, gmmx)
+        builder = VerticalProfileBuilder()
+
+        # About 200 km is too short to reach FL370, so the level is capped
+        profile = builder.build(flight_plan, 70000.0, 37000.0)
+        self.assertLess(profile.cruise_altitude_ft, 37000.0)
+        self.assertEqual(profile.cruise_altitude_ft % 1000.0, 0.0)
+        self.assertLessEqual(profile.top_of_climb_km, profile.top_of_descent_km)
+        self.assertAlmostEqual(profile.distances_km[-1], flight_plan.calculate_total_distance())
+        self.assertAlmostEqual(float(profile.altitude_at(profile.top_of_climb_km)), profile.cruise_altitude_ft)
+        self.assertTrue(np.all(np.diff(profile.fuel_kg) >= 0))
+        self.assertIs(builder.build(flight_plan, 70000.0, 37000.0), profile)
+
+        flight_plan.replace_route_point(-1, gmad)
+        longer = builder.build(flight_plan, 70000.0, 37000.0)
+        self.assertIsNot(longer, profile)
+        self.assertGreater(longer.trip_fuel_kg, profile.trip_fuel_kg)
+        self.assertGreater(builder.build(flight_plan, 78000.0, 37000.0).trip_fuel_kg, longer.trip_fuel_kg)
+        # Other weights of the same revision stay cached
+        self.assertIs(builder.build(flight_plan, 70000.0, 37000.0), longer)
+
+    def test_find_route_with_auto_connect(self):
+        planner = FlightPlanner(self.waypoint_manager, max_leg_km=250)
+        flight_plan = planner.find_route("GMMN", "GMAD")
+        self.assertEqual([wp.icao_code for wp in flight_plan.get_flight_route()], ["GMMN", "GMMX", "GMAD"])
+
+        # Direct leg becomes available once the auto-connect radius allows it
+        planner = FlightPlanner(self.waypoint_manager, max_leg_km=500)
+        self.assertEqual(planner.find_route("GMMN", "GMAD").waypoints, ())
+
+    def test_find_route_respects_constraints(self):
+        planner = FlightPlanner(self.waypoint_manager, airways={"A5": ["GMMN", "GMMI", "GMAD"]},
+                                max_leg_km=250)
+        route = planner.find_route("GMMN", "GMAD", RouteConstraints(avoid=["GMMX"])).get_flight_route()
+        self.assertEqual([wp.icao_code for wp in route], ["GMMN", "GMMI", "GMAD"])
+
+        route = planner.find_route("GMMN", "GMAD", RouteConstraints(airways_only=True)).get_flight_route()
+        self.assertEqual([wp.icao_code for wp in route], ["GMMN", "GMMI", "GMAD"])
+
+        with self.assertRaises(ValueError):
+            planner.find_route("GMMN", "GMAD", RouteConstraints(avoid=["GMMX", "GMMI"]))
+
+    def test_route_graph_follows_database_changes(self):
+        planner = FlightPlanner(self.waypoint_manager, max_leg_km=250)
+        self.assertEqual([wp.icao_code for wp in planner.find_route("GMMN", "GMAD").waypoints], ["GMMX"])
+
+        self.waypoint_manager.remove_waypoint("GMMX")
+        with self.assertRaises(ValueError):
+            planner.find_route("GMMN", "GMAD")
+
+
+if __name__ == '__main__':
+    unittest.main()
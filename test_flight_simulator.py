@@ -1,13 +1,28 @@
 import sys
 import os
+import asyncio
+import math
+import pickle
+import tempfile
+import time
 import unittest
+import numpy as np
 
 # Add project root to Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.database.waypoint_manager import WaypointManager
 from src.navigation.flight_planner import FlightPlanner
-from src.simulation.flight_simulator import FlightSimulator
+from src.navigation.trajectory_calculator import TRAJ_DISTANCE
+from src.simulation.autopilot import Autopilot, FleetAutopilot
+from src.simulation.flight_simulator import DEFAULT_TAKEOFF_WEIGHT_KG, FlightSimulator
+from src.simulation.event_scheduler import ARRIVAL, EventScheduler, MODE_CHANGE, TOP_OF_CLIMB, WAYPOINT
+from src.simulation.conflict_detection import ConflictDetector, SeparationMinima
+from src.simulation.ensemble import Dispersions, EnsembleRunner
+from src.simulation.fleet_simulator import FleetSimulator
+from src.simulation.output_sinks import RecordingSink
+from src.simulation.simulation_clock import SimulationClock
+from src.simulation.telemetry import TelemetryReader, TelemetryRecorder
 
 
 class TestFlightSimulator(unittest.TestCase):
@@ -48,6 +63,411 @@ class TestFlightSimulator(unittest.TestCase):
         # Check simulation completion
         self.assertFalse(self.flight_simulator.is_running)
 
+    def test_ticks_follow_precomputed_trajectory(self):
+        simulator = self.flight_simulator
+        self.assertFalse(simulator.trajectory.flags.writeable)
+        simulator.start_simulation()
+        simulator.update_aircraft_state(1.0)
+        state = simulator.update_aircraft_state(10.0)
+
+        self.assertEqual(simulator.cursor, 11)
+        self.assertEqual(state.current_position, tuple(simulator.trajectory[11, :2]))
+        self.assertEqual(state.altitude, simulator.altitudes[11])
+        self.assertAlmostEqual(state.along_track_km, 11 * 450 * 1.852 / 3600)
+
+    def test_seek_and_rewind(self):
+        simulator = self.flight_simulator
+        total = self.flight_plan.calculate_total_distance()
+        state = simulator.seek_distance(total / 2)
+        self.assertLessEqual(state.along_track_km, total / 2)
+        self.assertGreater(state.altitude, 10000)
+        middle = simulator.cursor
+        self.assertEqual(simulator.seek_time(simulator.simulation_time).along_track_km, state.along_track_km)
+
+        simulator.rewind()
+        self.assertEqual(simulator.cursor, 0)
+        self.assertEqual(simulator.current_state.current_position,
+                         (self.flight_plan.origin.latitude, self.flight_plan.origin.longitude))
+        self.assertEqual(simulator.seek(middle).along_track_km, state.along_track_km)
+
+        final = simulator.seek(-1)
+        self.assertAlmostEqual(final.along_track_km, total)
+        self.assertEqual(final.current_position,
+                         (self.flight_plan.destination.latitude, self.flight_plan.destination.longitude))
+
+    def test_headless_run_matches_ticks(self):
+        ticked = RecordingSink()
+        simulator = FlightSimulator(self.flight_plan, sinks=[ticked], verbose=False)
+        simulator.start_simulation()
+        while simulator.is_running:
+            simulator.update_aircraft_state(5.0)
+
+        batched = RecordingSink()
+        headless = FlightSimulator(self.flight_plan, sinks=[batched], verbose=False)
+        headless.run(time_scale=math.inf, time_step=5.0, batch_size=7)
+
+        self.assertFalse(headless.is_running)
+        self.assertEqual(len(batched.records), len(ticked.records))
+        for name in batched.records.dtype.names:
+            np.testing.assert_allclose(batched.records[name], ticked.records[name])
+
+    def test_fractional_time_steps_follow_the_clock(self):
+        for time_step in (0.25, 1.5):
+            ticked = FlightSimulator(self.flight_plan, verbose=False)
+            ticked.start_simulation()
+            for _ in range(100):
+                ticked.update_aircraft_state(time_step)
+            expected = ticked.trajectory[int(100 * time_step), TRAJ_DISTANCE]
+            self.assertAlmostEqual(ticked.simulation_time, 100 * time_step)
+            self.assertAlmostEqual(ticked.current_state.along_track_km, expected)
+
+            batched = FlightSimulator(self.flight_plan, verbose=False)
+            batched.start_simulation()
+            batched.step(100, time_step)
+            self.assertEqual(batched.cursor, ticked.cursor)
+
+    def test_run_until_and_time_scale(self):
+        sink = RecordingSink()
+        simulator = FlightSimulator(self.flight_plan, sinks=[sink], verbose=False)
+        simulator.run(until=600, time_scale=math.inf)
+        self.assertTrue(simulator.is_running)
+        self.assertEqual(simulator.simulation_time, 600)
+        self.assertEqual(len(sink.records), 600)
+
+        state = simulator.step(60, time_step=1.0)
+        self.assertEqual(simulator.cursor, 660)
+        self.assertEqual(state.along_track_km, sink.records['along_track_km'][-1])
+
+        start = time.perf_counter()
+        simulator.run(until=700, time_scale=1000.0, time_step=10.0)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.035)
+        self.assertEqual(simulator.simulation_time, 700)
+
+    def test_fleet_matches_single_simulator(self):
+        fleet = FleetSimulator(capacity=1)
+        reverse_plan = self.flight_planner.create_flight_plan("GMAD", "GMMN")
+        first = fleet.add_aircraft(self.flight_plan)
+        second = fleet.add_aircraft(reverse_plan, ground_speed_knots=300)
+        self.assertEqual(len(fleet), 2)
+
+        self.flight_simulator.start_simulation()
+        for _ in range(30):
+            fleet.step(1.0)
+            expected = self.flight_simulator.update_aircraft_state(1.0)
+
+        view = fleet.state(first)
+        self.assertEqual(view.current_position, expected.current_position)
+        self.assertEqual(view.altitude, expected.altitude)
+        self.assertEqual(view.heading, expected.heading)
+        self.assertAlmostEqual(fleet.state(second).along_track_km, 30 * 300 * 1.852 / 3600)
+
+    def test_fleet_fractional_time_steps_follow_the_clock(self):
+        fleet = FleetSimulator()
+        aircraft = fleet.add_aircraft(self.flight_plan)
+        self.flight_simulator.start_simulation()
+        for _ in range(100):
+            fleet.step(1.5)
+            expected = self.flight_simulator.update_aircraft_state(1.5)
+
+        self.assertEqual(fleet.simulation_time, 150.0)
+        self.assertEqual(fleet.state(aircraft).along_track_km, expected.along_track_km)
+        self.assertEqual(fleet.state(aircraft).current_position, expected.current_position)
+
+    def test_fleet_add_and_remove_mid_run(self):
+        fleet = FleetSimulator(capacity=2)
+        ids = [fleet.add_aircraft(self.flight_plan) for _ in range(3)]
+        fleet.step(60.0)
+        fleet.remove_aircraft(ids[1])
+        late = fleet.add_aircraft(self.flight_plan)
+        fleet.step(60.0)
+
+        self.assertEqual(fleet.state(ids[0]).along_track_km, fleet.state(ids[2]).along_track_km)
+        self.assertAlmostEqual(fleet.state(late).along_track_km, 60 * 450 * 1.852 / 3600)
+        with self.assertRaises(ValueError):
+            fleet.state(ids[1])
+
+        while not fleet.arrived[fleet.slot_of(late)]:
+            fleet.step(600.0)
+        self.assertEqual(sorted(fleet.remove_arrived()), sorted([ids[0], ids[2], late]))
+        self.assertEqual(len(fleet), 0)
+
+    def test_ensemble_is_reproducible(self):
+        serial = EnsembleRunner(self.flight_plan, workers=1, chunk_size=64).run(300, seed=7)
+        pooled = EnsembleRunner(self.flight_plan, workers=2, chunk_size=50).run(300, seed=7)
+        np.testing.assert_array_equal(serial.arrival_times_h, pooled.arrival_times_h)
+        np.testing.assert_array_equal(serial.fuel_kg, pooled.fuel_kg)
+        self.assertFalse(np.array_equal(EnsembleRunner(self.flight_plan, workers=1).run(300, seed=8).fuel_kg,
+                                        serial.fuel_kg))
+
+        low, median, high = serial.arrival_percentiles()
+        self.assertLess(low, median)
+        self.assertLess(median, high)
+
+    def test_ensemble_without_dispersion_matches_profile(self):
+        runner = EnsembleRunner(self.flight_plan, dispersions=Dispersions(0.0, 0.0, 0.0, 0.0), workers=1)
+        result = runner.run(10)
+        profile = runner.vertical_profile
+        np.testing.assert_allclose(result.arrival_times_h, profile.trip_time_h, rtol=0.01)
+        np.testing.assert_allclose(result.fuel_kg, profile.trip_fuel_kg, rtol=0.03)
+
+    def test_ensemble_fuel_follows_weight(self):
+        calm = Dispersions(0.0, 0.0, 0.0, 0.0)
+        nominal = EnsembleRunner(self.flight_plan, dispersions=calm, workers=1).run(1).fuel_kg[0]
+        heavy = EnsembleRunner(self.flight_plan, dispersions=calm, workers=1,
+                               takeoff_weight_kg=DEFAULT_TAKEOFF_WEIGHT_KG * 1.1).run(1).fuel_kg[0]
+        self.assertGreater(heavy, nominal * 1.05)
+
+        # Weight dispersion alone spreads the fuel, not the flight time (beyond the top of climb shift)
+        result = EnsembleRunner(self.flight_plan, dispersions=Dispersions(0.0, 0.0, 0.0, 0.05), workers=1).run(200)
+        self.assertGreater(result.fuel_kg.std() / result.fuel_kg.mean(), 0.02)
+        self.assertLess(result.arrival_times_h.std() / result.arrival_times_h.mean(), 0.01)
+
+    def test_clock_publishes_to_fast_and_slow_subscribers(self):
+        clock = SimulationClock(FlightSimulator(self.flight_plan, verbose=False), time_step=1.0, time_scale=2000.0)
+        fast = clock.subscribe(maxsize=1000)
+        slow = clock.subscribe(maxsize=2)
+
+        async def consume(subscription, delay):
+            received = []
+            async for update in subscription:
+                received.append(update)
+                await asyncio.sleep(delay)
+            return received
+
+        async def main():
+            consumers = asyncio.gather(consume(fast, 0), consume(slow, 0.01))
+            started = time.perf_counter()
+            stats = await clock.run(until=200)
+            return stats, time.perf_counter() - started, await consumers
+
+        stats, elapsed, (fast_updates, slow_updates) = asyncio.run(main())
+        self.assertEqual(stats.ticks, 200)
+        self.assertEqual([u.simulation_time for u in fast_updates], [float(t) for t in range(1, 201)])
+        self.assertEqual(fast.dropped, 0)
+        # The slow consumer loses intermediate states but neither slows the clock nor misses the latest one
+        self.assertGreater(slow.dropped, 0)
+        self.assertEqual(slow_updates[-1], fast_updates[-1])
+        self.assertLess(elapsed, 200 / 2000.0 + 0.5)
+
+    def test_telemetry_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'flight.tlm')
+            recording = RecordingSink()
+            recorder = TelemetryRecorder(path, buffer_records=100)
+            simulator = FlightSimulator(self.flight_plan, sinks=[recording, recorder], verbose=False)
+            simulator.start_simulation()
+            for _ in range(250):
+                simulator.update_aircraft_state()
+            simulator.run(time_scale=math.inf, batch_size=500)
+            self.assertTrue(recorder._file.closed)
+
+            reader = TelemetryReader(path)
+            self.assertEqual(len(reader), len(recording.records))
+            for name in recording.records.dtype.names:
+                np.testing.assert_array_equal(reader[name], recording.records[name])
+            self.assertTrue(np.isnan(reader['target_altitude']).all())
+
+            window = reader.time_range(100, 199)
+            self.assertEqual(len(window), 100)
+            self.assertEqual(window['time'][0], 100)
+            self.assertEqual(reader.index_at(150.5), 149)
+            reader.close()
+
+    def test_autopilot_flies_the_route(self):
+        autopilot = Autopilot(self.flight_plan, verbose=False)
+        simulator = FlightSimulator(self.flight_plan, verbose=False, autopilot=autopilot)
+        simulator.run(time_scale=math.inf)
+
+        self.assertTrue(autopilot.arrived)
+        state = simulator.current_state
+        destination = self.flight_plan.destination
+        self.assertLess(self.flight_planner.trajectory_calculator.great_circle_distance(
+            state.latitude, state.longitude, destination.latitude, destination.longitude), 1.0)
+        self.assertAlmostEqual(state.along_track_km, self.flight_plan.calculate_total_distance(), delta=1.0)
+        self.assertLess(abs(simulator.simulation_time - len(simulator)), 5)
+
+    def test_autopilot_holds_and_sub_steps(self):
+        coarse = Autopilot(self.flight_plan, verbose=False, substep_hz=20)
+        fine = Autopilot(self.flight_plan, verbose=False, substep_hz=50)
+        results = []
+        for autopilot in (coarse, fine):
+            simulator = FlightSimulator(self.flight_plan, verbose=False, autopilot=autopilot)
+            simulator.start_simulation()
+            autopilot.set_heading(90)
+            autopilot.maintain_altitude(5000)
+            autopilot.maintain_speed(300)
+            simulator.run(until=300, time_scale=math.inf)
+            results.append(simulator.current_state)
+
+        for state in results:
+            self.assertAlmostEqual(state.heading, 90, places=3)
+            self.assertAlmostEqual(state.altitude, 5000, delta=1)
+            self.assertAlmostEqual(state.speed, 300, delta=0.1)
+        self.assertAlmostEqual(results[0].latitude, results[1].latitude, places=3)
+        self.assertAlmostEqual(results[0].longitude, results[1].longitude, places=3)
+
+    def test_fleet_autopilot_matches_single_autopilot(self):
+        self.flight_plan.insert_waypoint(0, self.waypoint_manager.get_waypoint_by_code("GMMX"))
+        autopilot = Autopilot(self.flight_plan, verbose=False)
+        simulator = FlightSimulator(self.flight_plan, verbose=False, autopilot=autopilot)
+        simulator.start_simulation()
+        fleet = FleetSimulator(capacity=1)
+        FleetAutopilot(fleet)
+        aircraft_ids = [fleet.add_aircraft(self.flight_plan) for _ in range(3)]
+
+        while simulator.is_running:
+            simulator.update_aircraft_state(1.0)
+            fleet.step(1.0)
+            for aircraft_id in aircraft_ids:
+                view = fleet.state(aircraft_id)
+                self.assertAlmostEqual(view.latitude, simulator.current_state.latitude, places=6)
+                self.assertAlmostEqual(view.longitude, simulator.current_state.longitude, places=6)
+        self.assertEqual(sorted(fleet.remove_arrived()), aircraft_ids)
+
+    def test_fleet_autopilot_keeps_fixes_of_arrived_aircraft(self):
+        fleet = FleetSimulator()
+        autopilot = FleetAutopilot(fleet)
+        arrived, *others = [fleet.add_aircraft(self.flight_plan) for _ in range(3)]
+        slot = fleet.slot_of(arrived)
+        fixes = autopilot._fixes[:, autopilot.fix_offsets[slot]:][:, :autopilot.fix_lengths[slot]].copy()
+        autopilot.engaged[slot] = False  # as on arrival
+
+        # Removing the other two compacts the buffer; the arrived aircraft's fixes survive it
+        for aircraft_id in others:
+            fleet.remove_aircraft(aircraft_id)
+        self.assertEqual(autopilot._fix_used, fixes.shape[1])
+        self.assertEqual(autopilot._fix_garbage, 0)
+        offset = autopilot.fix_offsets[slot]
+        np.testing.assert_array_equal(autopilot._fixes[:, offset:offset + fixes.shape[1]], fixes)
+
+        # ... and are counted as garbage exactly once when it is removed
+        fleet.remove_aircraft(arrived)
+        self.assertEqual(autopilot._fix_used, 0)
+
+    def test_snapshot_restore_and_fork(self):
+        autopilot = Autopilot(self.flight_plan, verbose=False)
+        simulator = FlightSimulator(self.flight_plan, verbose=False, autopilot=autopilot)
+        simulator.run(until=600, time_scale=math.inf)
+        snapshot = pickle.loads(pickle.dumps(simulator.snapshot()))
+
+        simulator.run(until=900, time_scale=math.inf)
+        expected = simulator.snapshot()
+        simulator.restore(snapshot)
+        self.assertEqual(simulator.simulation_time, 600)
+        simulator.run(until=900, time_scale=math.inf)
+        self.assertEqual(simulator.snapshot(), expected)
+
+        branch = simulator.fork(snapshot)
+        self.assertIs(branch.trajectory, simulator.trajectory)
+        self.assertIsNot(branch.autopilot, autopilot)
+        branch.autopilot.maintain_altitude(20000)
+        branch.run(until=900, time_scale=math.inf)
+        self.assertLess(branch.current_state.altitude, simulator.current_state.altitude)
+        self.assertEqual(simulator.snapshot(), expected)
+
+    def test_event_scheduler_skips_between_events(self):
+        self.flight_plan.insert_waypoint(0, self.waypoint_manager.get_waypoint_by_code("GMMX"))
+        simulator = FlightSimulator(self.flight_plan, verbose=False)
+        with self.assertRaises(ValueError):
+            EventScheduler(simulator)
+        simulator.start_simulation()
+        scheduler = EventScheduler(simulator)
+        seen = []
+        for kind in (WAYPOINT, TOP_OF_CLIMB, MODE_CHANGE, ARRIVAL):
+            scheduler.on(kind, lambda event, sim: seen.append((event.kind, sim.simulation_time, sim.current_state.altitude)))
+        scheduler.schedule(1000, MODE_CHANGE, 'ALT')
+        dense = RecordingSink()
+        scheduler.add_consumer(dense, time_step=60.0)
+
+        final = scheduler.run()
+        self.assertFalse(simulator.is_running)
+        self.assertEqual(scheduler.events_processed, 5)
+        self.assertEqual([kind for kind, _, _ in seen], [WAYPOINT, TOP_OF_CLIMB, MODE_CHANGE, ARRIVAL])
+        self.assertEqual([time for _, time, _ in seen], sorted(time for _, time, _ in seen))
+        self.assertAlmostEqual(seen[1][2], simulator.vertical_profile.cruise_altitude_ft, delta=50)
+        self.assertEqual(final.current_position,
+                         (self.flight_plan.destination.latitude, self.flight_plan.destination.longitude))
+
+        with self.assertRaises(ValueError):
+            scheduler.run()
+
+        ticked = RecordingSink()
+        FlightSimulator(self.flight_plan, sinks=[ticked], verbose=False).run(time_scale=math.inf, time_step=60.0)
+        count = len(dense.records)
+        self.assertEqual(count, len(ticked.records) - 1)
+        for name in dense.records.dtype.names:
+            np.testing.assert_allclose(dense.records[name], ticked.records[name][:count])
+
+    def test_event_scheduler_keeps_a_restored_simulator_in_place(self):
+        source = FlightSimulator(self.flight_plan, verbose=False)
+        source.seek_time(600.0)
+        # Seeked but never started: running it would rewind to 0
+        with self.assertRaises(ValueError):
+            EventScheduler(source)
+        source.start_simulation()
+        source.seek_time(600.0)
+
+        simulator = FlightSimulator(self.flight_plan, verbose=False)
+        simulator.restore(source.snapshot())
+        scheduler = EventScheduler(simulator)
+        times = []
+        scheduler.on(ARRIVAL, lambda event, sim: times.append(sim.simulation_time))
+        scheduler.run(until=900.0)
+        self.assertEqual(simulator.simulation_time, 900.0)
+        self.assertEqual(simulator.cursor, int(900.0 / simulator.sample_interval_s))
+        scheduler.run()
+        self.assertEqual(times, [(len(simulator) - 1) * simulator.sample_interval_s])
+
+    def test_conflict_detection(self):
+        # Head-on at the same level, 20 NM apart and closing at 900 kt: 5 NM is reached after 60 s
+        east = -8.0 + 20 * 1.852 / 111.195 / math.cos(math.radians(30))
+        detector = ConflictDetector(SeparationMinima(5.0, 1000.0), lookahead_s=120.0)
+        conflicts = detector.detect([30.0, 30.0, 30.0], [-8.0, east, -8.0], [35000, 35000, 37000],
+                                    [450, 450, 450], [90, 270, 90], aircraft_ids=[7, 8, 9])
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual((conflicts['aircraft_a'][0], conflicts['aircraft_b'][0]), (7, 8))
+        self.assertAlmostEqual(conflicts['time_to_loss_s'][0], 60.0, delta=0.5)
+        self.assertAlmostEqual(conflicts['horizontal_nm'][0], 5.0, places=3)
+        self.assertEqual(len(ConflictDetector(lookahead_s=30.0).detect(
+            [30.0, 30.0], [-8.0, east], [35000, 35000], [450, 450], [90, 270])), 0)
+
+    def test_fleet_conflict_detection_uses_vertical_speeds(self):
+        # A levels off at 6000 ft; B follows 3.75 NM behind, climbing through 4500 ft at about 3500 ft/min
+        fleet = FleetSimulator()
+        low = fleet.profile_builder.build(self.flight_plan, DEFAULT_TAKEOFF_WEIGHT_KG, 6000.0)
+        level = fleet.add_aircraft(self.flight_plan, vertical_profile=low)
+        fleet.step(30.0)
+        climbing = fleet.add_aircraft(self.flight_plan)
+        fleet.step(30.0)
+        fleet.step(30.0)
+        self.assertGreater(fleet.state(level).altitude - fleet.state(climbing).altitude, 1000.0)
+
+        detector = ConflictDetector(lookahead_s=60.0)
+        conflicts = detector.detect_fleet(fleet)
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual((conflicts['aircraft_a'][0], conflicts['aircraft_b'][0]), (level, climbing))
+        self.assertGreater(conflicts['time_to_loss_s'][0], 0.0)
+        # Extrapolated level, the two aircraft stay more than 1000 ft apart
+        slots = np.flatnonzero(fleet.active)
+        self.assertEqual(len(detector.detect(fleet.latitudes[slots], fleet.longitudes[slots],
+                                             fleet.altitudes[slots], fleet.speeds[slots], fleet.headings[slots])), 0)
+
+    def test_conflict_detection_matches_all_pairs(self):
+        rng = np.random.default_rng(3)
+        n = 400
+        traffic = (rng.uniform(29, 32, n), rng.uniform(-10, -7, n), rng.uniform(30000, 36000, n),
+                   rng.uniform(250, 480, n), rng.uniform(0, 360, n), rng.choice([0.0, 1500.0, -1500.0], n))
+        detector = ConflictDetector(lookahead_s=300.0)
+        found = detector.detect(*traffic)
+        self.assertLess(len(detector.candidate_pairs(*traffic)), n * (n - 1) // 20)
+
+        all_pairs = np.column_stack(np.triu_indices(n, 1))
+        detector.candidate_pairs = lambda *args: all_pairs
+        expected = detector.detect(*traffic)
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(set(map(tuple, found[['aircraft_a', 'aircraft_b']].tolist())),
+                         set(map(tuple, expected[['aircraft_a', 'aircraft_b']].tolist())))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,124 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from src.gui.map_display import MapDisplay
+except ImportError:  # matplotlib or tkinter missing
+    MapDisplay = None
+
+
+class FakeMaster:
+    """Records after() calls instead of running a Tk event loop."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay_ms, callback):
+        self.scheduled.append((delay_ms, callback))
+
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for _, callback in scheduled:
+            callback()
+
+
+class FakeCanvas:
+    supports_blit = True
+
+    def __init__(self):
+        self.calls = []
+        self.handlers = {}
+
+    def mpl_connect(self, event, handler):
+        self.handlers[event] = handler
+
+    def restore_region(self, background):
+        self.calls.append('restore_region')
+
+    def blit(self, bbox):
+        self.calls.append('blit')
+
+    def draw_idle(self):
+        self.calls.append('draw_idle')
+
+
+class FakeArtist:
+    def __init__(self):
+        self.data = None
+
+    def set_data(self, x, y):
+        self.data = (np.asarray(x), np.asarray(y))
+
+
+class FakeAxes:
+    bbox = None
+
+    def __init__(self):
+        self.drawn = []
+
+    def plot(self, *args, **kwargs):
+        return [FakeArtist()]
+
+    def draw_artist(self, artist):
+        self.drawn.append(artist)
+
+
+@unittest.skipIf(MapDisplay is None, "matplotlib and tkinter are required")
+class TestMapDisplay(unittest.TestCase):
+    def make_display(self, trail_length=500, max_fps=30.0):
+        # Only the overlay, built by the constructor's own helper, without a figure or a Tk window
+        display = MapDisplay.__new__(MapDisplay)
+        display.master = FakeMaster()
+        display.canvas = FakeCanvas()
+        display.ax = FakeAxes()
+        display._create_overlay(max_fps, trail_length)
+        self.assertIn('draw_event', display.canvas.handlers)
+        display._background = 'map'  # as after the first full draw
+        return display
+
+    def test_trail_ring_order(self):
+        display = self.make_display(trail_length=3)
+        display._append_trail(30.0, -8.0)
+        display._append_trail(31.0, -7.0)
+        np.testing.assert_array_equal(display._trail_data(), [[-8.0, -7.0], [30.0, 31.0]])
+
+        # Once full, the oldest points are overwritten and the rest stay in time order
+        for i in range(2, 5):
+            display._append_trail(30.0 + i, -8.0 + i)
+        np.testing.assert_array_equal(display._trail_data(), [[-6.0, -5.0, -4.0], [32.0, 33.0, 34.0]])
+
+        display.clear_trail()
+        self.assertEqual(display._trail_data().shape, (2, 0))
+
+    def test_updates_coalesce_into_one_frame(self):
+        display = self.make_display()
+        for i in range(10):
+            display.update_aircraft_position((30.0 + i * 0.01, -8.0))
+        self.assertEqual(len(display.master.scheduled), 1)
+        self.assertEqual(display.canvas.calls, [])
+
+        display.master.run_pending()
+        self.assertEqual(display.canvas.calls, ['restore_region', 'blit'])
+        self.assertEqual(display.ax.drawn, [display.trail_line, display.aircraft_markers])
+        self.assertEqual(len(display.trail_line.data[0]), 10)
+        np.testing.assert_array_equal(display.aircraft_markers.data, [[-8.0], [30.09]])
+
+        # The next update schedules a new frame
+        display.update_aircraft_positions([30.0, 31.0], [-8.0, -7.0], tracked=1)
+        self.assertEqual(len(display.master.scheduled), 1)
+
+    def test_frame_without_cached_map_is_a_full_draw(self):
+        display = self.make_display()
+        display._background = None
+        display.update_aircraft_position((30.0, -8.0))
+        display.master.run_pending()
+        self.assertEqual(display.canvas.calls, ['draw_idle'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import sys
+import os
+import unittest
+import shutil
+import tempfile
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database.waypoint_manager import WaypointManager
+from src.database.navdata_importer import NavdataImporter, decode_arinc_coordinates
+
+
+def arinc_record(section, subsection, ident, latitude, longitude, name, elevation=None):
+    """Build a 132-column ARINC 424 record with the fields used by the importer."""
+    line = [' '] * 132
+
+    def put(column, text):
+        line[column - 1:column - 1 + len(text)] = text
+
+    put(1, 'S')
+    put(2, 'AFR')
+    put(5, section)
+    if section == 'P':
+        put(7, ident)
+        put(13, subsection)
+    else:
+        put(6, subsection)
+        put(14, ident)
+    put(33, latitude)
+    put(42, longitude)
+    put(99 if section == 'E' else 94, name)
+    if elevation is not None:
+        put(57 if section == 'P' else 80, elevation)
+    return ''.join(line)
+
+
+class TestNavdataImporter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.waypoint_manager = WaypointManager(os.path.join(self.temp_dir, 'waypoints.json'))
+        self.importer = NavdataImporter(self.waypoint_manager, chunk_size=2)
+
+    def _write(self, name, text):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_decode_arinc_coordinates(self):
+        latitudes = decode_arinc_coordinates(['N33215400', 'S33215400', 'N3321540X', 'N33615400'], 2)
+        self.assertAlmostEqual(latitudes[0], 33.365)
+        self.assertAlmostEqual(latitudes[1], -33.365)
+        self.assertTrue(all(lat != lat for lat in latitudes[2:]))
+        self.assertAlmostEqual(decode_arinc_coordinates(['W007345300'], 3)[0], -7.581389, places=5)
+
+    def test_import_csv(self):
+        path = self._write('fixes.csv', "\n".join([
+            "icao_code,name,latitude,longitude,type",
+            "GMFF,Fes Saiss Airport,33.9273,-4.9780,airport",
+            "CAS,Casablanca VOR,33.365,-7.586,VOR",
+            "ALGER,Algiers,36.69,3.21,airport",
+            "BAD,Broken,north,-5.0,fix",
+            "GMTT,Tangier Airport,35.7269,-5.9169,airport",
+            "GMTT,Tangier Airport,35.7269,-5.9169,airport",
+        ]) + "\n")
+
+        report = self.importer.import_csv(path)
+
+        self.assertEqual(report.accepted, 2)
+        self.assertEqual(report.duplicates, 2)
+        self.assertEqual(report.rejected_count, 2)
+        self.assertEqual([(row.line_number, row.reason) for row in report.rejected],
+                         [(4, "outside Morocco"), (5, "invalid coordinates")])
+        self.assertEqual(self.waypoint_manager.get_waypoint_by_code("GMFF").type, "airport")
+
+    def test_import_arinc424(self):
+        path = self._write('navdata.pc', "\n".join([
+            arinc_record('P', 'A', 'GMME', 'N34030300', 'W006450600', 'RABAT SALE', '00276'),
+            arinc_record('D', ' ', 'RBT', 'N34023000', 'W006450000', 'RABAT VOR'),
+            arinc_record('E', 'A', 'ABBOX', 'N35000000', 'W005000000', 'ABBOX'),
+            arinc_record('H', 'C', 'IGNOR', 'N35000000', 'W005000000', 'HELIPORT'),
+        ]) + "\n")
+
+        report = self.importer.import_arinc424(path)
+
+        self.assertEqual(report.accepted, 3)
+        self.assertEqual(report.rejected_count, 0)
+        airport = self.waypoint_manager.get_waypoint_by_code("GMME")
+        self.assertEqual(airport.name, "RABAT SALE")
+        self.assertAlmostEqual(airport.latitude, 34.050833, places=5)
+        self.assertAlmostEqual(airport.elevation, 276 * 0.3048)
+        self.assertEqual(self.waypoint_manager.get_waypoint_by_code("RBT").type, "VOR")
+        self.assertIsNone(self.waypoint_manager.get_waypoint_by_code("IGNOR"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,13 @@ import sys
 import os
 import unittest
 import math
+import numpy as np
 
 # Add project root to Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.navigation.trajectory_calculator import TrajectoryCalculator
+from src.navigation.trajectory_calculator import (TrajectoryCalculator, TRAJ_LAT, TRAJ_LON,
+                                                  TRAJ_DISTANCE, TRAJ_COURSE)
 from src.database.waypoint_manager import Waypoint
 
 
@@ -32,8 +34,8 @@ class TestTrajectoryCalculator(unittest.TestCase):
         distance = self.trajectory_calculator.calculate_great_circle_distance(
             self.casablanca, self.agadir
         )
-        # Expected distance is approximately 460-470 km
-        self.assertAlmostEqual(distance, 465, delta=20)
+        # Expected distance is approximately 375-385 km
+        self.assertAlmostEqual(distance, 380, delta=5)
 
     def test_trajectory_calculation(self):
         trajectory = self.trajectory_calculator.calculate_trajectory([self.casablanca, self.agadir])
@@ -51,6 +53,67 @@ class TestTrajectoryCalculator(unittest.TestCase):
         # Bearing should be between 0 and 360 degrees
         self.assertTrue(0 <= bearing <= 360)
 
+    def test_vectorized_kernels_match_scalar_paths(self):
+        lats = np.array([33.3675, 30.3753, 31.6069])
+        lons = np.array([-7.5898, -9.5478, -8.0364])
+
+        legs = self.trajectory_calculator.leg_distances(lats, lons)
+        courses = self.trajectory_calculator.leg_courses(lats, lons)
+        for i in range(2):
+            self.assertAlmostEqual(legs[i], self.trajectory_calculator.great_circle_distance(
+                lats[i], lons[i], lats[i + 1], lons[i + 1]))
+            self.assertAlmostEqual(courses[i], self.trajectory_calculator.initial_bearing(
+                lats[i], lons[i], lats[i + 1], lons[i + 1]))
+
+        matrix = self.trajectory_calculator.distance_matrix(lats, lons, lats[:2], lons[:2])
+        self.assertEqual(matrix.shape, (3, 2))
+        self.assertAlmostEqual(matrix[0, 1], legs[0])
+        self.assertAlmostEqual(matrix[1, 1], 0.0)
+
+    def test_destination_point_round_trip(self):
+        bearing = self.trajectory_calculator.calculate_bearing(self.casablanca, self.agadir)
+        distance = self.trajectory_calculator.calculate_great_circle_distance(self.casablanca, self.agadir)
+        lat, lon = self.trajectory_calculator.destination_points(
+            self.casablanca.latitude, self.casablanca.longitude, bearing, distance)
+        self.assertAlmostEqual(float(lat), self.agadir.latitude, places=6)
+        self.assertAlmostEqual(float(lon), self.agadir.longitude, places=6)
+
+        # Final bearing on a meridian equals the initial one
+        self.assertAlmostEqual(float(self.trajectory_calculator.final_bearings(30.0, -8.0, 33.0, -8.0)), 0.0)
+
+    def test_great_circle_trajectory(self):
+        marrakech = Waypoint(name="Marrakech Menara Airport", icao_code="GMMX",
+                             latitude=31.6069, longitude=-8.0364, type="airport")
+        route = [self.casablanca, self.agadir, marrakech]
+        trajectory = self.trajectory_calculator.calculate_great_circle_trajectory(route, spacing_km=10)
+
+        self.assertEqual(trajectory.ndim, 2)
+        self.assertEqual(trajectory.shape[1], 4)
+        self.assertEqual(tuple(trajectory[0, [TRAJ_LAT, TRAJ_LON]]),
+                         (self.casablanca.latitude, self.casablanca.longitude))
+        self.assertAlmostEqual(trajectory[-1, TRAJ_LAT], marrakech.latitude)
+        self.assertAlmostEqual(trajectory[-1, TRAJ_LON], marrakech.longitude)
+
+        # Samples are no further apart than the spacing and the distance column matches the geometry
+        steps = self.trajectory_calculator.leg_distances(trajectory[:, TRAJ_LAT], trajectory[:, TRAJ_LON])
+        self.assertLessEqual(steps.max(), 10 + 1e-6)
+        np.testing.assert_allclose(np.cumsum(steps), trajectory[1:, TRAJ_DISTANCE], atol=1e-6)
+        self.assertAlmostEqual(trajectory[-1, TRAJ_DISTANCE],
+                               self.trajectory_calculator.calculate_route_distance(route))
+
+        # The Agadir waypoint is sampled exactly, once
+        at_agadir = np.isclose(trajectory[:, TRAJ_LAT], self.agadir.latitude) & \
+            np.isclose(trajectory[:, TRAJ_LON], self.agadir.longitude)
+        self.assertEqual(np.count_nonzero(at_agadir), 1)
+        self.assertAlmostEqual(trajectory[0, TRAJ_COURSE],
+                               self.trajectory_calculator.calculate_bearing(self.casablanca, self.agadir))
+
+    def test_great_circle_trajectory_time_step(self):
+        trajectory = self.trajectory_calculator.calculate_great_circle_trajectory(
+            [self.casablanca, self.agadir], time_step_s=60, ground_speed_knots=450, include_waypoints=False)
+        spacing = np.diff(trajectory[:-1, TRAJ_DISTANCE])
+        np.testing.assert_allclose(spacing, 450 * 1.852 / 60)
+
 
 if __name__ == '_main_':
     unittest.main()
@@ -1,11 +1,14 @@
 import sys
 import os
 import unittest
+import shutil
+import tempfile
 
 # Add project root to Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.database.waypoint_manager import WaypointManager, Waypoint
+from src.database.navdata_compiler import CompiledNavdata, compile_navdata, compiled_path_for
 
 
 class TestWaypointManager(unittest.TestCase):
@@ -48,6 +51,187 @@ class TestWaypointManager(unittest.TestCase):
         )
         self.assertFalse(self.waypoint_manager.add_waypoint(duplicate_waypoint))
 
+    def test_get_waypoints_by_codes(self):
+        waypoints = self.waypoint_manager.get_waypoints_by_codes(["GMMN", "UNKNOWN", "GMAD"])
+        self.assertEqual(waypoints[0].icao_code, "GMMN")
+        self.assertIsNone(waypoints[1])
+        self.assertEqual(waypoints[2].icao_code, "GMAD")
+
+    def test_indexes_follow_add_and_remove(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        manager = WaypointManager(os.path.join(temp_dir, 'waypoints.json'))
+        ifrane = Waypoint(
+            name="Ifrane  Airport",
+            icao_code="GMFI",
+            latitude=33.5053,
+            longitude=-5.1528,
+            type="airport"
+        )
+        self.assertTrue(manager.add_waypoint(ifrane))
+        self.assertEqual(manager.get_waypoint_by_code("GMFI"), ifrane)
+        self.assertIn(ifrane, manager.get_waypoints_by_type("airport"))
+        self.assertEqual(manager.find_waypoints_by_name("ifrane airport"), [ifrane])
+
+        self.assertTrue(manager.remove_waypoint("GMFI"))
+        self.assertFalse(manager.remove_waypoint("GMFI"))
+        self.assertIsNone(manager.get_waypoint_by_code("GMFI"))
+        self.assertEqual(manager.get_waypoints_by_type("airport"), [])
+        self.assertEqual(manager.find_waypoints_by_name("Ifrane Airport"), [])
+        self.assertNotIn(ifrane, manager.waypoints)
+
+
+    def test_nearest_waypoint(self):
+        nearest = self.waypoint_manager.nearest(33.36, -7.58, k=1, type="VOR")
+        self.assertEqual(len(nearest), 1)
+        waypoint, distance = nearest[0]
+        self.assertEqual(waypoint.icao_code, "CAS")
+        self.assertLess(distance, 2)
+
+    def test_within_radius(self):
+        # Casablanca to Agadir is roughly 380 km
+        codes = [wp.icao_code for wp, _ in self.waypoint_manager.within_radius(33.3675, -7.5898, 100)]
+        self.assertIn("GMMN", codes)
+        self.assertNotIn("GMAD", codes)
+
+        results = self.waypoint_manager.within_radius(33.3675, -7.5898, 500)
+        distances = [distance for _, distance in results]
+        self.assertEqual(distances, sorted(distances))
+        self.assertIn("GMAD", [wp.icao_code for wp, _ in results])
+
+    def _temp_database(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        return os.path.join(temp_dir, 'waypoints.json')
+
+    def _sample_waypoints(self):
+        return [
+            Waypoint(name="Fes Saiss Airport", icao_code="GMFF", latitude=33.9273, longitude=-4.9780, type="airport"),
+            Waypoint(name="Oujda Angads Airport", icao_code="GMFO", latitude=34.7872, longitude=-1.9240, type="airport"),
+            Waypoint(name="Tangier Ibn Battouta Airport", icao_code="GMTT", latitude=35.7269, longitude=-5.9169,
+                     type="airport"),
+        ]
+
+    def test_journal_replayed_on_reload(self):
+        database_path = self._temp_database()
+        manager = WaypointManager(database_path)
+        self.assertEqual(manager.add_waypoints(self._sample_waypoints()), 3)
+        self.assertTrue(manager.remove_waypoint("GMFO"))
+        self.assertTrue(os.path.exists(manager.journal_path))
+
+        reloaded = WaypointManager(database_path)
+        self.assertIsNotNone(reloaded.get_waypoint_by_code("GMFF"))
+        self.assertIsNone(reloaded.get_waypoint_by_code("GMFO"))
+        self.assertEqual(len(reloaded.waypoints), len(manager.waypoints))
+
+    def test_torn_journal_tail_is_cut_before_new_appends(self):
+        database_path = self._temp_database()
+        manager = WaypointManager(database_path)
+        manager.add_waypoints(self._sample_waypoints()[:1])
+        with open(manager.journal_path, 'a') as f:
+            f.write('{"op": "add", "waypoi')
+
+        reloaded = WaypointManager(database_path)
+        self.assertTrue(reloaded.add_waypoint(self._sample_waypoints()[1]))
+
+        again = WaypointManager(database_path)
+        self.assertIsNotNone(again.get_waypoint_by_code("GMFF"))
+        self.assertIsNotNone(again.get_waypoint_by_code("GMFO"))
+        with open(manager.journal_path) as f:
+            self.assertEqual(len(f.read().splitlines()), 2)
+
+    def test_add_waypoints_is_all_or_nothing(self):
+        manager = WaypointManager(self._temp_database())
+        batch = self._sample_waypoints() + [
+            Waypoint(name="Invalid", icao_code="INVALID", latitude=0, longitude=0, type="fix")
+        ]
+        with self.assertRaises(ValueError):
+            manager.add_waypoints(batch)
+        self.assertIsNone(manager.get_waypoint_by_code("GMFF"))
+        self.assertFalse(os.path.exists(manager.journal_path))
+
+        # Duplicates inside the batch or already stored are skipped
+        self.assertEqual(manager.add_waypoints(self._sample_waypoints() * 2), 3)
+
+    def test_compaction_folds_journal_into_base_file(self):
+        database_path = self._temp_database()
+        manager = WaypointManager(database_path, compaction_threshold=2)
+        manager.add_waypoints(self._sample_waypoints()[:1])
+        self.assertTrue(os.path.exists(manager.journal_path))
+        manager.add_waypoints(self._sample_waypoints()[1:])
+        self.assertFalse(os.path.exists(manager.journal_path))
+
+        with open(database_path) as f:
+            self.assertIn("GMTT", f.read())
+        self.assertIsNotNone(WaypointManager(database_path).get_waypoint_by_code("GMTT"))
+
+    def test_columnar_store(self):
+        manager = WaypointManager(self._temp_database())
+        manager.add_waypoints(self._sample_waypoints())
+        store = manager.store
+
+        # Coordinate columns are views over the store, not copies
+        self.assertIs(store.latitudes.base, store._lat)
+        rows = manager.get_rows_by_codes(["GMTT", "UNKNOWN", "CAS"])
+        self.assertEqual(rows[1], -1)
+        self.assertAlmostEqual(store.latitudes[rows[0]], 35.7269)
+        self.assertAlmostEqual(store.longitudes[rows[2]], -7.586)
+
+        # Removing a middle row moves the last one into its slot
+        self.assertTrue(manager.remove_waypoint("GMFF"))
+        self.assertEqual(manager.get_waypoint_by_code("GMTT").latitude, 35.7269)
+        self.assertEqual(sorted(wp.icao_code for wp in manager.waypoints), ["CAS", "GMFO", "GMTT"])
+        self.assertFalse(hasattr(store[0], '__dict__'))
+
+    def test_compiled_navdata_is_opened_lazily(self):
+        database_path = self._temp_database()
+        WaypointManager(database_path).add_waypoints(self._sample_waypoints())
+        compile_navdata(database_path)
+
+        manager = WaypointManager(database_path)
+        self.assertTrue(manager.store.is_compiled)
+        self.assertEqual(manager.get_waypoint_by_code("GMFO").name, "Oujda Angads Airport")
+        self.assertIsNone(manager.get_waypoint_by_code("UNKNOWN"))
+        self.assertEqual(len(manager.get_waypoints_by_type("airport")), 3)
+        self.assertEqual(manager.nearest(35.7, -5.9)[0][0].icao_code, "GMTT")
+
+        # The first mutation copies the mapped columns, unmaps the file and makes the binary stale
+        navdata = manager._compiled
+        self.assertTrue(manager.remove_waypoint("GMFF"))
+        self.assertFalse(manager.store.is_compiled)
+        self.assertTrue(navdata.closed)
+        self.assertIsNone(manager._compiled)
+        reloaded = WaypointManager(database_path)
+        self.assertFalse(reloaded.store.is_compiled)
+        self.assertIsNone(reloaded.get_waypoint_by_code("GMFF"))
+
+    def test_compiled_navdata_closes(self):
+        database_path = self._temp_database()
+        WaypointManager(database_path).add_waypoints(self._sample_waypoints())
+        with CompiledNavdata(compile_navdata(database_path)) as navdata:
+            self.assertTrue(navdata.is_fresh_for(database_path))
+            self.assertEqual(navdata.code_at(navdata.row_of("GMTT")), "GMTT")
+        self.assertTrue(navdata.closed)
+        navdata.close()
+
+        # A pending journal (at the path WaypointManager writes it) makes the file stale
+        WaypointManager(database_path, use_compiled=False).remove_waypoint("GMFF")
+        with CompiledNavdata(compiled_path_for(database_path)) as navdata:
+            self.assertFalse(navdata.is_fresh_for(database_path))
+
+    def test_boundary_rejects_neighbouring_countries(self):
+        # All of these fall inside the old lat/lon bounding box
+        for name, latitude, longitude in [("Tlemcen", 34.88, -1.32), ("Bechar", 31.62, -2.22),
+                                          ("Tindouf", 27.67, -8.15), ("Atlantic", 33.0, -10.0)]:
+            waypoint = Waypoint(name=name, icao_code=name.upper(), latitude=latitude, longitude=longitude,
+                                type="fix")
+            with self.assertRaises(ValueError):
+                self.waypoint_manager.add_waypoint(waypoint)
+
+    def test_in_morocco_mask(self):
+        mask = self.waypoint_manager.in_morocco_mask([33.3675, 30.3753, 23.72, 34.88, float('nan')],
+                                                     [-7.5898, -9.5478, -15.93, -1.32, -7.0])
+        self.assertEqual(mask.tolist(), [True, True, True, False, False])
 
 if __name__ == '_main_':
     unittest.main()
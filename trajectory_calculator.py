@@ -1,30 +1,133 @@
+import math
 import numpy as np
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
 from src.database.waypoint_manager import Waypoint
 
+# Mean Earth radius in kilometers
+EARTH_RADIUS_KM = 6371.0
+KNOTS_TO_KMH = 1.852
+
+# Columns of the arrays returned by calculate_great_circle_trajectory
+TRAJ_LAT = 0
+TRAJ_LON = 1
+TRAJ_DISTANCE = 2   # cumulative along-track distance, km
+TRAJ_COURSE = 3     # great-circle course at the point, degrees
+
 
 class TrajectoryCalculator:
+    # ------------------------------------------------------------------
+    # Scalar fast paths (plain math, no NumPy dispatch overhead)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def great_circle_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        """Haversine distance in kilometers between two positions given in degrees."""
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        sin_dlat = math.sin((phi2 - phi1) / 2)
+        sin_dlon = math.sin(math.radians(lon2 - lon1) / 2)
+        a = sin_dlat * sin_dlat + math.cos(phi1) * math.cos(phi2) * sin_dlon * sin_dlon
+        return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+    @staticmethod
+    def initial_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        """Initial great-circle bearing in degrees [0, 360) between two positions."""
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        dlon = math.radians(lon2 - lon1)
+        y = math.sin(dlon) * math.cos(phi2)
+        x = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(dlon)
+        return math.degrees(math.atan2(y, x)) % 360.0
+
     @staticmethod
     def calculate_great_circle_distance(wp1: Waypoint, wp2: Waypoint) -> float:
         """
         Calculate great-circle distance between two waypoints.
         Returns distance in kilometers.
         """
-        # Earth's radius in kilometers
-        R = 6371.0
+        return TrajectoryCalculator.great_circle_distance(wp1.latitude, wp1.longitude,
+                                                          wp2.latitude, wp2.longitude)
 
-        # Convert latitude and longitude to radians
-        lat1, lon1 = np.radians(wp1.latitude), np.radians(wp1.longitude)
-        lat2, lon2 = np.radians(wp2.latitude), np.radians(wp2.longitude)
+    # ------------------------------------------------------------------
+    # Vectorized kernels: array in, array out (degrees and kilometers)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def route_arrays(waypoints: Sequence[Waypoint]) -> Tuple[np.ndarray, np.ndarray]:
+        """Latitude and longitude arrays of a list of waypoints."""
+        lats = np.fromiter((wp.latitude for wp in waypoints), dtype=float, count=len(waypoints))
+        lons = np.fromiter((wp.longitude for wp in waypoints), dtype=float, count=len(waypoints))
+        return lats, lons
 
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
+    @staticmethod
+    def haversine_distances(lat1, lon1, lat2, lon2) -> np.ndarray:
+        """Element-wise (broadcasting) great-circle distances in kilometers."""
+        phi1, phi2 = np.radians(lat1), np.radians(lat2)
+        sin_dlat = np.sin((phi2 - phi1) / 2)
+        sin_dlon = np.sin(np.radians(np.subtract(lon2, lon1)) / 2)
+        a = sin_dlat ** 2 + np.cos(phi1) * np.cos(phi2) * sin_dlon ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
 
-        a = np.sin(dlat / 2) * 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) * 2
-        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    @staticmethod
+    def leg_distances(latitudes, longitudes) -> np.ndarray:
+        """Distances in kilometers of the N-1 consecutive legs of an N-point route."""
+        lats = np.asarray(latitudes, dtype=float)
+        lons = np.asarray(longitudes, dtype=float)
+        return TrajectoryCalculator.haversine_distances(lats[:-1], lons[:-1], lats[1:], lons[1:])
+
+    @staticmethod
+    def distance_matrix(lats_a, lons_a, lats_b, lons_b) -> np.ndarray:
+        """N x M matrix of great-circle distances (km) from points A to points B."""
+        lats_a = np.asarray(lats_a, dtype=float)[:, None]
+        lons_a = np.asarray(lons_a, dtype=float)[:, None]
+        return TrajectoryCalculator.haversine_distances(lats_a, lons_a,
+                                                        np.asarray(lats_b, dtype=float)[None, :],
+                                                        np.asarray(lons_b, dtype=float)[None, :])
 
-        return R * c
+    @staticmethod
+    def initial_bearings(lat1, lon1, lat2, lon2) -> np.ndarray:
+        """Element-wise initial bearings in degrees [0, 360)."""
+        phi1, phi2 = np.radians(lat1), np.radians(lat2)
+        dlon = np.radians(np.subtract(lon2, lon1))
+        y = np.sin(dlon) * np.cos(phi2)
+        x = np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(dlon)
+        return np.degrees(np.arctan2(y, x)) % 360.0
+
+    @staticmethod
+    def final_bearings(lat1, lon1, lat2, lon2) -> np.ndarray:
+        """Element-wise bearings in degrees on arrival at the second point."""
+        return (TrajectoryCalculator.initial_bearings(lat2, lon2, lat1, lon1) + 180.0) % 360.0
+
+    @staticmethod
+    def leg_courses(latitudes, longitudes) -> np.ndarray:
+        """Initial courses in degrees of the N-1 consecutive legs of an N-point route."""
+        lats = np.asarray(latitudes, dtype=float)
+        lons = np.asarray(longitudes, dtype=float)
+        return TrajectoryCalculator.initial_bearings(lats[:-1], lons[:-1], lats[1:], lons[1:])
+
+    @staticmethod
+    def destination_points(latitudes, longitudes, bearings, distances_km) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Positions reached by flying a great circle from each start point.
+
+        :param latitudes: Start latitudes in degrees
+        :param longitudes: Start longitudes in degrees
+        :param bearings: Initial bearings in degrees
+        :param distances_km: Distances to fly in kilometers
+        :return: (latitudes, longitudes) in degrees, longitudes normalized to [-180, 180)
+        """
+        phi1 = np.radians(latitudes)
+        lambda1 = np.radians(longitudes)
+        theta = np.radians(bearings)
+        delta = np.asarray(distances_km, dtype=float) / EARTH_RADIUS_KM
+
+        sin_phi2 = np.sin(phi1) * np.cos(delta) + np.cos(phi1) * np.sin(delta) * np.cos(theta)
+        phi2 = np.arcsin(np.clip(sin_phi2, -1.0, 1.0))
+        lambda2 = lambda1 + np.arctan2(np.sin(theta) * np.sin(delta) * np.cos(phi1),
+                                       np.cos(delta) - np.sin(phi1) * sin_phi2)
+        return np.degrees(phi2), (np.degrees(lambda2) + 540.0) % 360.0 - 180.0
+
+    def calculate_route_distance(self, waypoints: Sequence[Waypoint]) -> float:
+        """Total great-circle distance in kilometers along a list of waypoints."""
+        if len(waypoints) < 2:
+            return 0.0
+        return float(self.leg_distances(*self.route_arrays(waypoints)).sum())
 
     def calculate_trajectory(self, waypoints: List[Waypoint], num_points: int = 100) -> List[Tuple[float, float]]:
         """
@@ -51,22 +154,83 @@ class TrajectoryCalculator:
 
         return trajectory
 
+    def calculate_great_circle_trajectory(self, waypoints: Sequence[Waypoint], spacing_km: float = None,
+                                          time_step_s: float = None, ground_speed_knots: float = 450,
+                                          include_waypoints: bool = True) -> np.ndarray:
+        """
+        Sample the great-circle route through the waypoints at a fixed along-track spacing.
+
+        Points are spherically interpolated (slerp) on each leg, so the path
+        follows the great circle rather than a straight line in lat/lon, and
+        shared leg endpoints appear only once.
+
+        :param waypoints: Route waypoints
+        :param spacing_km: Along-track distance between samples in kilometers
+        :param time_step_s: Alternatively, a time step combined with ground_speed_knots
+        :param ground_speed_knots: Ground speed used to convert time_step_s into a spacing
+        :param include_waypoints: Also emit a sample exactly at every waypoint
+        :return: (N, 4) float array indexed by TRAJ_LAT, TRAJ_LON, TRAJ_DISTANCE, TRAJ_COURSE
+        """
+        if spacing_km is None:
+            if time_step_s is None:
+                raise ValueError("Either spacing_km or time_step_s is required")
+            spacing_km = ground_speed_knots * KNOTS_TO_KMH * time_step_s / 3600.0
+        if spacing_km <= 0:
+            raise ValueError("Trajectory spacing must be positive")
+
+        lats, lons = self.route_arrays(waypoints)
+        legs = self.leg_distances(lats, lons)
+        # Drop zero-length legs (repeated waypoints)
+        keep = np.concatenate(([True], legs > 0))
+        lats, lons, legs = lats[keep], lons[keep], legs[legs > 0]
+
+        if len(legs) == 0:
+            trajectory = np.zeros((len(lats), 4))
+            trajectory[:, TRAJ_LAT] = lats
+            trajectory[:, TRAJ_LON] = lons
+            return trajectory
+
+        leg_starts = np.concatenate(([0.0], np.cumsum(legs)))
+        total = leg_starts[-1]
+        distances = np.arange(0.0, total, spacing_km)
+        distances = np.union1d(distances, leg_starts) if include_waypoints else np.append(distances, total)
+
+        leg = np.clip(np.searchsorted(leg_starts, distances, side='right') - 1, 0, len(legs) - 1)
+        fraction = (distances - leg_starts[leg]) / legs[leg]
+
+        # Unit vectors of the leg endpoints and slerp between them
+        phi, lam = np.radians(lats), np.radians(lons)
+        xyz = np.stack((np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)), axis=1)
+        omega = legs / EARTH_RADIUS_KM
+        sin_omega = np.sin(omega)[leg]
+        w_start = np.sin((1.0 - fraction) * omega[leg]) / sin_omega
+        w_end = np.sin(fraction * omega[leg]) / sin_omega
+        points = w_start[:, None] * xyz[leg] + w_end[:, None] * xyz[leg + 1]
+
+        trajectory = np.empty((len(distances), 4))
+        trajectory[:, TRAJ_LAT] = np.degrees(np.arctan2(points[:, 2], np.hypot(points[:, 0], points[:, 1])))
+        trajectory[:, TRAJ_LON] = np.degrees(np.arctan2(points[:, 1], points[:, 0]))
+        trajectory[:, TRAJ_DISTANCE] = distances
+
+        # Samples that fall on a waypoint keep its exact coordinates
+        at_leg_start = fraction <= 0.0
+        at_leg_end = fraction >= 1.0
+        trajectory[at_leg_start, TRAJ_LAT] = lats[leg[at_leg_start]]
+        trajectory[at_leg_start, TRAJ_LON] = lons[leg[at_leg_start]]
+        trajectory[at_leg_end, TRAJ_LAT] = lats[leg[at_leg_end] + 1]
+        trajectory[at_leg_end, TRAJ_LON] = lons[leg[at_leg_end] + 1]
+
+        # Course towards the end of the current leg; on arrival, the leg's final course
+        courses = self.initial_bearings(trajectory[:, TRAJ_LAT], trajectory[:, TRAJ_LON],
+                                        lats[leg + 1], lons[leg + 1])
+        courses[at_leg_end] = self.final_bearings(lats[leg[at_leg_end]], lons[leg[at_leg_end]],
+                                                  lats[leg[at_leg_end] + 1], lons[leg[at_leg_end] + 1])
+        trajectory[:, TRAJ_COURSE] = courses
+        return trajectory
+
     def calculate_bearing(self, wp1: Waypoint, wp2: Waypoint) -> float:
         """
         Calculate initial bearing between two waypoints.
         Returns bearing in degrees.
         """
-        # Convert latitude and longitude to radians
-        lat1, lon1 = np.radians(wp1.latitude), np.radians(wp1.longitude)
-        lat2, lon2 = np.radians(wp2.latitude), np.radians(wp2.longitude)
-
-        # Calculate bearing
-        dlon = lon2 - lon1
-        y = np.sin(dlon) * np.cos(lat2)
-        x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
-
-        # Convert to degrees and normalize
-        initial_bearing = np.degrees(np.arctan2(y, x))
-        compass_bearing = (initial_bearing + 360) % 360
-
-        return compass_bearing
+        return self.initial_bearing(wp1.latitude, wp1.longitude, wp2.latitude, wp2.longitude)
@@ -0,0 +1,146 @@
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import numpy as np
+from src.navigation.flight_planner import FlightPlan
+from src.navigation.performance import AircraftPerformance, get_aircraft_performance
+
+FEET_PER_METER = 1 / 0.3048
+KNOTS_TO_KMH = 1.852
+
+
+@dataclass
+class VerticalProfile:
+    cruise_altitude_ft: float
+    top_of_climb_km: float
+    top_of_descent_km: float
+    # Breakpoints of the profile, from the origin to the destination
+    distances_km: np.ndarray
+    altitudes_ft: np.ndarray
+    times_h: np.ndarray      # cumulative time at each breakpoint
+    fuel_kg: np.ndarray      # cumulative fuel burned at each breakpoint
+
+    @property
+    def trip_time_h(self) -> float:
+        return float(self.times_h[-1])
+
+    @property
+    def trip_fuel_kg(self) -> float:
+        return float(self.fuel_kg[-1])
+
+    def altitude_at(self, distances_km) -> np.ndarray:
+        """Planned altitude at along-track distances from the origin."""
+        return np.interp(distances_km, self.distances_km, self.altitudes_ft)
+
+
+@dataclass
+class _Segment:
+    """Climb or descent between consecutive altitude boundaries, bottom to top."""
+    altitudes_ft: np.ndarray
+    distances_km: np.ndarray
+    times_h: np.ndarray
+    fuel_kg: np.ndarray
+
+    @property
+    def distance_km(self) -> float:
+        return float(self.distances_km.sum())
+
+
+class VerticalProfileBuilder:
+    """
+    Build climb/cruise/descent profiles for flight plans from performance tables.
+
+    Climb and descent are integrated in fixed altitude bands, with the
+    performance of every band interpolated in a single table lookup. If the
+    route is too short to reach the requested level, the cruise level is
+    lowered to the highest one that fits. Profiles are memoized per flight
+    plan revision, weight, cruise level and ISA deviation.
+    """
+
+    def __init__(self, performance: Optional[AircraftPerformance] = None, step_ft: float = 1000.0):
+        self.performance = performance or get_aircraft_performance()
+        self.step_ft = step_ft
+        # Per plan: (revision, {(weight, cruise level, ISA deviation): profile})
+        self._profiles: 'weakref.WeakKeyDictionary[FlightPlan, Tuple[int, Dict[Tuple, VerticalProfile]]]' = \
+            weakref.WeakKeyDictionary()
+
+    def _segment(self, bottom_ft: float, top_ft: float, weight_kg: float, isa_deviation_c: float,
+                 phase: str) -> _Segment:
+        # Band boundaries on whole multiples of the step, so capped cruise levels come out round
+        inner = np.arange(np.floor(bottom_ft / self.step_ft) + 1, np.ceil(top_ft / self.step_ft)) * self.step_ft
+        altitudes = np.concatenate(([bottom_ft], inner, [top_ft])) if top_ft > bottom_ft else np.array([bottom_ft])
+        band_heights = np.diff(altitudes)
+        perf = self.performance.interpolate(weight_kg, (altitudes[:-1] + altitudes[1:]) / 2, isa_deviation_c)
+        times = band_heights / perf[f'{phase}_rate_fpm'] / 60.0
+        return _Segment(altitudes, perf[f'tas_{phase}_knots'] * KNOTS_TO_KMH * times, times,
+                        perf[f'fuel_flow_{phase}_kgph'] * times)
+
+    def build(self, flight_plan: FlightPlan, weight_kg: float, cruise_altitude_ft: float,
+              isa_deviation_c: float = 0.0) -> VerticalProfile:
+        """
+        Compute the vertical profile of a flight plan.
+
+        :param flight_plan: FlightPlan object
+        :param weight_kg: Takeoff weight
+        :param cruise_altitude_ft: Requested cruise altitude
+        :param isa_deviation_c: Temperature deviation from ISA
+        :return: VerticalProfile
+        """
+        revision, cached = self._profiles.get(flight_plan, (None, None))
+        if revision != flight_plan.revision:
+            # Profiles of earlier plan revisions are stale
+            cached = {}
+            self._profiles[flight_plan] = (flight_plan.revision, cached)
+        key = (weight_kg, cruise_altitude_ft, isa_deviation_c)
+        if key not in cached:
+            cached[key] = self._build(flight_plan, weight_kg, cruise_altitude_ft, isa_deviation_c)
+        return cached[key]
+
+    def _build(self, flight_plan: FlightPlan, weight_kg: float, cruise_altitude_ft: float,
+               isa_deviation_c: float) -> VerticalProfile:
+        total_km = flight_plan.calculate_total_distance()
+        origin_ft = flight_plan.origin.elevation * FEET_PER_METER
+        destination_ft = flight_plan.destination.elevation * FEET_PER_METER
+        cruise_ft = max(cruise_altitude_ft, origin_ft, destination_ft)
+
+        climb = self._segment(origin_ft, cruise_ft, weight_kg, isa_deviation_c, 'climb')
+        descent = self._segment(destination_ft, cruise_ft, weight_kg - climb.fuel_kg.sum(),
+                                isa_deviation_c, 'descent')
+
+        if climb.distance_km + descent.distance_km > total_km and cruise_ft > max(origin_ft, destination_ft):
+            # Highest level whose climb and descent distances still fit into the route
+            candidates = climb.altitudes_ft
+            climb_km = np.concatenate(([0.0], np.cumsum(climb.distances_km)))
+            descent_km = np.interp(candidates, descent.altitudes_ft,
+                                   np.concatenate(([0.0], np.cumsum(descent.distances_km))))
+            fits = candidates[(climb_km + descent_km <= total_km) & (candidates >= destination_ft)]
+            cruise_ft = float(fits[-1]) if len(fits) else max(origin_ft, destination_ft)
+            climb = self._segment(origin_ft, cruise_ft, weight_kg, isa_deviation_c, 'climb')
+            descent = self._segment(destination_ft, cruise_ft, weight_kg - climb.fuel_kg.sum(),
+                                    isa_deviation_c, 'descent')
+
+        cruise_km = max(total_km - climb.distance_km - descent.distance_km, 0.0)
+        cruise_weight = weight_kg - climb.fuel_kg.sum()
+        cruise_perf = self.performance.at(cruise_weight, cruise_ft, isa_deviation_c)
+        cruise_time = cruise_km / (cruise_perf['tas_cruise_knots'] * KNOTS_TO_KMH)
+        # Evaluate fuel flow at the mid-cruise weight estimated from the start-of-cruise burn
+        mid_weight = cruise_weight - cruise_perf['fuel_flow_cruise_kgph'] * cruise_time / 2
+        cruise_flow = self.performance.at(mid_weight, cruise_ft, isa_deviation_c)['fuel_flow_cruise_kgph']
+        cruise_fuel = cruise_flow * cruise_time
+
+        # Descent bands are stored bottom-up; the profile flies them top-down
+        distances = np.concatenate((climb.distances_km, [cruise_km], descent.distances_km[::-1]))
+        times = np.concatenate((climb.times_h, [cruise_time], descent.times_h[::-1]))
+        fuel = np.concatenate((climb.fuel_kg, [cruise_fuel], descent.fuel_kg[::-1]))
+        altitudes = np.concatenate((climb.altitudes_ft, descent.altitudes_ft[::-1]))
+
+        top_of_climb = climb.distance_km
+        return VerticalProfile(
+            cruise_altitude_ft=cruise_ft,
+            top_of_climb_km=top_of_climb,
+            top_of_descent_km=top_of_climb + cruise_km,
+            distances_km=np.concatenate(([0.0], np.cumsum(distances))),
+            altitudes_ft=altitudes,
+            times_h=np.concatenate(([0.0], np.cumsum(times))),
+            fuel_kg=np.concatenate(([0.0], np.cumsum(fuel)))
+        )
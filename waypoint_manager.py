@@ -1,25 +1,109 @@
 import json
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import fields
 import os
+import numpy as np
+from src.database.morocco_boundary import get_morocco_boundary
+from src.database.navdata_compiler import CompiledNavdata, compiled_path_for
+from src.database.spatial_index import SpatialIndex
+from src.database.waypoint_store import Waypoint, WaypointStore
 
+_WAYPOINT_FIELDS = tuple(f.name for f in fields(Waypoint))
 
-@dataclass
-class Waypoint:
-    name: str
-    icao_code: str
-    latitude: float
-    longitude: float
-    type: str
-    elevation: float = 0.0
+
+def _as_record(waypoint: Waypoint) -> dict:
+    """Flat dict of a waypoint for JSON (dataclasses.asdict deep-copies and is slow)."""
+    return {name: getattr(waypoint, name) for name in _WAYPOINT_FIELDS}
 
 
 class WaypointManager:
-    def __init__(self, database_path=None):
+    def __init__(self, database_path=None, compaction_threshold: int = 1000, use_compiled: bool = True):
         if database_path is None:
             database_path = os.path.join(os.path.dirname(__file__), 'moroccan_waypoints.json')
         self.database_path = database_path
-        self.waypoints = self._load_waypoints()
+        # Mutations are appended here and folded into the base file by compact()
+        self.journal_path = self.journal_path_for(database_path)
+        self.compaction_threshold = compaction_threshold
+        self._journal_records = 0
+        self._compaction_deferred = 0
+        # Bumped on every add/remove so derived caches (e.g. route graphs) can invalidate
+        self.revision = 0
+
+        # Columnar storage plus lookup indexes kept in sync by _insert/_delete.
+        # The code index maps to store rows; type and name buckets hold codes.
+        self._code_index: Optional[Dict[str, int]] = None
+        self._type_index: Dict[str, Dict[str, None]] = {}
+        self._name_index: Dict[str, Dict[str, None]] = {}
+        self._spatial_index = SpatialIndex()
+
+        # A fresh compiled navdata file is memory-mapped and its indexes are
+        # only built when first needed; otherwise the JSON source is parsed.
+        self._compiled = self._open_compiled() if use_compiled else None
+        if self._compiled is not None:
+            self.store = WaypointStore.from_compiled(self._compiled)
+        else:
+            self.store = WaypointStore()
+            self._code_index = {}
+            for wp in self._load_waypoints():
+                if wp.icao_code not in self._code_index:
+                    self._insert(wp)
+            self._replay_journal()
+
+    @staticmethod
+    def journal_path_for(database_path: str) -> str:
+        """Location of the mutation journal of a JSON database."""
+        return database_path + '.journal'
+
+    @property
+    def waypoints(self) -> WaypointStore:
+        """All stored waypoints, as a sequence of on-demand Waypoint views."""
+        return self.store
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        self._ensure_indexes()
+        return self._spatial_index
+
+    @property
+    def compiled_path(self) -> str:
+        return compiled_path_for(self.database_path)
+
+    def _open_compiled(self) -> Optional[CompiledNavdata]:
+        """Open the compiled navdata file if it exists and mirrors the JSON database."""
+        if not os.path.exists(self.compiled_path):
+            return None
+        try:
+            navdata = CompiledNavdata(self.compiled_path)
+        except ValueError:
+            return None
+        if not navdata.is_fresh_for(self.database_path):
+            navdata.close()
+            return None
+        return navdata
+
+    def _release_compiled(self):
+        """Unmap the compiled navdata once the store has copied it into memory."""
+        if self._compiled is not None and not self.store.is_compiled:
+            self._compiled.close()
+            self._compiled = None
+
+    def _ensure_indexes(self):
+        """Build the code, type, name and spatial indexes on first use."""
+        if self._code_index is not None:
+            return
+        store = self.store
+        self._code_index = {}
+        for row in range(len(store)):
+            code = store.code_at(row)
+            self._register(code, row, store.type_at(row), store.name_at(row),
+                           float(store.latitudes[row]), float(store.longitudes[row]))
+
+    def _row_of(self, icao_code: str) -> Optional[int]:
+        if self._code_index is None:
+            row = self._compiled.row_of(icao_code)
+            return None if row < 0 else row
+        return self._code_index.get(icao_code)
 
     def _load_waypoints(self) -> List[Waypoint]:
         """Load initial Moroccan waypoints."""
@@ -41,10 +125,136 @@ class WaypointManager:
             self._save_waypoints(default_waypoints)
             return default_waypoints
 
-    def _save_waypoints(self, waypoints: List[Waypoint]):
-        """Save waypoints to JSON file."""
-        with open(self.database_path, 'w') as f:
-            json.dump([asdict(wp) for wp in waypoints], f, indent=2)
+    def _save_waypoints(self, waypoints: Iterable[Waypoint]):
+        """
+        Atomically save waypoints to the JSON file.
+
+        One waypoint per line keeps the file readable and diff-friendly while
+        letting json use its C encoder (indent= forces the pure-Python one).
+        """
+        temp_path = self.database_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            f.write("[\n  " + ",\n  ".join(json.dumps(_as_record(wp)) for wp in waypoints) + "\n]\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.database_path)
+
+    def _replay_journal(self):
+        """Apply mutations journaled since the last compaction."""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        intact = 0  # byte offset just past the last complete record
+        for line in data.splitlines(keepends=True):
+            try:
+                record = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                # Torn write from a crash: everything before it is intact
+                break
+            intact += len(line)
+            if record['op'] == 'add':
+                waypoint = Waypoint(**record['waypoint'])
+                if waypoint.icao_code not in self._code_index:
+                    self._insert(waypoint)
+            elif record['op'] == 'remove':
+                if record['icao_code'] in self._code_index:
+                    self._delete(record['icao_code'])
+            self._journal_records += 1
+
+        if intact < len(data) or (data and not data.endswith(b'\n')):
+            self._repair_journal(intact, data[:intact])
+
+        if self._journal_records >= self.compaction_threshold:
+            self.compact()
+
+    def _repair_journal(self, intact: int, records: bytes):
+        """Cut a torn tail off the journal so later appends start on a fresh line."""
+        with open(self.journal_path, 'r+b') as f:
+            f.truncate(intact)
+            if records and not records.endswith(b'\n'):
+                f.seek(intact)
+                f.write(b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _append_journal(self, records: List[dict]):
+        """Durably append mutation records with a single write, compacting when due."""
+        with open(self.journal_path, 'a') as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_records += len(records)
+
+        if not self._compaction_deferred and self._journal_records >= self.compaction_threshold:
+            self.compact()
+
+    @contextmanager
+    def bulk_update(self):
+        """
+        Defer journal compaction until the end of a series of batch writes.
+
+        Mutations are still journaled as they happen; the base file is
+        rewritten at most once, on exit, instead of once per threshold.
+        """
+        self._compaction_deferred += 1
+        try:
+            yield self
+        finally:
+            self._compaction_deferred -= 1
+            if not self._compaction_deferred and self._journal_records >= self.compaction_threshold:
+                self.compact()
+
+    def compact(self):
+        """Fold the journal into the base JSON file and start a new journal."""
+        self._save_waypoints(self.waypoints)
+        # Replaying a stale journal over the new base is idempotent, so a crash
+        # between the replace above and this removal loses nothing
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_records = 0
+
+    @staticmethod
+    def _normalize_name(name: str) -> str:
+        """Normalize a waypoint name for case- and whitespace-insensitive lookups."""
+        return " ".join(name.split()).casefold()
+
+    def _register(self, code: str, row: int, waypoint_type: str, name: str, latitude: float, longitude: float):
+        """Register a stored row in the code, type, name and spatial indexes."""
+        self._code_index[code] = row
+        self._type_index.setdefault(waypoint_type, {})[code] = None
+        self._name_index.setdefault(self._normalize_name(name), {})[code] = None
+        self._spatial_index.insert(code, latitude, longitude, waypoint_type)
+
+    def _insert(self, waypoint: Waypoint):
+        """Store a waypoint and index it."""
+        self._ensure_indexes()
+        row = self.store.append(waypoint)
+        self._release_compiled()
+        self._register(waypoint.icao_code, row, waypoint.type, waypoint.name,
+                       waypoint.latitude, waypoint.longitude)
+        self.revision += 1
+
+    def _delete(self, icao_code: str):
+        """Drop a waypoint from the store and from every index."""
+        self._ensure_indexes()
+        row = self._code_index.pop(icao_code)
+        waypoint = self.store[row]
+        self._spatial_index.remove(icao_code)
+        for index, key in ((self._type_index, waypoint.type),
+                           (self._name_index, self._normalize_name(waypoint.name))):
+            bucket = index[key]
+            del bucket[icao_code]
+            if not bucket:
+                del index[key]
+
+        moved_from = self.store.swap_remove(row)
+        self._release_compiled()
+        if moved_from is not None:
+            self._code_index[self.store.code_at(row)] = row
+        self.revision += 1
 
     def add_waypoint(self, waypoint: Waypoint) -> bool:
         """Add a new waypoint to the database."""
@@ -52,22 +262,127 @@ class WaypointManager:
             raise ValueError("Waypoint must be located in Morocco")
 
         # Check for duplicate
-        if any(wp.icao_code == waypoint.icao_code for wp in self.waypoints):
+        if self._row_of(waypoint.icao_code) is not None:
             return False
 
-        self.waypoints.append(waypoint)
-        self._save_waypoints(self.waypoints)
+        self._insert(waypoint)
+        self._append_journal([{'op': 'add', 'waypoint': _as_record(waypoint)}])
+        return True
+
+    def add_waypoints(self, waypoints: Iterable[Waypoint]) -> int:
+        """
+        Add several waypoints with a single journal write.
+
+        The whole batch is validated before anything is stored, so an
+        invalid waypoint leaves the database untouched.
+
+        :param waypoints: Waypoints to add
+        :return: Number of waypoints added (duplicates are skipped)
+        """
+        waypoints = list(waypoints)
+        if not waypoints:
+            return 0
+        inside = self.in_morocco_mask(np.fromiter((wp.latitude for wp in waypoints), float, len(waypoints)),
+                                      np.fromiter((wp.longitude for wp in waypoints), float, len(waypoints)))
+        if not inside.all():
+            outside = waypoints[int(np.argmin(inside))]
+            raise ValueError(f"Waypoint {outside.icao_code} must be located in Morocco")
+
+        records = []
+        for waypoint in waypoints:
+            if self._row_of(waypoint.icao_code) is not None:
+                continue
+            self._insert(waypoint)
+            records.append({'op': 'add', 'waypoint': _as_record(waypoint)})
+
+        if records:
+            self._append_journal(records)
+        return len(records)
+
+    def remove_waypoint(self, icao_code: str) -> bool:
+        """
+        Remove a waypoint from the database by its ICAO code.
+
+        The last stored waypoint takes the freed slot, so storage order is
+        not preserved across removals.
+        """
+        if self._row_of(icao_code) is None:
+            return False
+
+        self._delete(icao_code)
+        self._append_journal([{'op': 'remove', 'icao_code': icao_code}])
         return True
 
     def get_waypoint_by_code(self, icao_code: str) -> Optional[Waypoint]:
         """Retrieve a waypoint by its ICAO code."""
-        return next((wp for wp in self.waypoints if wp.icao_code == icao_code), None)
+        row = self._row_of(icao_code)
+        return None if row is None else self.store[row]
+
+    def get_waypoints_by_codes(self, icao_codes: Iterable[str]) -> List[Optional[Waypoint]]:
+        """
+        Resolve several ICAO codes in one pass.
+
+        :param icao_codes: ICAO codes to look up
+        :return: Waypoints in the same order as the codes, None where a code is unknown
+        """
+        store = self.store
+        return [None if row is None else store[row] for row in map(self._row_of, icao_codes)]
+
+    def get_rows_by_codes(self, icao_codes: Iterable[str]) -> np.ndarray:
+        """
+        Resolve ICAO codes to store rows for vectorized access to the columns.
+
+        :param icao_codes: ICAO codes to look up
+        :return: Integer array of rows, -1 where a code is unknown
+        """
+        rows = map(self._row_of, icao_codes)
+        return np.fromiter((-1 if row is None else row for row in rows), dtype=np.intp)
+
+    def get_waypoints_by_type(self, waypoint_type: str) -> List[Waypoint]:
+        """Retrieve all waypoints of a given type (e.g. 'airport', 'VOR')."""
+        self._ensure_indexes()
+        return self.get_waypoints_by_codes(self._type_index.get(waypoint_type, ()))
+
+    def find_waypoints_by_name(self, name: str) -> List[Waypoint]:
+        """Retrieve waypoints by name, ignoring case and extra whitespace."""
+        self._ensure_indexes()
+        return self.get_waypoints_by_codes(self._name_index.get(self._normalize_name(name), ()))
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1,
+                type: Optional[str] = None) -> List[Tuple[Waypoint, float]]:
+        """
+        Find the k waypoints closest to a position.
+
+        :param latitude: Latitude in degrees
+        :param longitude: Longitude in degrees
+        :param k: Number of waypoints to return
+        :param type: Optional waypoint type filter (e.g. 'VOR')
+        :return: (Waypoint, distance in km) pairs, closest first
+        """
+        return [(self.store[self._code_index[code]], distance)
+                for code, distance in self.spatial_index.nearest(latitude, longitude, k, type)]
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float,
+                      type: Optional[str] = None) -> List[Tuple[Waypoint, float]]:
+        """
+        Find all waypoints within a great-circle radius of a position.
+
+        :param latitude: Latitude in degrees
+        :param longitude: Longitude in degrees
+        :param radius_km: Search radius in kilometers
+        :param type: Optional waypoint type filter
+        :return: (Waypoint, distance in km) pairs, closest first
+        """
+        return [(self.store[self._code_index[code]], distance)
+                for code, distance in self.spatial_index.within_radius(latitude, longitude, radius_km, type)]
 
     def _is_in_morocco(self, latitude: float, longitude: float) -> bool:
         """
-        Validate if coordinates are within Moroccan boundaries.
-        Approximate boundaries of Morocco:
-        - Latitude: 21.4° to 36.0° N
-        - Longitude: -17.0° to -1.0° W
+        Validate if coordinates are within Moroccan boundaries, using the
+        simplified national boundary polygon (including the southern provinces).
         """
-        return (21.4 <= latitude <= 36.0) and (-17.0 <= longitude <= -1.0)
+        return get_morocco_boundary().contains(latitude, longitude)
+
+    def in_morocco_mask(self, latitudes, longitudes) -> np.ndarray:
+        """Vectorized _is_in_morocco: boolean mask over coordinate arrays."""
+        return get_morocco_boundary().contains(np.atleast_1d(latitudes), np.atleast_1d(longitudes))
@@ -0,0 +1,195 @@
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+import numpy as np
+
+
+@dataclass(slots=True)
+class Waypoint:
+    name: str
+    icao_code: str
+    latitude: float
+    longitude: float
+    type: str
+    elevation: float = 0.0
+
+
+class WaypointStore:
+    """
+    Structure-of-arrays storage for waypoints.
+
+    Coordinates and elevations live in contiguous float64 arrays, codes and
+    names in interned string columns and types as small integer categories.
+    Waypoint objects are only built on demand when a row is accessed.
+
+    A store opened with from_compiled() reads its columns straight from a
+    memory-mapped navdata file and copies them into owned arrays on the
+    first mutation.
+    """
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._navdata = None
+        self._size = 0
+        self._lat = np.empty(initial_capacity)
+        self._lon = np.empty(initial_capacity)
+        self._elev = np.empty(initial_capacity)
+        self._type_ids = np.empty(initial_capacity, dtype=np.int16)
+        self._codes: List[str] = []
+        self._names: List[str] = []
+        self.types: List[str] = []
+        self._type_lookup: Dict[str, int] = {}
+
+    @classmethod
+    def from_compiled(cls, navdata) -> 'WaypointStore':
+        """Wrap a CompiledNavdata file without reading its records."""
+        store = cls(initial_capacity=0)
+        store._navdata = navdata
+        store._size = len(navdata)
+        store._lat = navdata.latitudes
+        store._lon = navdata.longitudes
+        store._elev = navdata.elevations
+        store._type_ids = navdata.type_ids
+        store.types = list(navdata.types)
+        store._type_lookup = {waypoint_type: i for i, waypoint_type in enumerate(store.types)}
+        return store
+
+    @property
+    def is_compiled(self) -> bool:
+        """Whether the columns are still read-only views of a compiled navdata file."""
+        return self._navdata is not None
+
+    def _thaw(self):
+        """Copy memory-mapped columns into owned, growable storage."""
+        navdata = self._navdata
+        capacity = max(2 * self._size, 1024)
+        for name in ('_lat', '_lon', '_elev'):
+            column = np.empty(capacity)
+            column[:self._size] = getattr(self, name)
+            setattr(self, name, column)
+        type_ids = np.empty(capacity, dtype=np.int16)
+        type_ids[:self._size] = self._type_ids
+        self._type_ids = type_ids
+        self._codes = [sys.intern(code) for code in navdata.codes()]
+        self._names = navdata.names()
+        self._navdata = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, row: int) -> Waypoint:
+        if row < 0:
+            row += self._size
+        if not 0 <= row < self._size:
+            raise IndexError("Waypoint row out of range")
+        return Waypoint(
+            name=self.name_at(row),
+            icao_code=self.code_at(row),
+            latitude=float(self._lat[row]),
+            longitude=float(self._lon[row]),
+            type=self.types[self._type_ids[row]],
+            elevation=float(self._elev[row])
+        )
+
+    def __iter__(self) -> Iterator[Waypoint]:
+        for row in range(self._size):
+            yield self[row]
+
+    @property
+    def latitudes(self) -> np.ndarray:
+        """Latitude column in degrees (a view, invalidated when the store grows)."""
+        return self._lat[:self._size]
+
+    @property
+    def longitudes(self) -> np.ndarray:
+        """Longitude column in degrees (a view, invalidated when the store grows)."""
+        return self._lon[:self._size]
+
+    @property
+    def elevations(self) -> np.ndarray:
+        """Elevation column (a view, invalidated when the store grows)."""
+        return self._elev[:self._size]
+
+    @property
+    def type_ids(self) -> np.ndarray:
+        """Type column as indexes into self.types (a view)."""
+        return self._type_ids[:self._size]
+
+    def code_at(self, row: int) -> str:
+        if self._navdata is not None:
+            return self._navdata.code_at(row)
+        return self._codes[row]
+
+    def name_at(self, row: int) -> str:
+        if self._navdata is not None:
+            return self._navdata.name_at(row)
+        return self._names[row]
+
+    def type_at(self, row: int) -> str:
+        return self.types[self._type_ids[row]]
+
+    def _intern_type(self, waypoint_type: str) -> int:
+        type_id = self._type_lookup.get(waypoint_type)
+        if type_id is None:
+            type_id = len(self.types)
+            self.types.append(sys.intern(waypoint_type))
+            self._type_lookup[waypoint_type] = type_id
+        return type_id
+
+    def _reserve(self, capacity: int):
+        if capacity <= len(self._lat):
+            return
+        capacity = max(capacity, 2 * len(self._lat))
+        for name in ('_lat', '_lon', '_elev', '_type_ids'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def append(self, waypoint: Waypoint) -> int:
+        """Store a waypoint and return its row."""
+        if self._navdata is not None:
+            self._thaw()
+        row = self._size
+        self._reserve(row + 1)
+        self._lat[row] = waypoint.latitude
+        self._lon[row] = waypoint.longitude
+        self._elev[row] = waypoint.elevation
+        self._type_ids[row] = self._intern_type(waypoint.type)
+        self._codes.append(sys.intern(waypoint.icao_code))
+        self._names.append(waypoint.name)
+        self._size += 1
+        return row
+
+    def extend(self, waypoints: Iterable[Waypoint]) -> range:
+        """Store several waypoints and return the range of rows they occupy."""
+        start = self._size
+        for waypoint in waypoints:
+            self.append(waypoint)
+        return range(start, self._size)
+
+    def swap_remove(self, row: int) -> Optional[int]:
+        """
+        Delete a row in O(1) by moving the last row into its place.
+
+        :param row: Row to delete
+        :return: The previous row number of the moved waypoint, or None if
+                 the deleted row was the last one
+        """
+        last = self._size - 1
+        if not 0 <= row <= last:
+            raise IndexError("Waypoint row out of range")
+        if self._navdata is not None:
+            self._thaw()
+
+        moved = None
+        if row != last:
+            for column in (self._lat, self._lon, self._elev, self._type_ids):
+                column[row] = column[last]
+            self._codes[row] = self._codes[last]
+            self._names[row] = self._names[last]
+            moved = last
+
+        self._codes.pop()
+        self._names.pop()
+        self._size -= 1
+        return moved
@@ -0,0 +1,188 @@
+import os
+from collections import OrderedDict
+from typing import Tuple, Union
+import numpy as np
+from src.navigation.trajectory_calculator import TRAJ_COURSE, TRAJ_DISTANCE, TRAJ_LAT, TRAJ_LON
+
+try:
+    import netCDF4
+except ImportError:  # NetCDF support is optional; NPZ files always work
+    netCDF4 = None
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def pressure_to_altitude_ft(pressure_hpa: ArrayLike) -> np.ndarray:
+    """ISA pressure altitude in feet for a pressure level in hPa."""
+    return 145366.45 * (1.0 - (np.asarray(pressure_hpa, dtype=float) / 1013.25) ** 0.190284)
+
+
+class WindField:
+    """
+    Gridded wind and temperature by altitude, latitude and longitude.
+
+    u (eastward) and v (northward) components are in knots, temperature in
+    degrees Celsius; every grid has shape (altitudes, latitudes, longitudes)
+    with all three axes ascending and longitudes in -180..180 (0..360 grids,
+    as in ERA5, are wrapped and rolled on load). Lookups use vectorized
+    trilinear interpolation; altitudes are clamped to the lowest and highest
+    level, positions outside the grid raise ValueError.
+    """
+
+    def __init__(self, altitudes_ft, latitudes, longitudes, u_knots, v_knots, temperature_c=None):
+        axes = [np.asarray(axis, dtype=float) for axis in (altitudes_ft, latitudes, longitudes)]
+        grids = [np.asarray(grid, dtype=float) for grid in (u_knots, v_knots)]
+        grids.append(np.zeros_like(grids[0]) if temperature_c is None else np.asarray(temperature_c, dtype=float))
+        shape = tuple(len(axis) for axis in axes)
+        if any(grid.shape != shape for grid in grids):
+            raise ValueError(f"Wind grids must have shape {shape}")
+
+        # Longitudes beyond 180 (0..360 grids) are wrapped and the grids rolled to match
+        longitudes = axes[2]
+        if np.any(longitudes > 180.0):
+            wrapped = (longitudes + 180.0) % 360.0 - 180.0
+            order = np.argsort(wrapped, kind='stable')
+            axes[2] = wrapped[order]
+            grids = [grid[..., order] for grid in grids]
+
+        # Flip descending axes (e.g. north-to-south latitudes, pressure levels)
+        for dim, axis in enumerate(axes):
+            if len(axis) > 1 and axis[0] > axis[-1]:
+                axes[dim] = axis[::-1]
+                grids = [np.flip(grid, axis=dim) for grid in grids]
+            if np.any(np.diff(axes[dim]) <= 0):
+                raise ValueError("Wind grid axes must be strictly monotonic")
+
+        self.altitudes_ft, self.latitudes, self.longitudes = axes
+        # Stacked so one gather serves all three fields
+        self._values = np.ascontiguousarray(np.stack(grids, axis=-1))
+
+    @staticmethod
+    def _axis_weights(axis: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if len(axis) == 1:
+            return np.zeros(values.shape, dtype=np.intp), np.zeros(values.shape)
+        index = np.clip(np.searchsorted(axis, values, side='right') - 1, 0, len(axis) - 2)
+        weight = (values - axis[index]) / (axis[index + 1] - axis[index])
+        return index, np.clip(weight, 0.0, 1.0)
+
+    def interpolate(self, altitudes_ft: ArrayLike, latitudes: ArrayLike,
+                    longitudes: ArrayLike) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Wind and temperature at arbitrary points.
+
+        :param altitudes_ft: Altitudes in feet (broadcast against the positions)
+        :param latitudes: Latitudes in degrees
+        :param longitudes: Longitudes in degrees
+        :return: (u knots, v knots, temperature C) arrays of the broadcast shape
+        :raises ValueError: If a position is outside the grid
+        """
+        alts, lats, lons = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in
+                                                 (altitudes_ft, latitudes, longitudes)))
+        lons = (lons + 180.0) % 360.0 - 180.0
+        for name, axis, values in (('latitude', self.latitudes, lats), ('longitude', self.longitudes, lons)):
+            if np.any((values < axis[0]) | (values > axis[-1])):
+                raise ValueError(f"Wind lookup outside the grid: {name} must be within {axis[0]}..{axis[-1]}")
+        (i, wi), (j, wj), (k, wk) = (self._axis_weights(axis, values) for axis, values in
+                                     ((self.altitudes_ft, alts), (self.latitudes, lats), (self.longitudes, lons)))
+        di = 1 if len(self.altitudes_ft) > 1 else 0
+        dj = 1 if len(self.latitudes) > 1 else 0
+        dk = 1 if len(self.longitudes) > 1 else 0
+
+        result = np.zeros(alts.shape + (3,))
+        for oi, fi in ((0, 1 - wi), (di, wi)):
+            for oj, fj in ((0, 1 - wj), (dj, wj)):
+                for ok, fk in ((0, 1 - wk), (dk, wk)):
+                    result += (fi * fj * fk)[..., None] * self._values[i + oi, j + oj, k + ok]
+        return result[..., 0], result[..., 1], result[..., 2]
+
+    def ground_speeds(self, trajectory: np.ndarray, true_airspeed_knots: ArrayLike,
+                      altitudes_ft: ArrayLike) -> np.ndarray:
+        """
+        Ground speed at every sample of a trajectory.
+
+        :param trajectory: (N, 4) array from TrajectoryCalculator.calculate_great_circle_trajectory
+        :param true_airspeed_knots: TAS, scalar or per sample
+        :param altitudes_ft: Altitude, scalar or per sample
+        :return: Ground speeds in knots
+        """
+        u, v, _ = self.interpolate(altitudes_ft, trajectory[:, TRAJ_LAT], trajectory[:, TRAJ_LON])
+        course = np.radians(trajectory[:, TRAJ_COURSE])
+        sin_c, cos_c = np.sin(course), np.cos(course)
+        tailwind = u * sin_c + v * cos_c
+        crosswind = u * cos_c - v * sin_c
+        tas = np.asarray(true_airspeed_knots, dtype=float)
+        # Crab into the crosswind, then add the along-track component
+        return np.sqrt(np.maximum(tas ** 2 - crosswind ** 2, 0.0)) + tailwind
+
+    def time_en_route(self, trajectory: np.ndarray, true_airspeed_knots: ArrayLike,
+                      altitudes_ft: ArrayLike) -> float:
+        """Hours needed to fly a sampled trajectory, integrating ground speed segment by segment."""
+        if len(trajectory) < 2:
+            return 0.0
+        ground_speeds = np.maximum(self.ground_speeds(trajectory, true_airspeed_knots, altitudes_ft), 1.0)
+        segments_nm = np.diff(trajectory[:, TRAJ_DISTANCE]) / 1.852
+        mean_speeds = (ground_speeds[:-1] + ground_speeds[1:]) / 2
+        return float(np.sum(segments_nm / mean_speeds))
+
+
+def _read_npz(path: str) -> WindField:
+    with np.load(path) as data:
+        if 'altitudes_ft' in data:
+            altitudes = data['altitudes_ft']
+        elif 'levels_hpa' in data:
+            altitudes = pressure_to_altitude_ft(data['levels_hpa'])
+        else:
+            raise ValueError(f"{path} needs an 'altitudes_ft' or 'levels_hpa' array")
+        return WindField(altitudes, data['latitudes'], data['longitudes'], data['u'], data['v'],
+                         data['temperature'] if 'temperature' in data else None)
+
+
+def _read_netcdf(path: str) -> WindField:
+    if netCDF4 is None:
+        raise ValueError("Reading NetCDF wind files requires the netCDF4 package")
+    with netCDF4.Dataset(path) as dataset:
+        variables = dataset.variables
+
+        def grid(name: str) -> np.ndarray:
+            values = np.asarray(variables[name][:], dtype=float)
+            return values[0] if values.ndim == 4 else values  # first time step of (time, level, lat, lon)
+
+        ms_to_knots = 1.0 / 0.514444
+        return WindField(pressure_to_altitude_ft(variables['level'][:]),
+                         variables['latitude'][:], variables['longitude'][:],
+                         grid('u') * ms_to_knots, grid('v') * ms_to_knots,
+                         grid('t') - 273.15 if 't' in variables else None)
+
+
+# Wind grids kept in memory; the least recently loaded file is dropped first
+WIND_CACHE_SIZE = 8
+
+# path -> ((mtime ns, size), WindField), least recently used first
+_wind_cache: 'OrderedDict[str, Tuple[Tuple[int, int], WindField]]' = OrderedDict()
+
+
+def load_wind_field(path: str) -> WindField:
+    """
+    Load a wind file, reusing the in-memory grid until the file changes.
+
+    NPZ files hold 'latitudes', 'longitudes', 'u', 'v' (knots), optional
+    'temperature' (C) and either 'altitudes_ft' or 'levels_hpa'. NetCDF files
+    use ERA5-style 'level', 'latitude', 'longitude', 'u', 'v' (m/s) and 't' (K).
+
+    :param path: Path to a .npz or .nc file
+    :return: WindField
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _wind_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        _wind_cache.move_to_end(path)
+        return cached[1]
+
+    wind_field = _read_netcdf(path) if path.endswith(('.nc', '.nc4')) else _read_npz(path)
+    _wind_cache[path] = (stamp, wind_field)
+    _wind_cache.move_to_end(path)
+    while len(_wind_cache) > WIND_CACHE_SIZE:
+        _wind_cache.popitem(last=False)
+    return wind_field